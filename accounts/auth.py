@@ -1,8 +1,13 @@
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db.models import Q
 from rest_framework import serializers
-from tenants.models import Tenant
+from tenants.utils import get_cached_tenant
+from .hashers import preferred_hasher
+from .authentication import principal_claims
+from .ratelimit import LoginRateThrottle
 
 User = get_user_model()
 
@@ -16,10 +21,6 @@ class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
         tenant_slug = attrs.pop("tenant_slug", None)
         if not tenant_slug:
             raise serializers.ValidationError({"tenant_slug": "This field is required."})
-        try:
-            tenant = Tenant.objects.get(slug=tenant_slug)
-        except Tenant.DoesNotExist:
-            raise serializers.ValidationError({"tenant_slug": "Invalid tenant."})
 
         identifier = (
             attrs.get("email")
@@ -32,18 +33,25 @@ class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
         if not identifier or not password:
             raise serializers.ValidationError({"detail": "Missing credentials"})
 
-        # Find user within the tenant by email first, then username
-        user = None
-        try:
-            user = User.objects.get(tenant=tenant, email=identifier)
-        except User.DoesNotExist:
-            try:
-                user = User.objects.get(tenant=tenant, username=identifier)
-            except User.DoesNotExist:
-                pass
+        # Tenant and user in one query, served by the (email, tenant) and
+        # (username, tenant) unique indexes; an email match wins.
+        candidates = list(
+            User.objects.select_related("tenant")
+            .filter(tenant__slug=tenant_slug)
+            .filter(Q(email=identifier) | Q(username=identifier))[:2]
+        )
+        user = next((u for u in candidates if u.email == identifier), None) or next(iter(candidates), None)
+
+        if user is None:
+            tenant = get_cached_tenant(tenant_slug)
+            if tenant is None:
+                raise serializers.ValidationError({"tenant_slug": "Invalid tenant."})
+            # Hash anyway so unknown identifiers take as long as wrong passwords
+            make_password(password, hasher=preferred_hasher(tenant))
 
         if not user or not user.is_active or not user.check_password(password):
             raise serializers.ValidationError({"detail": "No active account found with the given credentials"})
+        tenant = user.tenant
 
         # Build tokens directly (do not call super().validate which relies on USERNAME_FIELD)
         refresh = self.get_token(user)
@@ -59,8 +67,10 @@ class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
-        token["role"] = user.role
+        for claim, value in principal_claims(user).items():
+            token[claim] = value
         return token
 
 class TenantTokenObtainPairView(TokenObtainPairView):
     serializer_class = TenantTokenObtainPairSerializer
+    throttle_classes = [LoginRateThrottle]
@@ -0,0 +1,75 @@
+"""
+JWT authentication that serves the authenticated user from a short-TTL,
+in-process principal cache.
+
+Access tokens carry the tenant, site and role of the user they were issued
+to (see TenantTokenObtainPairSerializer.get_token). A cache miss loads the
+user together with its tenant and site in one query; a hit makes no query
+at all. Saving or deleting a user, tenant or site drops the affected
+entries in this process (accounts.signals); the TTL bounds staleness in
+other processes.
+"""
+import copy
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from tenants.cache import LRUCache
+
+# Claims added to every token; compared with the current user on each request.
+PRINCIPAL_CLAIMS = {
+    "tenant_id": "tenant_id",
+    "site_id": "site_id",
+    "role": "role",
+}
+
+principal_cache = LRUCache(
+    maxsize=getattr(settings, "PRINCIPAL_CACHE_SIZE", 4096),
+    ttl=getattr(settings, "PRINCIPAL_CACHE_TTL", 30),
+)
+
+
+def principal_claims(user):
+    claims = {claim: getattr(user, attr) for claim, attr in PRINCIPAL_CLAIMS.items()}
+    claims["tenant_slug"] = user.tenant.slug if user.tenant_id else None
+    return claims
+
+
+def load_principal(user_id):
+    User = get_user_model()
+    return (
+        User.objects.select_related("tenant", "site")
+        .filter(**{api_settings.USER_ID_FIELD: user_id})
+        .first()
+    )
+
+
+def invalidate_principal(user_id):
+    principal_cache.delete(user_id)
+
+
+class TenantJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = principal_cache.get_or_set(user_id, lambda: load_principal(user_id))
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        # Tokens issued before a change of tenant, site or role stop working;
+        # tokens without the claims (issued before they existed) are accepted.
+        for claim, attr in PRINCIPAL_CLAIMS.items():
+            if claim in validated_token and validated_token[claim] != getattr(user, attr):
+                raise AuthenticationFailed(_("Token is out of date"), code="token_not_valid")
+
+        # Each request gets its own copy; the cached instance is never mutated.
+        return copy.deepcopy(user)
@@ -0,0 +1,49 @@
+"""
+Password hashers with costs taken from settings, and per-tenant hasher
+selection.
+
+A tenant's `password_hasher` names the algorithm new passwords are hashed
+with; passwords stored with another algorithm (or with outdated cost
+parameters) are rehashed transparently the next time the user logs in.
+Argon2 needs the optional `argon2-cffi` package; tenants configured for it
+fall back to the default hasher when it is not installed.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    ScryptPasswordHasher,
+    get_hasher,
+)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    work_factor = getattr(settings, "SCRYPT_WORK_FACTOR", ScryptPasswordHasher.work_factor)
+    block_size = getattr(settings, "SCRYPT_BLOCK_SIZE", ScryptPasswordHasher.block_size)
+    parallelism = getattr(settings, "SCRYPT_PARALLELISM", ScryptPasswordHasher.parallelism)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    time_cost = getattr(settings, "ARGON2_TIME_COST", Argon2PasswordHasher.time_cost)
+    memory_cost = getattr(settings, "ARGON2_MEMORY_COST", Argon2PasswordHasher.memory_cost)
+    parallelism = getattr(settings, "ARGON2_PARALLELISM", Argon2PasswordHasher.parallelism)
+
+
+@lru_cache(maxsize=None)
+def hasher_available(algorithm):
+    try:
+        hasher = get_hasher(algorithm)
+        if hasher.library:
+            hasher._load_library()
+    except ValueError:
+        return False
+    return True
+
+
+def preferred_hasher(tenant):
+    """Algorithm name passwords of `tenant`'s users should be stored with."""
+    algorithm = tenant.password_hasher if tenant is not None else ""
+    if algorithm and hasher_available(algorithm):
+        return algorithm
+    return "default"
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import time
+from statistics import median
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.hashers import hasher_available
+from tenants.models import Tenant
+
+User = get_user_model()
+
+PASSWORD = "correct horse battery staple"
+
+
+class Command(BaseCommand):
+    help = "Benchmark token endpoint throughput per password hasher (seeded data is rolled back)"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--users", type=int, default=200, help="Users seeded per tenant")
+        parser.add_argument("--logins", type=int, default=30, help="Timed logins per hasher")
+        parser.add_argument(
+            "--hasher", action="append", choices=[c for c, _ in Tenant.PasswordHasher.choices if c],
+            help="Hasher to benchmark (repeatable, default: all available)",
+        )
+
+    def handle(self, *args, **opts):
+        algorithms = opts["hasher"] or [c for c, _ in Tenant.PasswordHasher.choices if c]
+        client = APIClient()
+        rows = []
+
+        with transaction.atomic():
+            for algorithm in algorithms:
+                if not hasher_available(algorithm):
+                    self.stdout.write(self.style.WARNING(f"{algorithm}: library not installed, skipped"))
+                    continue
+                slug = f"bench-login-{algorithm.replace('_', '-')}"
+                tenant = Tenant.objects.create(name=slug, slug=slug, domain="localhost", password_hasher=algorithm)
+                encoded = make_password(PASSWORD, hasher=algorithm)
+                User.objects.bulk_create(
+                    User(username=f"{slug}-user{i}", email=f"user{i}@{slug}.test", password=encoded, tenant=tenant)
+                    for i in range(opts["users"])
+                )
+
+                samples, queries = [], 0
+                for n in range(opts["logins"]):
+                    payload = {"tenant_slug": slug, "email": f"user{n % opts['users']}@{slug}.test", "password": PASSWORD}
+                    with CaptureQueriesContext(connection) as ctx:
+                        start = time.perf_counter()
+                        res = client.post("/api/auth/token/", payload, format="json")
+                        samples.append(time.perf_counter() - start)
+                    assert res.status_code == 200, res.content
+                    queries = max(queries, len(ctx.captured_queries))
+                rows.append((algorithm, median(samples), queries))
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'hasher':<15} {'median ms':>10} {'logins/s':>9} {'queries':>8}")
+        for algorithm, seconds, queries in rows:
+            self.stdout.write(f"{algorithm:<15} {seconds * 1000:10.1f} {1 / seconds:9.1f} {queries:8d}")
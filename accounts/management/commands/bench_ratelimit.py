@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from statistics import median, quantiles
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandParser
+from django.test import RequestFactory, override_settings
+
+from accounts import ratelimit
+
+
+class Command(BaseCommand):
+    help = "Measure the cost of requests rejected by the token endpoint's rate limit"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--requests", type=int, default=2000, help="Rejected requests to time")
+        parser.add_argument(
+            "--store", default="accounts.ratelimit.LocalMemoryStore",
+            help="Rate limit store (e.g. accounts.ratelimit.CacheStore)",
+        )
+
+    def handle(self, *args, **opts):
+        body = json.dumps({"tenant_slug": "bench", "email": "victim@bench.test", "password": "guess"})
+        factory = RequestFactory()
+        # The full middleware stack and view, without the test client's own
+        # overhead; the per-request 4xx warnings are silenced.
+        handler = WSGIHandler()
+        request_logger = logging.getLogger("django.request")
+        level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+
+        def post():
+            return factory.post("/api/auth/token/", body, content_type="application/json")
+
+        with override_settings(RATE_LIMIT_STORE=opts["store"], RATE_LIMITS={"login": {"identifier": "5/5m"}}):
+            ratelimit.reset()
+            try:
+                # Exhaust the limit; these reach the serializer and fail validation.
+                for _ in range(5):
+                    handler.get_response(post())
+
+                samples = []
+                for _ in range(opts["requests"]):
+                    request = post()
+                    start = time.perf_counter()
+                    res = handler.get_response(request)
+                    samples.append(time.perf_counter() - start)
+                    assert res.status_code == 429, res.status_code
+
+                limiter = ratelimit.get_limiter()
+                checks = []
+                for _ in range(opts["requests"]):
+                    start = time.perf_counter()
+                    limiter.hit("login:id:bench:victim@bench.test", 5, 300)
+                    checks.append(time.perf_counter() - start)
+            finally:
+                ratelimit.reset()
+                request_logger.setLevel(level)
+
+        p99 = quantiles(samples, n=100)[98]
+        self.stdout.write(f"{opts['requests']} rejected requests ({opts['store']})")
+        self.stdout.write(f"  full request  median {median(samples) * 1000:.3f} ms  p99 {p99 * 1000:.3f} ms")
+        self.stdout.write(f"  limiter check median {median(checks) * 1e6:.1f} us")
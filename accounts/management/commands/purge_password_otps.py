@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import PasswordResetOTP
+
+
+class Command(BaseCommand):
+    help = "Delete used and expired password reset OTPs in batches"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows deleted per statement")
+        parser.add_argument(
+            "--grace-minutes", type=int, default=60,
+            help="Keep expired codes this long after expiry (used codes are always purged)",
+        )
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would be deleted")
+
+    def handle(self, *args, **opts):
+        batch_size: int = opts["batch_size"]
+        cutoff = timezone.now() - timedelta(minutes=opts["grace_minutes"])
+        stale = PasswordResetOTP.objects.filter(Q(is_used=True) | Q(expires_at__lt=cutoff))
+
+        if opts["dry_run"]:
+            self.stdout.write(f"{stale.count()} OTPs would be deleted")
+            return
+
+        # Delete by primary key in short statements so a large backlog never
+        # holds a long lock on the table.
+        total = 0
+        while True:
+            pks = list(stale.order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            deleted, _ = PasswordResetOTP.objects.filter(pk__in=pks).delete()
+            total += deleted
+            if opts["verbosity"] > 1:
+                self.stdout.write(f"deleted {deleted}")
+            if len(pks) < batch_size:
+                break
+            if opts["pause"]:
+                time.sleep(opts["pause"])
+
+        self.stdout.write(self.style.SUCCESS(f"Purged {total} OTPs"))
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-17 21:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_remove_user_phone_user_address_user_company_name_and_more'),
+        ('tenants', '0007_tenant_password_hasher'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='passwordresetotp',
+            index=models.Index(condition=models.Q(('is_used', False)), fields=['tenant', 'code', 'user', '-created_at'], name='otp_live_lookup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresetotp',
+            index=models.Index(fields=['expires_at'], name='otp_expires_idx'),
+        ),
+    ]
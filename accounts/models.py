@@ -1,3 +1,4 @@
+from django.contrib.auth.hashers import check_password, make_password
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils import timezone
@@ -26,6 +27,29 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    @property
+    def password_hasher(self):
+        """Algorithm this user's password should be stored with (per tenant)."""
+        from .hashers import preferred_hasher
+        return preferred_hasher(self.tenant if self.tenant_id else None)
+
+    def set_password(self, raw_password):
+        self.password = make_password(raw_password, hasher=self.password_hasher)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """
+        Like AbstractBaseUser.check_password, but measured against the
+        tenant's hasher: a correct password stored any other way is
+        rehashed and saved.
+        """
+        def setter(raw_password):
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return check_password(raw_password, self.password, setter, preferred=self.password_hasher)
+
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["username", "tenant"], name="uniq_username_tenant"),
@@ -63,3 +87,15 @@ class PasswordResetOTP(models.Model):
             destination=destination or "",
             expires_at=timezone.now() + timedelta(minutes=ttl_minutes),
         )
+
+    class Meta:
+        indexes = [
+            # Verification: live codes of a tenant matched by code, newest first.
+            models.Index(
+                fields=["tenant", "code", "user", "-created_at"],
+                condition=models.Q(is_used=False),
+                name="otp_live_lookup_idx",
+            ),
+            # purge_password_otps
+            models.Index(fields=["expires_at"], name="otp_expires_idx"),
+        ]
@@ -0,0 +1,177 @@
+"""
+Sliding-window rate limiting for the unauthenticated auth endpoints.
+
+Each limit counts hits per fixed window and estimates the sliding-window
+total as `previous * (1 - elapsed / window) + current`, which needs only
+two counters per key. Counters live in a pluggable store:
+`LocalMemoryStore` (per process, the default) or `CacheStore` (a Django
+cache shared by every worker). `settings.RATE_LIMIT_STORE` picks one and
+`settings.RATE_LIMITS` holds the limits per scope, e.g. "10/5m".
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+_RATE_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*([smhd])\w*\s*$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """"10/5m" -> (10, 300); "100/h" -> (100, 3600)."""
+    match = _RATE_RE.match(rate)
+    if not match:
+        raise ValueError(f"Invalid rate {rate!r}")
+    limit, count, unit = match.groups()
+    return int(limit), int(count or 1) * _UNITS[unit]
+
+
+class LocalMemoryStore:
+    """Counters in this process's memory, bounded to `max_keys` keys (LRU)."""
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._counters = OrderedDict()  # key -> [window index, previous, current]
+        self._lock = threading.Lock()
+
+    def incr(self, key, window_index, window):
+        """Count a hit in `window_index`; return (previous window, current window) counts."""
+        with self._lock:
+            entry = self._counters.get(key)
+            if entry is None:
+                entry = self._counters[key] = [window_index, 0, 0]
+                if len(self._counters) > self.max_keys:
+                    self._counters.popitem(last=False)
+            else:
+                self._counters.move_to_end(key)
+            index, previous, current = entry
+            if index != window_index:
+                previous = current if index == window_index - 1 else 0
+                current = 0
+            entry[:] = [window_index, previous, current + 1]
+            return previous, current + 1
+
+
+class CacheStore:
+    """Counters in a Django cache, one entry per key and window."""
+
+    def __init__(self, alias="default", prefix="rl"):
+        self.alias = alias
+        self.prefix = prefix
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def incr(self, key, window_index, window):
+        current_key = f"{self.prefix}:{key}:{window_index}"
+        previous_key = f"{self.prefix}:{key}:{window_index - 1}"
+        # add() is a no-op when the counter exists, so incr() stays atomic
+        # on backends that implement it atomically (memcached, redis).
+        self.cache.add(current_key, 0, timeout=2 * window)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:  # evicted between add() and incr()
+            self.cache.set(current_key, 1, timeout=2 * window)
+            current = 1
+        return self.cache.get(previous_key, 0), current
+
+
+class SlidingWindowLimiter:
+    def __init__(self, store, clock=time.time):
+        self.store = store
+        self.clock = clock
+
+    def hit(self, key, limit, window):
+        """
+        Record a hit for `key`. Returns (allowed, retry_after_seconds).
+        Rejected hits are counted too, so hammering a limit keeps it closed.
+        """
+        now = self.clock()
+        window_index, offset = divmod(now, window)
+        window_index = int(window_index)
+        previous, current = self.store.incr(key, window_index, window)
+        estimate = previous * (1 - offset / window) + current
+        if estimate <= limit:
+            return True, 0
+        return False, window - offset
+
+
+_limiter = None
+
+
+def get_limiter():
+    global _limiter
+    if _limiter is None:
+        store = import_string(getattr(settings, "RATE_LIMIT_STORE", "accounts.ratelimit.LocalMemoryStore"))()
+        _limiter = SlidingWindowLimiter(store)
+    return _limiter
+
+
+def reset():
+    """Rebuild the limiter from settings; a local store starts empty again."""
+    global _limiter
+    _limiter = None
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Throttle with one limit per client IP and one per (tenant, identifier),
+    both taken from `settings.RATE_LIMITS[scope]`. A request is rejected
+    as soon as either limit is exceeded.
+    """
+    scope = None
+    identifier_fields = ("email", "username", "identifier")
+
+    def _data(self, request):
+        return request.data if hasattr(request.data, "get") else {}
+
+    def get_tenant(self, request, view):
+        return view.kwargs.get("tenant_slug") or self._data(request).get("tenant_slug") or ""
+
+    def get_identifier(self, request, view):
+        data = self._data(request)
+        for field in self.identifier_fields:
+            value = data.get(field)
+            if value:
+                return str(value).strip().lower()
+        return ""
+
+    def get_keys(self, request, view):
+        rates = settings.RATE_LIMITS.get(self.scope, {})
+        if "ip" in rates:
+            yield f"{self.scope}:ip:{self.get_ident(request)}", rates["ip"]
+        identifier = self.get_identifier(request, view)
+        if "identifier" in rates and identifier:
+            yield f"{self.scope}:id:{self.get_tenant(request, view)}:{identifier}", rates["identifier"]
+
+    def allow_request(self, request, view):
+        limiter = get_limiter()
+        self.retry_after = 0
+        for key, rate in self.get_keys(request, view):
+            limit, window = parse_rate(rate)
+            allowed, retry_after = limiter.hit(key, limit, window)
+            if not allowed:
+                self.retry_after = retry_after
+                return False
+        return True
+
+    def wait(self):
+        return self.retry_after or None
+
+
+class LoginRateThrottle(SlidingWindowThrottle):
+    scope = "login"
+
+
+class OTPRequestRateThrottle(SlidingWindowThrottle):
+    scope = "otp_request"
+
+
+class OTPVerifyRateThrottle(SlidingWindowThrottle):
+    scope = "otp_verify"
@@ -1,5 +1,8 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import Case, F, Q, Subquery, Value, When
+from django.utils import timezone
 from tenants.models import Tenant
 from .models import PasswordResetOTP
 
@@ -32,83 +35,75 @@ class UserWriteSerializer(serializers.ModelSerializer):
         return user
 
 
+def _user_lookup(tenant, identifier):
+    """The tenant's users with `identifier` as email or username, the email match first."""
+    return (
+        User.objects.filter(tenant=tenant)
+        .filter(Q(email=identifier) | Q(username=identifier))
+        .order_by(Case(When(email=identifier, then=Value(0)), default=Value(1)))
+    )
+
+
+def _find_user(tenant, identifier):
+    """The tenant's user with `identifier` as email or username (email wins), in one query."""
+    return _user_lookup(tenant, identifier).first()
+
+
 class PasswordOTPRequestSerializer(serializers.Serializer):
     identifier = serializers.CharField()
     channel = serializers.ChoiceField(choices=PasswordResetOTP.Channel.choices)
     destination = serializers.CharField(required=False, allow_blank=True)
 
     def validate(self, attrs):
-        tenant = self.context.get("tenant")
-        identifier = attrs.get("identifier")
-        try:
-            user = User.objects.get(tenant=tenant, email=identifier)
-        except User.DoesNotExist:
-            try:
-                user = User.objects.get(tenant=tenant, username=identifier)
-            except User.DoesNotExist:
-                raise serializers.ValidationError({"identifier": "User not found"})
+        user = _find_user(self.context.get("tenant"), attrs.get("identifier"))
+        if user is None:
+            raise serializers.ValidationError({"identifier": "User not found"})
         attrs["user"] = user
         return attrs
 
 
+def _validate_otp(tenant, identifier, code):
+    """
+    Return (user, otp) for a live OTP matching `code`, looked up together
+    with its user in one query; the user is resolved as in _find_user, so
+    only that user's codes count. A wrong code counts as an attempt against
+    every live OTP of the user; once OTP_MAX_ATTEMPTS is reached the codes
+    stop working even if guessed.
+    """
+    otp = (
+        PasswordResetOTP.objects.select_related("user__tenant")
+        .filter(tenant=tenant, code=code, is_used=False, user_id=Subquery(_user_lookup(tenant, identifier).values("pk")[:1]))
+        .order_by("-created_at")
+        .first()
+    )
+    if otp is None:
+        user = _find_user(tenant, identifier)
+        if user is None:
+            raise serializers.ValidationError({"identifier": "User not found"})
+        PasswordResetOTP.objects.filter(
+            user=user, tenant=tenant, is_used=False, expires_at__gt=timezone.now()
+        ).update(attempts=F("attempts") + 1)
+        raise serializers.ValidationError({"code": "Invalid code"})
+
+    if otp.attempts >= settings.OTP_MAX_ATTEMPTS:
+        raise serializers.ValidationError({"code": "Too many attempts"})
+    if otp.has_expired():
+        raise serializers.ValidationError({"code": "Code expired"})
+    return otp.user, otp
+
+
 class PasswordOTPVerifySerializer(serializers.Serializer):
     identifier = serializers.CharField()
     code = serializers.CharField(max_length=6)
 
     def validate(self, attrs):
-        tenant = self.context.get("tenant")
-        identifier = attrs.get("identifier")
-        code = attrs.get("code")
-        try:
-            user = User.objects.get(tenant=tenant, email=identifier)
-        except User.DoesNotExist:
-            try:
-                user = User.objects.get(tenant=tenant, username=identifier)
-            except User.DoesNotExist:
-                raise serializers.ValidationError({"identifier": "User not found"})
-        otp = (
-            PasswordResetOTP.objects.filter(user=user, tenant=tenant, code=code, is_used=False)
-            .order_by("-created_at")
-            .first()
-        )
-        if not otp:
-            raise serializers.ValidationError({"code": "Invalid code"})
-        if otp.has_expired():
-            raise serializers.ValidationError({"code": "Code expired"})
-        attrs["user"] = user
-        attrs["otp"] = otp
+        attrs["user"], attrs["otp"] = _validate_otp(self.context.get("tenant"), attrs.get("identifier"), attrs.get("code"))
         return attrs
 
 
-class PasswordResetSerializer(serializers.Serializer):
-    identifier = serializers.CharField()
-    code = serializers.CharField(max_length=6)
+class PasswordResetSerializer(PasswordOTPVerifySerializer):
     new_password = serializers.CharField(write_only=True)
 
-    def validate(self, attrs):
-        tenant = self.context.get("tenant")
-        identifier = attrs.get("identifier")
-        code = attrs.get("code")
-        try:
-            user = User.objects.get(tenant=tenant, email=identifier)
-        except User.DoesNotExist:
-            try:
-                user = User.objects.get(tenant=tenant, username=identifier)
-            except User.DoesNotExist:
-                raise serializers.ValidationError({"identifier": "User not found"})
-        otp = (
-            PasswordResetOTP.objects.filter(user=user, tenant=tenant, code=code, is_used=False)
-            .order_by("-created_at")
-            .first()
-        )
-        if not otp:
-            raise serializers.ValidationError({"code": "Invalid code"})
-        if otp.has_expired():
-            raise serializers.ValidationError({"code": "Code expired"})
-        attrs["user"] = user
-        attrs["otp"] = otp
-        return attrs
-
     def save(self, **kwargs):
         user = self.validated_data["user"]
         otp = self.validated_data["otp"]
@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tenants.models import Site, Tenant
+from .authentication import invalidate_principal, principal_cache
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+    transaction.on_commit(lambda: invalidate_principal(instance.pk))
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+def invalidate_tenant_users(sender, instance, **kwargs):
+    principal_cache.delete_matching(lambda user: user.tenant_id == instance.pk)
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def invalidate_site_users(sender, instance, **kwargs):
+    principal_cache.delete_matching(lambda user: user.site_id == instance.pk)
@@ -0,0 +1,56 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth import get_user_model
+from accounts.authentication import principal_cache
+from tenants.models import Tenant, Site
+from tenants.utils import get_cached_tenant
+
+User = get_user_model()
+
+
+class TenantJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.site = Site.objects.create(tenant=self.tenant, name="HQ", slug="hq")
+        self.manager = User.objects.create_user(
+            username="manager", email="mgr@acme.com", password="manager123",
+            role="SITE_MANAGER", tenant=self.tenant, site=self.site,
+        )
+        res = self.client.post(
+            "/api/auth/token/", {"tenant_slug": "acme", "email": "mgr@acme.com", "password": "manager123"}, format="json"
+        )
+        self.assertEqual(res.status_code, 200)
+        self.access = res.json()["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.url = f"/api/{self.tenant.slug}/tickets/stats/"
+
+    def test_token_carries_principal_claims(self):
+        token = AccessToken(self.access)
+        self.assertEqual(
+            (token["tenant_id"], token["tenant_slug"], token["site_id"], token["role"]),
+            (self.tenant.id, "acme", self.site.id, "SITE_MANAGER"),
+        )
+
+    def test_warm_requests_make_no_auth_queries(self):
+        get_cached_tenant(self.tenant.slug)
+        with self.assertNumQueries(2):  # user (with tenant and site), counters
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.assertNumQueries(1):  # counters only
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_user_update_invalidates_and_stale_role_is_rejected(self):
+        self.client.get(self.url)
+        self.assertIsNotNone(principal_cache.get(self.manager.pk))
+
+        self.manager.role = "ADMIN"
+        self.manager.save()
+        self.assertIsNone(principal_cache.get(self.manager.pk))
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_inactive_user_is_rejected(self):
+        self.client.get(self.url)
+        self.manager.is_active = False
+        self.manager.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
@@ -0,0 +1,51 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tenants.models import Tenant
+
+User = get_user_model()
+
+
+class TokenLoginTests(TestCase):
+    url = "/api/auth/token/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.user = User.objects.create_user(username="fixer", email="fixer@acme.com", password="pass12345", tenant=self.tenant)
+
+    def _login(self, identifier, password="pass12345", tenant_slug="acme"):
+        return self.client.post(self.url, {"tenant_slug": tenant_slug, "email": identifier, "password": password}, format="json")
+
+    def test_tenant_and_user_are_found_in_one_query(self):
+        with self.assertNumQueries(1):
+            res = self._login("fixer@acme.com")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["tenant"], "acme")
+
+    def test_username_and_bad_credentials(self):
+        self.assertEqual(self._login("fixer").status_code, 200)
+        self.assertEqual(self._login("fixer@acme.com", password="wrong").status_code, 400)
+        res = self._login("fixer@acme.com", tenant_slug="nope")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("tenant_slug", res.json())
+
+    def test_login_rehashes_with_the_tenant_hasher(self):
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+        self.tenant.password_hasher = Tenant.PasswordHasher.SCRYPT
+        self.tenant.save()
+
+        self.assertEqual(self._login("fixer@acme.com").status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+
+        # Already current: no further rehash, one query again.
+        with self.assertNumQueries(1):
+            self.assertEqual(self._login("fixer@acme.com").status_code, 200)
+
+    def test_set_password_uses_the_tenant_hasher(self):
+        self.tenant.password_hasher = Tenant.PasswordHasher.SCRYPT
+        self.tenant.save()
+        self.user.set_password("new-pass-123")
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+        self.assertTrue(self.user.check_password("new-pass-123"))
@@ -0,0 +1,81 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts import ratelimit
+from accounts.models import PasswordResetOTP
+from tenants.models import Tenant
+from tenants.utils import get_cached_tenant
+
+User = get_user_model()
+
+
+class PasswordOTPTests(TestCase):
+    def setUp(self):
+        ratelimit.reset()
+        self.addCleanup(ratelimit.reset)
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.user = User.objects.create_user(username="fixer", email="fixer@acme.com", password="pass12345", tenant=self.tenant)
+        self.otp = PasswordResetOTP.create_for(user=self.user, channel=PasswordResetOTP.Channel.EMAIL)
+        self.base = f"/api/{self.tenant.slug}/accounts/password"
+
+    def test_verify_is_a_single_query(self):
+        get_cached_tenant(self.tenant.slug)
+        for identifier in ("fixer", "fixer@acme.com"):
+            with self.assertNumQueries(1):
+                res = self.client.post(f"{self.base}/otp/verify/", {"identifier": identifier, "code": self.otp.code}, format="json")
+            self.assertEqual(res.status_code, 200)
+
+    def test_email_match_takes_precedence_over_username(self):
+        # Another user whose username is this user's email.
+        other = User.objects.create_user(username="fixer@acme.com", email="other@acme.com", password="pass12345", tenant=self.tenant)
+        other_otp = PasswordResetOTP.create_for(user=other, channel=PasswordResetOTP.Channel.EMAIL)
+        PasswordResetOTP.objects.filter(pk=other_otp.pk).update(code="999999")
+        PasswordResetOTP.objects.filter(pk=self.otp.pk).update(code="111111")
+
+        res = self.client.post(f"{self.base}/otp/verify/", {"identifier": "fixer@acme.com", "code": "999999"}, format="json")
+        self.assertEqual(res.json(), {"code": ["Invalid code"]})
+        res = self.client.post(f"{self.base}/otp/verify/", {"identifier": "fixer@acme.com", "code": "111111"}, format="json")
+        self.assertEqual(res.status_code, 200)
+
+    def test_unknown_user_and_expired_code(self):
+        res = self.client.post(f"{self.base}/otp/verify/", {"identifier": "nobody", "code": self.otp.code}, format="json")
+        self.assertEqual(res.json(), {"identifier": ["User not found"]})
+
+        PasswordResetOTP.objects.filter(pk=self.otp.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+        res = self.client.post(f"{self.base}/otp/verify/", {"identifier": "fixer", "code": self.otp.code}, format="json")
+        self.assertEqual(res.json(), {"code": ["Code expired"]})
+
+    def test_reset_uses_code_once(self):
+        payload = {"identifier": "fixer", "code": self.otp.code, "new_password": "n3w-passw0rd"}
+        res = self.client.post(f"{self.base}/reset/", payload, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("n3w-passw0rd"))
+
+        res = self.client.post(f"{self.base}/reset/", payload, format="json")
+        self.assertEqual(res.json(), {"code": ["Invalid code"]})
+
+    def test_purge_deletes_used_and_expired_codes(self):
+        now = timezone.now()
+        PasswordResetOTP.objects.filter(pk=self.otp.pk).update(is_used=True)
+        expired = [PasswordResetOTP.create_for(user=self.user, channel="email") for _ in range(5)]
+        PasswordResetOTP.objects.filter(pk__in=[o.pk for o in expired]).update(expires_at=now - timedelta(hours=2))
+        recent = PasswordResetOTP.create_for(user=self.user, channel="email")
+        PasswordResetOTP.objects.filter(pk=recent.pk).update(expires_at=now - timedelta(minutes=5))
+        live = PasswordResetOTP.create_for(user=self.user, channel="email")
+
+        out = StringIO()
+        call_command("purge_password_otps", "--dry-run", stdout=out)
+        self.assertIn("6 OTPs would be deleted", out.getvalue())
+        self.assertEqual(PasswordResetOTP.objects.count(), 8)
+
+        call_command("purge_password_otps", "--batch-size", "2", stdout=out)
+        self.assertIn("Purged 6 OTPs", out.getvalue())
+        self.assertEqual(set(PasswordResetOTP.objects.values_list("pk", flat=True)), {recent.pk, live.pk})
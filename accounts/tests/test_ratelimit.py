@@ -0,0 +1,85 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from accounts import ratelimit
+from accounts.models import PasswordResetOTP
+from accounts.ratelimit import CacheStore, LocalMemoryStore, SlidingWindowLimiter, parse_rate
+from tenants.models import Tenant
+
+User = get_user_model()
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class SlidingWindowTests(SimpleTestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("10/5m"), (10, 300))
+        self.assertEqual(parse_rate("100/hour"), (100, 3600))
+        with self.assertRaises(ValueError):
+            parse_rate("ten per minute")
+
+    def _exercise(self, store):
+        clock = FakeClock(1000 * 60)
+        limiter = SlidingWindowLimiter(store, clock)
+        self.assertTrue(all(limiter.hit("k", 3, 60)[0] for _ in range(3)))
+        allowed, retry_after = limiter.hit("k", 3, 60)
+        self.assertFalse(allowed)
+        self.assertEqual(retry_after, 60)
+
+        # Half way through the next window half of the previous count remains.
+        clock.now += 90
+        self.assertTrue(limiter.hit("k", 3, 60)[0])  # 4 * 0.5 + 1
+        self.assertFalse(limiter.hit("k", 3, 60)[0])  # 4 * 0.5 + 2
+        self.assertTrue(limiter.hit("other", 3, 60)[0])
+
+    def test_local_memory_store(self):
+        self._exercise(LocalMemoryStore())
+
+    def test_cache_store(self):
+        self._exercise(CacheStore(prefix="rl-test"))
+
+
+@override_settings(RATE_LIMITS={
+    "login": {"identifier": "3/5m", "ip": "100/5m"},
+    "otp_verify": {"identifier": "100/5m"},
+})
+class AuthThrottleTests(TestCase):
+    def setUp(self):
+        ratelimit.reset()
+        self.addCleanup(ratelimit.reset)
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.user = User.objects.create_user(username="fixer", email="fixer@acme.com", password="pass12345", tenant=self.tenant)
+
+    def test_login_is_throttled_per_identifier(self):
+        payload = {"tenant_slug": "acme", "email": "fixer@acme.com", "password": "wrong"}
+        for _ in range(3):
+            self.assertEqual(self.client.post("/api/auth/token/", payload, format="json").status_code, 400)
+        with self.assertNumQueries(0):
+            res = self.client.post("/api/auth/token/", payload, format="json")
+        self.assertEqual(res.status_code, 429)
+        self.assertIn("Retry-After", res.headers)
+
+        # Identifiers are limited independently.
+        other = {**payload, "email": "someone@acme.com"}
+        self.assertEqual(self.client.post("/api/auth/token/", other, format="json").status_code, 400)
+
+    def test_wrong_codes_count_as_otp_attempts(self):
+        otp = PasswordResetOTP.create_for(user=self.user, channel=PasswordResetOTP.Channel.EMAIL)
+        url = f"/api/{self.tenant.slug}/accounts/password/otp/verify/"
+        wrong = "000000" if otp.code != "000000" else "111111"
+        for _ in range(5):
+            res = self.client.post(url, {"identifier": "fixer", "code": wrong}, format="json")
+            self.assertEqual(res.status_code, 400)
+        otp.refresh_from_db()
+        self.assertEqual(otp.attempts, 5)
+
+        res = self.client.post(url, {"identifier": "fixer", "code": otp.code}, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.json()["code"], ["Too many attempts"])
@@ -1,7 +1,8 @@
 from rest_framework import generics, permissions, exceptions, viewsets
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
-from tenants.utils import get_tenant_by_slug_or_404
+from tenants.utils import check_tenant_access, get_request_tenant
+from tickets.pagination import OptionalKeysetPagination
 from .serializers import (
     RegisterSerializer,
     UserSerializer,
@@ -11,6 +12,7 @@ from .serializers import (
     PasswordResetSerializer,
 )
 from .models import PasswordResetOTP
+from .ratelimit import OTPRequestRateThrottle, OTPVerifyRateThrottle
 from django.core.mail import send_mail
 from django.conf import settings
 
@@ -27,18 +29,18 @@ class RegisterView(generics.CreateAPIView):
 
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
-        tenant_slug = self.kwargs.get("tenant_slug")
-        if tenant_slug:
-            ctx["tenant"] = get_tenant_by_slug_or_404(tenant_slug)
+        if self.kwargs.get("tenant_slug"):
+            ctx["tenant"] = get_request_tenant(self.request)
         return ctx
 
 
 class PasswordOTPRequestView(generics.GenericAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = PasswordOTPRequestSerializer
+    throttle_classes = [OTPRequestRateThrottle]
 
     def post(self, request, tenant_slug: str):
-        tenant = get_tenant_by_slug_or_404(tenant_slug)
+        tenant = get_request_tenant(request)
         serializer = self.get_serializer(data=request.data, context={"tenant": tenant})
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
@@ -80,9 +82,10 @@ class PasswordOTPRequestView(generics.GenericAPIView):
 class PasswordOTPVerifyView(generics.GenericAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = PasswordOTPVerifySerializer
+    throttle_classes = [OTPVerifyRateThrottle]
 
     def post(self, request, tenant_slug: str):
-        tenant = get_tenant_by_slug_or_404(tenant_slug)
+        tenant = get_request_tenant(request)
         serializer = self.get_serializer(data=request.data, context={"tenant": tenant})
         serializer.is_valid(raise_exception=True)
         otp = serializer.validated_data["otp"]
@@ -92,9 +95,10 @@ class PasswordOTPVerifyView(generics.GenericAPIView):
 class PasswordResetView(generics.GenericAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = PasswordResetSerializer
+    throttle_classes = [OTPVerifyRateThrottle]
 
     def post(self, request, tenant_slug: str):
-        tenant = get_tenant_by_slug_or_404(tenant_slug)
+        tenant = get_request_tenant(request)
         serializer = self.get_serializer(data=request.data, context={"tenant": tenant})
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -105,9 +109,7 @@ class MeView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        tenant_slug = self.kwargs.get("tenant_slug")
-        if tenant_slug and (not request.user.tenant or request.user.tenant.slug != tenant_slug):
-            raise exceptions.PermissionDenied("Tenant mismatch")
+        check_tenant_access(request)
         return Response(UserSerializer(request.user).data)
 
 
@@ -121,6 +123,7 @@ class IsTenantAdmin(permissions.BasePermission):
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.none()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalKeysetPagination
 
     def get_permissions(self):
         if self.action in ["create", "update", "partial_update", "destroy"]:
@@ -134,16 +137,13 @@ class UserViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        tenant_slug = self.kwargs.get("tenant_slug")
-        if tenant_slug and (not user.tenant or user.tenant.slug != tenant_slug):
-            raise exceptions.PermissionDenied("Tenant mismatch")
+        check_tenant_access(self.request)
         if not user.tenant_id:
             return User.objects.none()
         return User.objects.filter(tenant_id=user.tenant_id).order_by("id")
 
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
-        tenant_slug = self.kwargs.get("tenant_slug")
-        if tenant_slug:
-            ctx["tenant"] = get_tenant_by_slug_or_404(tenant_slug)
+        if self.kwargs.get("tenant_slug"):
+            ctx["tenant"] = get_request_tenant(self.request)
         return ctx
@@ -0,0 +1,55 @@
+"""
+Bulk asset creation.
+
+Names already used by a live asset of the tenant are looked up with one
+query and skipped; the remaining assets go in with a single INSERT whose
+returned primary keys identify exactly the rows this call created, and get
+their initial AssetLog with one more INSERT. The uniq_active_asset_name
+constraint still guards the gap between lookup and insert: when a
+concurrent create takes one of the names first, the INSERT is rolled back
+to its savepoint and retried without the newly taken names.
+"""
+from django.db import IntegrityError, transaction
+
+from .models import Asset, AssetLog
+
+
+def _taken_names(tenant, names):
+    return set(Asset.objects.filter(tenant=tenant, active=True, name__in=names).values_list("name", flat=True))
+
+
+def bulk_create_assets(tenant, items, user=None):
+    """
+    Create assets from validated `items` (dicts of Asset fields including
+    "name"). Returns (created assets, skipped): names already used by a live
+    asset of the tenant, or repeated within `items`, are skipped with
+    {"name": ..., "reason": "exists" | "repeated"}.
+    """
+    unique, repeated, seen = [], [], set()
+    for item in items:
+        (repeated if item["name"] in seen else unique).append(item)
+        seen.add(item["name"])
+    items = unique
+    user_id = getattr(user, "pk", user)
+    with transaction.atomic():
+        taken = _taken_names(tenant, [item["name"] for item in items])
+        while True:
+            pending = [item for item in items if item["name"] not in taken]
+            try:
+                with transaction.atomic():
+                    created = Asset.objects.bulk_create(
+                        [Asset(**item, tenant=tenant, created_by_id=user_id) for item in pending]
+                    )
+                break
+            except IntegrityError:
+                newly_taken = _taken_names(tenant, [item["name"] for item in pending])
+                if not newly_taken:
+                    raise
+                taken |= newly_taken
+        AssetLog.objects.bulk_create(
+            AssetLog(asset=asset, quantity=asset.quantity, change=asset.quantity, created_by_id=user_id)
+            for asset in created
+        )
+    skipped = [{"name": item["name"], "reason": "exists"} for item in items if item["name"] in taken]
+    skipped += [{"name": item["name"], "reason": "repeated"} for item in repeated]
+    return created, skipped
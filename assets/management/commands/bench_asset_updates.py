@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+from loguru import logger
+
+from assets.models import Asset
+from tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = "Benchmark asset saves with and without the old pre-save read, and adjust_quantity() (seeded data is rolled back)"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--updates", type=int, default=10_000, help="Updates per run")
+        parser.add_argument("--assets", type=int, default=500, help="Assets the updates are spread over")
+
+    def handle(self, *args, **opts):
+        runs = (
+            ("quantity, pre-save SELECT", self._quantity_with_select),
+            ("quantity, tracked", self._quantity),
+            ("adjust_quantity()", self._adjust),
+            ("soft delete, pre-save SELECT", self._soft_delete_with_select),
+            ("soft delete, tracked", self._soft_delete),
+        )
+        results = []
+        # One log line per update would dominate the timings.
+        logger.disable("assets")
+        try:
+            with transaction.atomic():
+                tenant = Tenant.objects.create(name="Asset bench", slug="bench-assets", domain="localhost")
+                Asset.objects.bulk_create(
+                    Asset(tenant=tenant, name=f"Asset {i}", quantity=1000) for i in range(opts["assets"])
+                )
+                assets = list(Asset.objects.filter(tenant=tenant).order_by("id"))
+                for name, run in runs:
+                    reset_queries()
+                    with CaptureQueriesContext(connection) as ctx:
+                        run(assets[:1], 1)
+                    started = time.perf_counter()
+                    run(assets, opts["updates"])
+                    results.append((name, time.perf_counter() - started, len(ctx.captured_queries)))
+                transaction.set_rollback(True)
+        finally:
+            logger.enable("assets")
+
+        self.stdout.write(f"Updates per run: {opts['updates']} over {opts['assets']} assets")
+        self.stdout.write(f"{'':<30} {'ms':>9} {'us/update':>10} {'queries/update':>15}")
+        for name, seconds, queries in results:
+            self.stdout.write(f"{name:<30} {seconds * 1000:9.1f} {seconds * 1e6 / opts['updates']:10.1f} {queries:15d}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Speed-up: quantity {results[0][1] / results[1][1]:.1f}x, soft delete {results[3][1] / results[4][1]:.1f}x"
+        ))
+
+    def _select(self, asset):
+        # What the pre_save signal used to do before every save
+        asset._loaded_quantity = Asset.objects.get(pk=asset.pk).quantity
+
+    def _quantity_with_select(self, assets, updates):
+        for i in range(updates):
+            asset = assets[i % len(assets)]
+            self._select(asset)
+            asset.quantity += 1
+            asset.save()
+
+    def _quantity(self, assets, updates):
+        for i in range(updates):
+            asset = assets[i % len(assets)]
+            asset.quantity += 1
+            asset.save()
+
+    def _adjust(self, assets, updates):
+        for i in range(updates):
+            assets[i % len(assets)].adjust_quantity(1)
+
+    def _soft_delete_with_select(self, assets, updates):
+        for i in range(updates):
+            asset = assets[i % len(assets)]
+            self._select(asset)
+            asset.active = not asset.active
+            asset.save(update_fields=["active", "updated_at"])
+
+    def _soft_delete(self, assets, updates):
+        for i in range(updates):
+            asset = assets[i % len(assets)]
+            asset.active = not asset.active
+            asset.save(update_fields=["active", "updated_at"])
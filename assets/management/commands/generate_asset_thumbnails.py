@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandParser
+from loguru import logger
+
+from assets.models import Asset
+from assets.thumbnails import generate, is_current
+
+
+class Command(BaseCommand):
+    help = "Render missing or outdated thumbnails for asset images"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--chunk-size", type=int, default=500, help="Assets read per round trip")
+        parser.add_argument("--force", action="store_true", help="Render again even when the thumbnails are current")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the assets that would be rendered")
+
+    def handle(self, *args, **opts):
+        rendered = failed = 0
+        for asset in self._assets(opts["chunk_size"]):
+            if not opts["force"] and is_current(asset):
+                continue
+            if opts["dry_run"]:
+                rendered += 1
+                continue
+            try:
+                generate(asset)
+            except Exception as exc:
+                failed += 1
+                logger.warning(f"Thumbnails for asset {asset.id} failed: {exc}")
+                continue
+            rendered += 1
+            if opts["verbosity"] > 1:
+                self.stdout.write(f"asset {asset.id}: {asset.image.name}")
+
+        if opts["dry_run"]:
+            self.stdout.write(f"{rendered} assets would be rendered")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Rendered thumbnails for {rendered} assets ({failed} failed)"))
+
+    def _assets(self, chunk_size):
+        # Keyset batches rather than one open cursor, since each render
+        # writes to the same table.
+        with_image = Asset.objects.exclude(image="").exclude(image__isnull=True).only("id", "image", "thumbnails")
+        last_id = 0
+        while True:
+            batch = list(with_image.filter(id__gt=last_id).order_by("id")[:chunk_size])
+            yield from batch
+            if len(batch) < chunk_size:
+                break
+            last_id = batch[-1].id
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.6 on 2026-10-17 21:48
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def rename_duplicates(apps, schema_editor):
+    # Keep the oldest live asset under each (tenant, name); the others get
+    # their id appended so the constraint can be created without losing stock.
+    Asset = apps.get_model('assets', 'Asset')
+    duplicates = (
+        Asset.objects.filter(active=True).exclude(name='')
+        .values('tenant_id', 'name')
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+        .order_by()
+    )
+    for group in duplicates:
+        assets = Asset.objects.filter(active=True, tenant_id=group['tenant_id'], name=group['name']).order_by('id')
+        for asset in assets[1:]:
+            suffix = f' (#{asset.id})'
+            Asset.objects.filter(pk=asset.pk).update(name=asset.name[:255 - len(suffix)] + suffix)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0007_alter_assetlog_options_assetlog_change_and_more'),
+        ('tenants', '0007_tenant_password_hasher'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='asset',
+            constraint=models.UniqueConstraint(condition=models.Q(('active', True), models.Q(('name', ''), _negated=True)), fields=('tenant', 'name'), name='uniq_active_asset_name'),
+        ),
+    ]
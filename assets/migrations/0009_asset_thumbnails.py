@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-17 21:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0008_asset_unique_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='thumbnails',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
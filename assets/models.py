@@ -1,8 +1,12 @@
 from django.db import models
+from django.db.models import Q
 
 class Asset(models.Model):
     serial_number = models.CharField(max_length=255, blank=True)
     image = models.ImageField(upload_to='assets', null=True, blank=True)
+    # Derivatives of `image`, written by assets.thumbnails:
+    # {"source": <image name>, "files": {"<size>": {"<format>": <name>}}}
+    thumbnails = models.JSONField(default=dict, blank=True)
     name = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -15,6 +19,34 @@ class Asset(models.Model):
     updated_by = models.ForeignKey('accounts.User', on_delete=models.CASCADE, related_name='assets_updated', null=True, blank=True)
     active = models.BooleanField(default=True)
 
+    class Meta:
+        constraints = [
+            # One live asset per name within a tenant; soft-deleted and
+            # unnamed assets are not checked. Also serves (tenant, name) lookups.
+            models.UniqueConstraint(
+                fields=["tenant", "name"],
+                condition=Q(active=True) & ~Q(name=""),
+                name="uniq_active_asset_name",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Quantity as read from the database, for the AssetLog written on
+        # save, and the image, to render thumbnails only when it changes
+        if "quantity" in field_names:
+            instance._loaded_quantity = values[field_names.index("quantity")]
+        if "image" in field_names:
+            instance._loaded_image = values[field_names.index("image")] or ""
+        return instance
+
+    def adjust_quantity(self, delta, user=None, unit=""):
+        """Atomically add `delta` to the stored quantity; see assets.stock.adjust_quantity."""
+        from .stock import adjust_quantity
+
+        return adjust_quantity(self, delta, user=user, unit=unit)
+
     def __str__(self):
         return self.name or f"Asset {self.id} for Ticket {self.name}"
 
@@ -1,15 +1,81 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import Asset, AssetLog
+from .stock import Adjustment
+from .thumbnails import current_files
 
 class AssetSerializer(serializers.ModelSerializer):
+    thumbnails = serializers.SerializerMethodField()
+
     class Meta:
         model = Asset
-        fields = ["id", "name", "image", "quantity", "created_at", "active"]
+        fields = ["id", "name", "image", "thumbnails", "quantity", "created_at", "active"]
         read_only_fields = ["created_at"]
+        # Without a default, a multipart form that leaves `active` out
+        # reads as an unchecked box and creates a deactivated asset.
+        extra_kwargs = {"active": {"default": True}}
+
+    def update(self, instance, validated_data):
+        # Only the submitted columns are written: a full-row save would put
+        # back the quantity loaded with the instance and undo any stock
+        # adjustment committed since. Quantity goes through stock.set_quantity.
+        for name, value in validated_data.items():
+            setattr(instance, name, value)
+        instance.save(update_fields=[*validated_data, "updated_at"])
+        return instance
+
+    def get_thumbnails(self, asset):
+        """{"<size>": {"<format>": url}}; empty until the thumbnails are rendered."""
+        storage = Asset._meta.get_field("image").storage
+        request = self.context.get("request")
+        urls = {}
+        for size, by_format in current_files(asset).items():
+            urls[size] = {}
+            for fmt, name in by_format.items():
+                url = storage.url(name)
+                urls[size][fmt] = request.build_absolute_uri(url) if request is not None else url
+        return urls
 
 class AssetLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = AssetLog
-        fields = ["id", "asset", "quantity", "created_at"]
+        fields = ["id", "asset", "quantity", "change", "unit", "created_at"]
         read_only_fields = ["created_at"]
-   
\ No newline at end of file
+
+
+class AdjustmentSerializer(serializers.Serializer):
+    asset = serializers.IntegerField(min_value=1)
+    delta = serializers.IntegerField()
+    unit = serializers.CharField(max_length=50, required=False, allow_blank=True, default="")
+
+    def validate_delta(self, value):
+        if value == 0:
+            raise serializers.ValidationError("Must not be 0")
+        return value
+
+
+class AdjustmentBatchSerializer(serializers.Serializer):
+    adjustments = AdjustmentSerializer(many=True, allow_empty=False)
+
+    def validate_adjustments(self, value):
+        if len(value) > settings.ASSET_ADJUST_MAX:
+            raise serializers.ValidationError(f"At most {settings.ASSET_ADJUST_MAX} adjustments at a time")
+        return [Adjustment(item["asset"], item["delta"], item["unit"]) for item in value]
+
+
+class BulkAssetSerializer(serializers.ModelSerializer):
+    name = serializers.CharField(max_length=255)
+    quantity = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = Asset
+        fields = ["name", "serial_number", "quantity", "cost"]
+
+
+class BulkAssetCreateSerializer(serializers.Serializer):
+    assets = BulkAssetSerializer(many=True, allow_empty=False)
+
+    def validate_assets(self, value):
+        if len(value) > settings.ASSET_BULK_CREATE_MAX:
+            raise serializers.ValidationError(f"At most {settings.ASSET_BULK_CREATE_MAX} assets at a time")
+        return value
@@ -1,19 +1,25 @@
 from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
 from .models import Asset, AssetLog
+from . import thumbnails
 from loguru import logger
 
 @receiver(pre_save, sender=Asset)
-def asset_pre_save(sender, instance: Asset, **kwargs):
-    if not instance._state.adding:  # Only for updates, not creation
-        try:
-            old_instance = Asset.objects.get(pk=instance.pk)
-            instance._old_quantity = old_instance.quantity
-        except Asset.DoesNotExist:
-            pass
+def asset_pre_save(sender, instance: Asset, update_fields=None, **kwargs):
+    # Instances read from the database carry their loaded quantity
+    # (Asset.from_db); only one built by hand for an existing row needs a query.
+    if instance._state.adding or hasattr(instance, '_loaded_quantity'):
+        return
+    if update_fields is not None and 'quantity' not in update_fields:
+        return
+    instance._loaded_quantity = Asset.objects.filter(pk=instance.pk).values_list('quantity', flat=True).first()
 
 @receiver(post_save, sender=Asset)
-def asset_post_save(sender, instance: Asset, created: bool, **kwargs):
+def asset_post_save(sender, instance: Asset, created: bool, update_fields=None, **kwargs):
+    if update_fields is not None and 'quantity' not in update_fields:
+        return
+    old_quantity = getattr(instance, '_loaded_quantity', None)
+    instance._loaded_quantity = instance.quantity
     if created and instance.quantity is not None:
         # For new assets
         AssetLog.objects.create(
@@ -22,13 +28,21 @@ def asset_post_save(sender, instance: Asset, created: bool, **kwargs):
             change=instance.quantity  # Initial quantity as change
         )
         logger.success(f"Asset {instance.id} created by {instance.created_by}")
-    elif hasattr(instance, '_old_quantity') and instance._old_quantity != instance.quantity:
+    elif old_quantity is not None and old_quantity != instance.quantity:
         # For updates where quantity changed
-        change = instance.quantity - instance._old_quantity
+        change = instance.quantity - old_quantity
         AssetLog.objects.create(
             asset=instance,
             quantity=instance.quantity,
             change=change
         )
-        logger.info(f"Asset {instance.id} quantity updated from {instance._old_quantity} to {instance.quantity}")
-        del instance._old_quantity
\ No newline at end of file
+        logger.info(f"Asset {instance.id} quantity updated from {old_quantity} to {instance.quantity}")
+
+@receiver(post_save, sender=Asset)
+def asset_image_post_save(sender, instance: Asset, update_fields=None, **kwargs):
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    image = instance.image.name if instance.image else ''
+    if image and image != getattr(instance, '_loaded_image', None):
+        thumbnails.schedule(instance.pk)
+    instance._loaded_image = image
@@ -0,0 +1,150 @@
+"""
+Asset stock changes.
+
+`adjust_quantity()` changes a quantity with `UPDATE ... SET quantity =
+quantity + delta` instead of saving a value computed in Python, so
+concurrent adjustments add up instead of overwriting each other. The new
+quantity is read back and its AssetLog inserted in the same transaction.
+
+`bulk_adjust()` applies a batch of adjustments over many assets in one
+transaction: the assets are locked in id order (so overlapping batches
+queue up instead of deadlocking), moved with a single UPDATE and logged
+with a single INSERT. A batch that would leave an asset below zero is
+rolled back as a whole.
+
+`set_quantity()` is the edit form's absolute write: it only goes through
+while the stored quantity is still the one the form was loaded with.
+"""
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from .models import Asset, AssetLog
+
+
+def _write_values(user_id, **values):
+    values["updated_at"] = timezone.now()
+    if user_id is not None:
+        values["updated_by_id"] = user_id
+    return values
+
+
+def adjust_quantity(asset, delta, user=None, unit=""):
+    """
+    Add `delta` (signed) to `asset`'s quantity and log the change. Returns
+    the AssetLog; `asset.quantity` is set to the new stored quantity.
+    """
+    user_id = getattr(user, "pk", user)
+    values = _write_values(user_id, quantity=F("quantity") + delta)
+    # No savepoint: a failure rolls back the enclosing transaction as well,
+    # which is what a half-applied adjustment calls for anyway.
+    with transaction.atomic(savepoint=False):
+        updated = Asset.objects.filter(pk=asset.pk).update(**values)
+        if updated:
+            # The UPDATE holds the row lock until commit, so this reads our own write.
+            quantity = Asset.objects.filter(pk=asset.pk).values_list("quantity", flat=True).get()
+            log = AssetLog.objects.create(asset=asset, quantity=quantity, change=delta, unit=unit, created_by_id=user_id)
+    if not updated:
+        raise Asset.DoesNotExist(f"Asset {asset.pk} does not exist")
+    asset.updated_at = values["updated_at"]
+    asset.updated_by_id = values.get("updated_by_id", asset.updated_by_id)
+    asset.quantity = asset._loaded_quantity = quantity
+    return log
+
+
+@dataclass(frozen=True)
+class Adjustment:
+    asset_id: int
+    delta: int
+    unit: str = ""
+
+
+class StockError(ValueError):
+    """A batch was rejected as a whole; `errors` lists the offending assets."""
+
+    def __init__(self, errors):
+        self.errors = errors  # [{"asset": ..., "reason": "not_found" | "insufficient_stock", ...}]
+        super().__init__("; ".join(f"Asset {e['asset']}: {e['reason']}" for e in errors))
+
+
+class QuantityConflict(Exception):
+    """The stored quantity changed since the asset was loaded."""
+
+    def __init__(self, asset_id, expected, actual):
+        self.asset_id, self.expected, self.actual = asset_id, expected, actual
+        if actual is None:
+            message = f"Asset {asset_id} no longer exists"
+        else:
+            message = f"Asset {asset_id} quantity is {actual}, expected {expected}"
+        super().__init__(message)
+
+
+def bulk_adjust(queryset, adjustments, user=None):
+    """
+    Apply `adjustments` to the assets of `queryset`, in order, and append
+    one AssetLog per adjustment. Nothing is applied when an asset is not in
+    `queryset` or its net change would leave it below zero; StockError
+    lists those assets instead. Returns the logs.
+    """
+    adjustments = list(adjustments)
+    totals = {}
+    for adjustment in adjustments:
+        totals[adjustment.asset_id] = totals.get(adjustment.asset_id, 0) + adjustment.delta
+    ids = sorted(totals)
+    user_id = getattr(user, "pk", user)
+
+    with transaction.atomic():
+        found = set(queryset.filter(pk__in=ids).select_for_update().order_by("pk").values_list("pk", flat=True))
+        missing = [{"asset": pk, "reason": "not_found"} for pk in ids if pk not in found]
+        if missing:
+            raise StockError(missing)
+
+        deltas = Case(*(When(pk=pk, then=Value(total)) for pk, total in totals.items()), default=Value(0))
+        Asset.objects.filter(pk__in=ids).update(**_write_values(user_id, quantity=F("quantity") + deltas))
+        # Read after the write, under its locks, so the ledger matches what was stored.
+        quantities = dict(Asset.objects.filter(pk__in=ids).values_list("pk", "quantity"))
+        short = [
+            {"asset": pk, "reason": "insufficient_stock", "available": quantities[pk] - totals[pk], "requested": -totals[pk]}
+            for pk in ids
+            if quantities[pk] < 0 and totals[pk] < 0
+        ]
+        if short:
+            raise StockError(short)
+
+        running = {pk: quantities[pk] - totals[pk] for pk in ids}
+        logs = []
+        for adjustment in adjustments:
+            running[adjustment.asset_id] += adjustment.delta
+            logs.append(AssetLog(
+                asset_id=adjustment.asset_id, quantity=running[adjustment.asset_id], change=adjustment.delta,
+                unit=adjustment.unit, created_by_id=user_id,
+            ))
+        AssetLog.objects.bulk_create(logs)
+    return logs
+
+
+def set_quantity(asset, quantity, user=None):
+    """
+    Store `quantity` with `UPDATE ... WHERE id = ? AND quantity = <loaded>`
+    and log the difference. Raises QuantityConflict when the stored
+    quantity moved in the meantime. Returns the AssetLog, or None when the
+    quantity is unchanged.
+    """
+    expected = getattr(asset, "_loaded_quantity", asset.quantity)
+    if quantity == expected:
+        return None
+    user_id = getattr(user, "pk", user)
+    values = _write_values(user_id, quantity=quantity)
+    with transaction.atomic():
+        if not Asset.objects.filter(pk=asset.pk, quantity=expected).update(**values):
+            actual = Asset.objects.filter(pk=asset.pk).values_list("quantity", flat=True).first()
+            raise QuantityConflict(asset.pk, expected, actual)
+        log = AssetLog.objects.create(
+            asset=asset, quantity=quantity, change=quantity - expected, created_by_id=user_id
+        )
+    for name, value in values.items():
+        setattr(asset, name, value)
+    asset._loaded_quantity = quantity
+    return log
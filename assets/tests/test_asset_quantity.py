@@ -0,0 +1,115 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from assets.models import Asset, AssetLog
+from tenants.models import Tenant
+
+User = get_user_model()
+
+
+class AssetQuantityTrackingTests(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.user = User.objects.create_user(username="admin", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.asset = Asset.objects.create(tenant=self.tenant, name="Pipe", quantity=5)
+
+    def _selects(self, ctx):
+        return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+
+    def test_create_logs_initial_quantity(self):
+        log = self.asset.logs.get()
+        self.assertEqual((log.quantity, log.change), (5, 5))
+
+    def test_save_logs_quantity_change_without_reading_the_row(self):
+        asset = Asset.objects.get(pk=self.asset.pk)
+        asset.quantity = 8
+        with CaptureQueriesContext(connection) as ctx:
+            asset.save()
+        self.assertEqual(self._selects(ctx), [])
+        log = self.asset.logs.order_by("-id").first()
+        self.assertEqual((log.quantity, log.change), (8, 3))
+
+        # The saved quantity becomes the baseline for the next save.
+        asset.quantity = 6
+        asset.save()
+        self.assertEqual(self.asset.logs.order_by("-id").first().change, -2)
+
+    def test_unchanged_quantity_and_other_fields_do_not_log(self):
+        asset = Asset.objects.get(pk=self.asset.pk)
+        asset.name = "Copper pipe"
+        asset.save()
+        asset.active = False
+        with self.assertNumQueries(1):
+            asset.save(update_fields=["active", "updated_at"])
+        self.assertEqual(self.asset.logs.count(), 1)
+
+    def test_update_fields_without_quantity_leave_pending_change_unlogged(self):
+        asset = Asset.objects.get(pk=self.asset.pk)
+        asset.quantity = 9
+        asset.save(update_fields=["name"])
+        self.assertEqual(self.asset.logs.count(), 1)
+        asset.save(update_fields=["quantity"])
+        self.assertEqual(self.asset.logs.order_by("-id").first().change, 4)
+
+    def test_deferred_quantity_reads_old_quantity(self):
+        asset = Asset.objects.only("name").get(pk=self.asset.pk)
+        asset.quantity = 2
+        asset.save()
+        self.assertEqual(self.asset.logs.order_by("-id").first().change, -3)
+
+
+class AdjustQuantityTests(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.user = User.objects.create_user(username="admin", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.asset = Asset.objects.create(tenant=self.tenant, name="Pipe", quantity=5)
+
+    def test_adjust_updates_quantity_and_logs(self):
+        with self.assertNumQueries(3):  # UPDATE, SELECT, INSERT
+            log = self.asset.adjust_quantity(-2, user=self.user)
+        self.assertEqual(self.asset.quantity, 3)
+        self.asset.refresh_from_db()
+        self.assertEqual((self.asset.quantity, self.asset.updated_by_id), (3, self.user.pk))
+        self.assertEqual((log.quantity, log.change, log.created_by_id), (3, -2, self.user.pk))
+
+    def test_adjust_adds_to_stored_quantity_not_stale_instance(self):
+        first = Asset.objects.get(pk=self.asset.pk)
+        second = Asset.objects.get(pk=self.asset.pk)
+        first.adjust_quantity(4)
+        log = second.adjust_quantity(-1)
+        self.assertEqual((second.quantity, log.quantity), (8, 8))
+        self.assertEqual(list(AssetLog.objects.filter(asset=self.asset).order_by("id").values_list("change", flat=True)), [5, 4, -1])
+
+    def test_later_save_does_not_log_the_adjustment_again(self):
+        self.asset.adjust_quantity(3)
+        self.asset.name = "Renamed"
+        self.asset.save()
+        self.assertEqual(self.asset.logs.count(), 2)
+
+    def test_adjust_missing_asset_raises(self):
+        asset = Asset.objects.get(pk=self.asset.pk)
+        Asset.objects.filter(pk=asset.pk).delete()
+        with self.assertRaises(Asset.DoesNotExist):
+            asset.adjust_quantity(1)
+        self.assertFalse(AssetLog.objects.exists())
+
+
+class AssetDeleteEndpointTests(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.user = User.objects.create_user(username="admin", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.asset = Asset.objects.create(tenant=self.tenant, name="Pipe", quantity=5)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_delete_deactivates_asset(self):
+        url = f"/api/acme/assets/{self.asset.pk}/"
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, 204)
+        asset = Asset.objects.get(pk=self.asset.pk)
+        self.assertFalse(asset.active)
+        self.assertEqual(asset.logs.count(), 1)
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,193 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from assets.models import Asset, AssetLog
+from assets.stock import Adjustment, StockError, bulk_adjust
+from tenants.models import Tenant
+
+User = get_user_model()
+
+
+def _seed(test):
+    test.tenant = Tenant.objects.create(name="Acme", slug="acme")
+    test.user = User.objects.create_user(username="tech", password="tech12345", role="CONTRACTOR", tenant=test.tenant)
+    test.pipe = Asset.objects.create(tenant=test.tenant, name="Pipe", quantity=10)
+    test.valve = Asset.objects.create(tenant=test.tenant, name="Valve", quantity=3)
+
+
+class BulkAdjustTests(TestCase):
+    def setUp(self):
+        _seed(self)
+
+    def _changes(self, asset):
+        return list(asset.logs.order_by("id").values_list("quantity", "change", "unit"))
+
+    def test_batch_applies_in_order_and_logs_running_quantities(self):
+        adjustments = [
+            Adjustment(self.pipe.pk, -4, "m"),
+            Adjustment(self.valve.pk, 2),
+            Adjustment(self.pipe.pk, 1, "m"),
+        ]
+        # lock, UPDATE, read back, INSERT (+ savepoint and release)
+        with self.assertNumQueries(6):
+            logs = bulk_adjust(Asset.objects.filter(tenant=self.tenant), adjustments, user=self.user)
+        self.assertEqual([(log.asset_id, log.quantity, log.change) for log in logs], [
+            (self.pipe.pk, 6, -4), (self.valve.pk, 5, 2), (self.pipe.pk, 7, 1),
+        ])
+        self.assertEqual(self._changes(self.pipe), [(10, 10, ""), (6, -4, "m"), (7, 1, "m")])
+        self.pipe.refresh_from_db()
+        self.assertEqual((self.pipe.quantity, self.pipe.updated_by_id), (7, self.user.pk))
+
+    def test_batch_is_rejected_when_stock_would_go_negative(self):
+        with self.assertRaises(StockError) as ctx:
+            bulk_adjust(Asset.objects.all(), [Adjustment(self.pipe.pk, -1), Adjustment(self.valve.pk, -4)])
+        self.assertEqual(ctx.exception.errors, [
+            {"asset": self.valve.pk, "reason": "insufficient_stock", "available": 3, "requested": 4},
+        ])
+        self.assertEqual(
+            dict(Asset.objects.values_list("pk", "quantity")), {self.pipe.pk: 10, self.valve.pk: 3}
+        )
+        self.assertEqual(AssetLog.objects.count(), 2)
+
+    def test_assets_outside_queryset_are_rejected(self):
+        other = Asset.objects.create(tenant=Tenant.objects.create(name="Other", slug="other"), name="Pump")
+        with self.assertRaises(StockError) as ctx:
+            bulk_adjust(Asset.objects.filter(tenant=self.tenant), [Adjustment(self.pipe.pk, 1), Adjustment(other.pk, 1)])
+        self.assertEqual(ctx.exception.errors, [{"asset": other.pk, "reason": "not_found"}])
+        self.assertEqual(Asset.objects.get(pk=self.pipe.pk).quantity, 10)
+
+
+class AssetAdjustEndpointTests(TestCase):
+    def setUp(self):
+        _seed(self)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = "/api/acme/assets/adjust/"
+
+    def test_adjust_returns_ledger_entries(self):
+        response = self.client.post(self.url, {"adjustments": [
+            {"asset": self.pipe.pk, "delta": -3, "unit": "m"},
+            {"asset": self.valve.pk, "delta": 1},
+        ]}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            [(row["asset"], row["quantity"], row["change"], row["unit"]) for row in response.data["adjustments"]],
+            [(self.pipe.pk, 7, -3, "m"), (self.valve.pk, 4, 1, "")],
+        )
+
+    def test_rejected_batches(self):
+        cases = [
+            ({"adjustments": []}, 400),
+            ({"adjustments": [{"asset": self.pipe.pk, "delta": 0}]}, 400),
+            ({"adjustments": [{"asset": self.pipe.pk, "delta": 1}, {"asset": 999, "delta": 1}]}, 400),
+            ({"adjustments": [{"asset": self.valve.pk, "delta": -5}]}, 409),
+        ]
+        for payload, expected in cases:
+            with self.subTest(payload=payload):
+                response = self.client.post(self.url, payload, format="json")
+                self.assertEqual(response.status_code, expected, response.data)
+        self.assertEqual(AssetLog.objects.count(), 2)
+
+    def test_batch_size_is_capped(self):
+        with self.settings(ASSET_ADJUST_MAX=2):
+            response = self.client.post(
+                self.url, {"adjustments": [{"asset": self.pipe.pk, "delta": 1}] * 3}, format="json"
+            )
+        self.assertEqual(response.status_code, 400)
+
+    def test_update_with_stale_quantity_conflicts(self):
+        url = f"/api/acme/assets/{self.pipe.pk}/"
+        response = self.client.patch(url, {"quantity": 12}, format="multipart")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.pipe.logs.order_by("-id").values_list("quantity", "change").first(), (12, 2))
+
+        # Someone else adjusts between our read and our write.
+        original = Asset.from_db
+
+        def stale(cls, db, field_names, values):
+            instance = original.__func__(cls, db, field_names, values)
+            if instance.pk == self.pipe.pk:
+                Asset.objects.filter(pk=self.pipe.pk).update(quantity=11)
+            return instance
+
+        with mock.patch.object(Asset, "from_db", classmethod(stale)):
+            response = self.client.patch(url, {"quantity": 20, "name": "Copper pipe"}, format="multipart")
+        self.assertEqual(response.status_code, 409, response.data)
+        self.assertEqual(response.data["quantity"], 11)
+        pipe = Asset.objects.get(pk=self.pipe.pk)
+        self.assertEqual((pipe.quantity, pipe.name), (11, "Pipe"))
+
+    def test_update_without_quantity_keeps_concurrent_adjustment(self):
+        url = f"/api/acme/assets/{self.pipe.pk}/"
+        original = Asset.from_db
+        adjusted = []
+
+        def stale(cls, db, field_names, values):
+            instance = original.__func__(cls, db, field_names, values)
+            if instance.pk == self.pipe.pk and not adjusted:
+                adjusted.append(bulk_adjust(Asset.objects.all(), [Adjustment(self.pipe.pk, -4)]))
+            return instance
+
+        with mock.patch.object(Asset, "from_db", classmethod(stale)):
+            response = self.client.patch(url, {"name": "Copper pipe"}, format="multipart")
+        self.assertEqual(response.status_code, 200, response.data)
+        pipe = Asset.objects.get(pk=self.pipe.pk)
+        self.assertEqual((pipe.quantity, pipe.name, pipe.updated_by_id), (6, "Copper pipe", self.user.pk))
+        self.assertEqual(self.pipe.logs.order_by("-id").values_list("quantity", "change").first(), (6, -4))
+
+
+class ConcurrentAdjustTests(TransactionTestCase):
+    def setUp(self):
+        _seed(self)
+
+    def test_concurrent_batches_lose_no_updates(self):
+        workers, batches = 8, 10
+        assets = [self.pipe.pk, self.valve.pk]
+        Asset.objects.filter(pk__in=assets).update(quantity=1000)
+        barrier = threading.Barrier(workers)
+        plans = []
+        for worker in range(workers):
+            rng = random.Random(worker)
+            plans.append([
+                [Adjustment(rng.choice(assets), rng.choice([-3, -1, 1, 2])) for _ in range(3)]
+                for _ in range(batches)
+            ])
+
+        def run(plan):
+            barrier.wait()
+            try:
+                for batch in plan:
+                    while True:
+                        try:
+                            bulk_adjust(Asset.objects.all(), batch)
+                            break
+                        except OperationalError as exc:
+                            # The shared-cache in-memory SQLite test database
+                            # reports lock contention instead of waiting for it.
+                            if "locked" not in str(exc):
+                                raise
+                            time.sleep(0.001)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, plans))
+
+        for pk in assets:
+            expected = 1000 + sum(a.delta for plan in plans for batch in plan for a in batch if a.asset_id == pk)
+            self.assertEqual(Asset.objects.get(pk=pk).quantity, expected)
+            # Every ledger entry follows from the one before it.
+            ledger = list(AssetLog.objects.filter(asset_id=pk).order_by("id").values_list("quantity", "change"))[1:]
+            previous = 1000
+            for quantity, change in ledger:
+                self.assertEqual(quantity, previous + change)
+                previous = quantity
+            self.assertEqual(previous, expected)
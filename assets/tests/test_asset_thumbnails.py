@@ -0,0 +1,111 @@
+import io
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from assets.models import Asset
+from tenants.models import Site, Tenant
+from tickets.models import Ticket
+
+User = get_user_model()
+
+
+def photo(name="pump.jpg", size=(400, 300), fmt="JPEG"):
+    out = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(out, fmt)
+    return SimpleUploadedFile(name, out.getvalue(), content_type="image/jpeg")
+
+
+class AssetThumbnailTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        overrides = override_settings(
+            MEDIA_ROOT=self.media, ASSET_THUMBNAIL_WORKERS=0, ASSET_THUMBNAIL_SIZES=[64, 32],
+            ASSET_THUMBNAIL_FORMATS=["webp", "jpeg"],
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.user = User.objects.create_user(username="admin", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _create(self, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/acme/assets/", {"name": "Pump", "quantity": 1, **data}, format="multipart")
+        self.assertEqual(response.status_code, 201, response.data)
+        return response, Asset.objects.get(pk=response.data["id"])
+
+    def test_upload_renders_thumbnails_after_commit(self):
+        response, asset = self._create(image=photo())
+        self.assertEqual(response.data["thumbnails"], {})
+        self.assertEqual(asset.thumbnails["source"], asset.image.name)
+        for size in ("64", "32"):
+            for fmt, pil_format in (("webp", "WEBP"), ("jpeg", "JPEG")):
+                name = asset.thumbnails["files"][size][fmt]
+                self.assertTrue(name.startswith(asset.image.name.rsplit(".", 1)[0] + f"_{size}."))
+                with default_storage.open(name) as fp, Image.open(fp) as image:
+                    self.assertEqual((image.format, max(image.size)), (pil_format, int(size)))
+
+        data = self.client.get(f"/api/acme/assets/{asset.pk}/").data
+        self.assertEqual(set(data["thumbnails"]), {"64", "32"})
+        self.assertTrue(data["thumbnails"]["32"]["webp"].startswith("http://testserver/media/assets/"))
+
+    def test_replaced_image_gets_new_thumbnails_and_old_ones_are_removed(self):
+        _, asset = self._create(image=photo())
+        old = asset.thumbnails["files"]["32"]["webp"]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/api/acme/assets/{asset.pk}/", {"image": photo("valve.png", fmt="PNG")}, format="multipart"
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        asset.refresh_from_db()
+        self.assertIn("valve", asset.thumbnails["files"]["32"]["webp"])
+        self.assertFalse(default_storage.exists(old))
+
+    def test_stale_thumbnails_are_not_served(self):
+        _, asset = self._create(image=photo())
+        Asset.objects.filter(pk=asset.pk).update(image="assets/other.jpg")
+        data = self.client.get(f"/api/acme/assets/{asset.pk}/").data
+        self.assertEqual(data["thumbnails"], {})
+
+    def test_saves_without_an_image_change_do_not_render(self):
+        _, asset = self._create(image=photo())
+        asset = Asset.objects.get(pk=asset.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            asset.name = "Big pump"
+            asset.save()
+            asset.save(update_fields=["active", "updated_at"])
+        self.assertEqual(callbacks, [])
+
+    def test_backfill_command(self):
+        _, asset = self._create()
+        name = default_storage.save("assets/legacy.jpg", photo())
+        Asset.objects.filter(pk=asset.pk).update(image=name)
+        out = io.StringIO()
+        call_command("generate_asset_thumbnails", stdout=out)
+        self.assertIn("Rendered thumbnails for 1 assets", out.getvalue())
+        asset.refresh_from_db()
+        self.assertEqual(asset.thumbnails["source"], name)
+
+        out = io.StringIO()
+        call_command("generate_asset_thumbnails", stdout=out)
+        self.assertIn("for 0 assets", out.getvalue())
+
+    def test_ticket_photo_becomes_an_asset_with_thumbnails(self):
+        site = Site.objects.create(tenant=self.tenant, name="HQ", slug="hq")
+        ticket = Ticket.objects.create(title="Leak", description="d", tenant=self.tenant, site=site, created_by=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"/api/acme/tickets/{ticket.pk}/assets/", {"image": photo()}, format="multipart")
+        self.assertEqual(response.status_code, 201, response.data)
+        asset = ticket.assets.get()
+        self.assertEqual((asset.name, asset.created_by_id), ("pump.jpg", self.user.pk))
+        self.assertIn("64", asset.thumbnails["files"])
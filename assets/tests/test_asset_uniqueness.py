@@ -0,0 +1,119 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from assets import bulk
+from assets.bulk import bulk_create_assets
+from assets.models import Asset, AssetLog
+from tenants.models import Tenant
+
+User = get_user_model()
+
+
+class AssetNameUniquenessTests(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.other = Tenant.objects.create(name="Other", slug="other")
+        self.user = User.objects.create_user(username="admin", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.pipe = Asset.objects.create(tenant=self.tenant, name="Pipe", quantity=4)
+
+    def test_database_rejects_duplicate_live_names_per_tenant(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Asset.objects.create(tenant=self.tenant, name="Pipe")
+        Asset.objects.create(tenant=self.other, name="Pipe")
+        Asset.objects.create(tenant=self.tenant, name="Pipe", active=False)
+        Asset.objects.create(tenant=self.tenant, name="")
+        Asset.objects.create(tenant=self.tenant, name="")
+
+    def test_create_conflict_is_a_400_without_a_name_lookup(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post("/api/acme/assets/", {"name": "Pipe", "quantity": 2}, format="multipart")
+        self.assertEqual(response.status_code, 400, response.data)
+        self.assertIn("name", response.data)
+        self.assertFalse([q for q in ctx.captured_queries if q["sql"].startswith("SELECT") and "assets_asset" in q["sql"]])
+        self.assertEqual(Asset.objects.filter(name="Pipe").count(), 1)
+        self.assertEqual(AssetLog.objects.count(), 1)
+
+        response = self.client.post("/api/acme/assets/", {"name": "Valve", "quantity": 2}, format="multipart")
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_name_used_by_another_tenant_or_a_removed_asset_is_free(self):
+        Asset.objects.create(tenant=self.other, name="Valve")
+        response = self.client.post("/api/acme/assets/", {"name": "Valve", "quantity": 1}, format="multipart")
+        self.assertEqual(response.status_code, 201, response.data)
+
+        Asset.objects.filter(pk=self.pipe.pk).update(active=False)
+        response = self.client.post("/api/acme/assets/", {"name": "Pipe", "quantity": 1}, format="multipart")
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_rename_to_a_taken_name_is_a_400(self):
+        valve = Asset.objects.create(tenant=self.tenant, name="Valve")
+        response = self.client.patch(f"/api/acme/assets/{valve.pk}/", {"name": "Pipe"}, format="multipart")
+        self.assertEqual(response.status_code, 400, response.data)
+        valve.refresh_from_db()
+        self.assertEqual(valve.name, "Valve")
+
+
+class BulkAssetCreateTests(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.user = User.objects.create_user(username="admin", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Asset.objects.create(tenant=self.tenant, name="Pipe", quantity=4)
+
+    def test_bulk_create_skips_existing_and_repeated_names(self):
+        items = [
+            {"name": "Valve", "quantity": 3},
+            {"name": "Pipe", "quantity": 1},
+            {"name": "Pump", "quantity": 1, "serial_number": "P-1"},
+            {"name": "Valve", "quantity": 9},
+        ]
+        # savepoint, taken names, savepoint, INSERT ... RETURNING, release,
+        # INSERT logs, release
+        with self.assertNumQueries(7):
+            created, skipped = bulk_create_assets(self.tenant, items, user=self.user)
+        self.assertEqual([(a.name, a.quantity) for a in created], [("Valve", 3), ("Pump", 1)])
+        self.assertEqual(skipped, [{"name": "Pipe", "reason": "exists"}, {"name": "Valve", "reason": "repeated"}])
+        self.assertEqual(
+            sorted(AssetLog.objects.filter(asset__in=created).values_list("asset__name", "quantity", "change")),
+            [("Pump", 1, 1), ("Valve", 3, 3)],
+        )
+
+    def test_name_taken_concurrently_is_skipped_not_claimed(self):
+        # Pipe is created by another request between the lookup and the INSERT.
+        lookups = []
+
+        def taken_names(tenant, names):
+            lookups.append(names)
+            return set() if len(lookups) == 1 else original(tenant, names)
+
+        original = bulk._taken_names
+        with mock.patch.object(bulk, "_taken_names", taken_names):
+            created, skipped = bulk_create_assets(
+                self.tenant, [{"name": "Pipe", "quantity": 1}, {"name": "Valve", "quantity": 2}], user=self.user
+            )
+        self.assertEqual([a.name for a in created], ["Valve"])
+        self.assertEqual(skipped, [{"name": "Pipe", "reason": "exists"}])
+        self.assertEqual(Asset.objects.get(tenant=self.tenant, name="Pipe").logs.count(), 1)
+
+    def test_bulk_endpoint(self):
+        response = self.client.post("/api/acme/assets/bulk/", {"assets": [
+            {"name": "Valve", "quantity": 2}, {"name": "Pipe", "quantity": 1},
+        ]}, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual([row["name"] for row in response.data["created"]], ["Valve"])
+        self.assertEqual(response.data["skipped"], [{"name": "Pipe", "reason": "exists"}])
+
+        response = self.client.post("/api/acme/assets/bulk/", {"assets": [{"name": "Pipe", "quantity": 1}]}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["created"], [])
+
+        response = self.client.post("/api/acme/assets/bulk/", {"assets": [{"name": "Hose", "quantity": 0}]}, format="json")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,128 @@
+"""
+Thumbnails for asset images.
+
+When an asset's image changes, `schedule()` queues a render for after the
+transaction commits, on a small thread pool (ASSET_THUMBNAIL_WORKERS), so
+uploads return without waiting for Pillow. Each configured size is written
+in each configured format next to the original, e.g. assets/pump.jpg ->
+assets/pump_160.webp, and recorded in Asset.thumbnails together with the
+image it was made from; thumbnails of a replaced image are never served.
+Renders lost to a restart are picked up by `manage.py
+generate_asset_thumbnails`.
+"""
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from loguru import logger
+from PIL import Image, ImageOps
+
+from .models import Asset
+
+# format -> (Pillow format, extension, save options)
+FORMATS = {
+    "webp": ("WEBP", "webp", {"method": 4}),
+    "jpeg": ("JPEG", "jpg", {"optimize": True, "progressive": True}),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def derivative_name(source, size, fmt):
+    root, _ = os.path.splitext(source)
+    return f"{root}_{size}.{FORMATS[fmt][1]}"
+
+
+def current_files(asset):
+    """{"<size>": {"<format>": name}} for the asset's current image, or {}."""
+    thumbnails = asset.thumbnails or {}
+    if not asset.image or thumbnails.get("source") != asset.image.name:
+        return {}
+    return thumbnails.get("files", {})
+
+
+def is_current(asset):
+    files = current_files(asset)
+    return all(
+        fmt in files.get(str(size), {}) for size in settings.ASSET_THUMBNAIL_SIZES for fmt in settings.ASSET_THUMBNAIL_FORMATS
+    )
+
+
+def render(fp, sizes, formats, quality):
+    """Yield (size, format, encoded bytes), fitting the image in size x size boxes."""
+    with Image.open(fp) as image:
+        # JPEG decodes straight at a reduced scale that still covers the
+        # largest box, which is most of the cost for phone photos.
+        image.draft("RGB", (max(sizes), max(sizes)))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+        # Largest first, each one shrunk from the previous.
+        for size in sorted(sizes, reverse=True):
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            for fmt in formats:
+                pil_format, _, options = FORMATS[fmt]
+                frame = image.convert("RGB") if pil_format == "JPEG" and image.mode != "RGB" else image
+                out = io.BytesIO()
+                frame.save(out, pil_format, quality=quality, **options)
+                yield size, fmt, out.getvalue()
+
+
+def generate(asset):
+    """Render and store the thumbnails of `asset.image`; returns the new Asset.thumbnails."""
+    source = asset.image.name
+    storage = asset.image.storage
+    files = {}
+    with asset.image.open("rb") as fp:
+        for size, fmt, data in render(
+            fp, settings.ASSET_THUMBNAIL_SIZES, settings.ASSET_THUMBNAIL_FORMATS, settings.ASSET_THUMBNAIL_QUALITY
+        ):
+            name = derivative_name(source, size, fmt)
+            storage.delete(name)
+            files.setdefault(str(size), {})[fmt] = storage.save(name, ContentFile(data))
+
+    thumbnails = {"source": source, "files": files}
+    written = {name for by_format in files.values() for name in by_format.values()}
+    previous = {name for by_format in (asset.thumbnails or {}).get("files", {}).values() for name in by_format.values()}
+    # Only record them if the image was not replaced while rendering.
+    if Asset.objects.filter(pk=asset.pk, image=source).update(thumbnails=thumbnails):
+        asset.thumbnails = thumbnails
+        stale = previous - written
+    else:
+        stale = written
+    for name in stale:
+        storage.delete(name)
+    return thumbnails
+
+
+def _job(asset_id, close_connection):
+    try:
+        asset = Asset.objects.filter(pk=asset_id).only("id", "image", "thumbnails").first()
+        if asset is not None and asset.image and not is_current(asset):
+            generate(asset)
+    except Exception:
+        logger.exception(f"Thumbnails for asset {asset_id} failed")
+    finally:
+        if close_connection:
+            connection.close()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.ASSET_THUMBNAIL_WORKERS, thread_name_prefix="thumbnails")
+        return _executor
+
+
+def schedule(asset_id):
+    """Render the asset's thumbnails once the current transaction commits."""
+    if settings.ASSET_THUMBNAIL_WORKERS > 0:
+        transaction.on_commit(lambda: _get_executor().submit(_job, asset_id, True))
+    else:
+        transaction.on_commit(lambda: _job(asset_id, False))
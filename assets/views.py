@@ -1,9 +1,17 @@
+from contextlib import contextmanager
+
 from django.shortcuts import render, get_object_or_404
+from django.db import IntegrityError, transaction
 from rest_framework import viewsets, permissions, exceptions, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
 from .models import Asset, AssetLog
-from .serializers import AssetSerializer, AssetLogSerializer
+from .bulk import bulk_create_assets
+from .serializers import AdjustmentBatchSerializer, AssetSerializer, AssetLogSerializer, BulkAssetCreateSerializer
+from .stock import QuantityConflict, StockError, bulk_adjust, set_quantity
+from tickets.pagination import OptionalKeysetPagination
+from tenants.utils import check_tenant_access
 from django.db.models import Count
 from loguru import logger
 
@@ -11,12 +19,11 @@ class AssetViewSet(viewsets.ModelViewSet):
     serializer_class = AssetSerializer
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = (MultiPartParser, FormParser)
+    pagination_class = OptionalKeysetPagination
 
     def get_queryset(self):
         user = self.request.user
-        tenant_slug = self.kwargs.get("tenant_slug")
-        if tenant_slug and (not user.tenant or user.tenant.slug != tenant_slug):
-            raise exceptions.PermissionDenied("Tenant mismatch")
+        check_tenant_access(self.request)
         if not user.tenant_id:
             return Asset.objects.none()
         return Asset.objects.filter(tenant_id=user.tenant_id, active=True).order_by("-created_at")
@@ -28,38 +35,92 @@ class AssetViewSet(viewsets.ModelViewSet):
         if data.get("name") is None:
             raise exceptions.ValidationError("Name is required ")
 
-        if Asset.objects.filter(name=data.get("name")).exists():
-            raise exceptions.ValidationError("Asset with this name already exists")
-
         if data.get("quantity") is None:
             raise exceptions.ValidationError("Quantity is required")
 
         if data.get("quantity") < 1:
             raise exceptions.ValidationError("Quantity must be greater than 0")
 
-        serializer.save(tenant=user.tenant, created_by=user)
+        # Name uniqueness per tenant is enforced by uniq_active_asset_name.
+        with self._unique_name():
+            serializer.save(tenant=user.tenant, created_by=user)
         logger.success(f"Asset {serializer.instance.id} created by {user}")
 
+    @contextmanager
+    def _unique_name(self):
+        try:
+            with transaction.atomic():
+                yield
+        except IntegrityError:
+            raise exceptions.ValidationError({"name": ["Asset with this name already exists"]})
+
+    def update(self, request, *args, **kwargs):
+        try:
+            return super().update(request, *args, **kwargs)
+        except QuantityConflict as exc:
+            return Response({"detail": str(exc), "quantity": exc.actual}, status=status.HTTP_409_CONFLICT)
+
     def perform_update(self, serializer):
         user = self.request.user
-        instance = self.get_object()
+        instance = serializer.instance
         
-        # Handle file upload if present
-        if 'image' in self.request.FILES:
-            instance.image = self.request.FILES['image']
-            instance.save(update_fields=['image'])
-        
-        # Update other fields
-        serializer.save(updated_by=user)
+        with self._unique_name():
+            # A new quantity is only written if nobody changed it since this
+            # asset was loaded; use the adjust action for relative changes.
+            if 'quantity' in serializer.validated_data:
+                set_quantity(instance, serializer.validated_data.pop('quantity'), user)
+
+            # Handle file upload if present
+            if 'image' in self.request.FILES:
+                instance.image = self.request.FILES['image']
+                instance.save(update_fields=['image'])
+            
+            # Update other fields; AssetSerializer.update writes only these.
+            serializer.save(updated_by=user)
         logger.success(f"Asset {instance.id} updated by {user}")
 
+    @action(detail=False, methods=["post"], url_path="bulk", parser_classes=[JSONParser])
+    def bulk_create(self, request, tenant_slug=None):
+        """
+        Create many assets from {"assets": [{"name": ..., "quantity": ...}, ...]}.
+        Names a live asset of the tenant already uses are skipped and reported.
+        """
+        check_tenant_access(request)
+        serializer = BulkAssetCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        created, skipped = bulk_create_assets(request.user.tenant, serializer.validated_data["assets"], user=request.user)
+        logger.success(f"{len(created)} assets created by {request.user}")
+        return Response(
+            {"created": self.get_serializer(created, many=True).data, "skipped": skipped},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["post"], url_path="adjust", parser_classes=[JSONParser])
+    def adjust(self, request, tenant_slug=None):
+        """
+        Apply signed quantity changes, e.g.
+        {"adjustments": [{"asset": 1, "delta": -2, "unit": "m"}, ...]},
+        in one transaction and return the ledger entries. If any asset is
+        unknown (400) or would drop below zero (409), nothing is applied.
+        """
+        serializer = AdjustmentBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            logs = bulk_adjust(self.get_queryset(), serializer.validated_data["adjustments"], user=request.user)
+        except StockError as exc:
+            unknown = any(error["reason"] == "not_found" for error in exc.errors)
+            return Response(
+                {"detail": "No adjustment was applied", "errors": exc.errors},
+                status=status.HTTP_400_BAD_REQUEST if unknown else status.HTTP_409_CONFLICT,
+            )
+        logger.success(f"{len(logs)} asset adjustments by {request.user}")
+        return Response({"adjustments": AssetLogSerializer(logs, many=True).data})
 
-    def delete(self, request, *args, **kwargs):
-        instance = self.get_object()
+    def perform_destroy(self, instance):
+        # Soft delete: the asset's log and ticket history keep pointing at it.
         instance.active = False
-        instance.save()
-        logger.success(f"Asset {instance.id} disabled by {request.user}")
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        instance.save(update_fields=["active", "updated_at"])
+        logger.success(f"Asset {instance.id} disabled by {self.request.user}")
 
 class AssetLogViewSet(viewsets.ModelViewSet):
     serializer_class = AssetLogSerializer
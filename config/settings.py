@@ -38,6 +38,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "tenants.middleware.TenantMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -78,6 +79,20 @@ else:
 
 AUTH_USER_MODEL = "accounts.User"
 
+# Tenants may pick scrypt or argon2 (Tenant.password_hasher); PBKDF2 stays
+# the default. Argon2 requires the optional argon2-cffi package.
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "accounts.hashers.TunedScryptPasswordHasher",
+    "accounts.hashers.TunedArgon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+SCRYPT_WORK_FACTOR = int(os.environ.get("SCRYPT_WORK_FACTOR", str(2**14)))
+ARGON2_TIME_COST = int(os.environ.get("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.environ.get("ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.environ.get("ARGON2_PARALLELISM", "2"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -98,7 +113,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.TenantJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -111,6 +126,23 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
 }
 
+# Tenant resolution cache (per process)
+TENANT_CACHE_SIZE = int(os.environ.get("TENANT_CACHE_SIZE", "1024"))
+TENANT_CACHE_TTL = int(os.environ.get("TENANT_CACHE_TTL", "60"))  # seconds
+
+# Authenticated users, cached per process (see accounts.authentication)
+PRINCIPAL_CACHE_SIZE = int(os.environ.get("PRINCIPAL_CACHE_SIZE", "4096"))
+PRINCIPAL_CACHE_TTL = int(os.environ.get("PRINCIPAL_CACHE_TTL", "30"))  # seconds
+
+# Rate limits for the auth endpoints (see accounts.ratelimit)
+RATE_LIMIT_STORE = os.environ.get("RATE_LIMIT_STORE", "accounts.ratelimit.LocalMemoryStore")
+RATE_LIMITS = {
+    "login": {"identifier": "10/5m", "ip": "60/5m"},
+    "otp_request": {"identifier": "3/15m", "ip": "20/15m"},
+    "otp_verify": {"identifier": "10/15m", "ip": "60/15m"},
+}
+OTP_MAX_ATTEMPTS = int(os.environ.get("OTP_MAX_ATTEMPTS", "5"))
+
 # Twilio
 TWILIO_ACCOUNT_SID = os.environ.get("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.environ.get("TWILIO_AUTH_TOKEN")
@@ -118,6 +150,30 @@ TWILIO_WHATSAPP_FROM = os.environ.get("TWILIO_WHATSAPP_FROM", "whatsapp:+1415523
 DEFAULT_NOTIFY_TO_WHATSAPP = os.environ.get("DEFAULT_NOTIFY_TO_WHATSAPP")
 TWILIO_WHATSAPP_NOTIFY = os.environ.get("TWILIO_WHATSAPP_NOTIFY", "false").lower() == "true"
 
+# Notification outbox (drained by `manage.py drain_outbox`)
+NOTIFICATIONS_BACKEND = os.environ.get("NOTIFICATIONS_BACKEND", "notifications.backends.TwilioBackend")
+NOTIFICATIONS_MAX_ATTEMPTS = int(os.environ.get("NOTIFICATIONS_MAX_ATTEMPTS", "6"))
+NOTIFICATIONS_RETRY_BACKOFF = int(os.environ.get("NOTIFICATIONS_RETRY_BACKOFF", "30"))  # seconds, doubled per attempt
+NOTIFICATIONS_RETRY_BACKOFF_MAX = int(os.environ.get("NOTIFICATIONS_RETRY_BACKOFF_MAX", "3600"))
+NOTIFICATIONS_SEND_TIMEOUT = int(os.environ.get("NOTIFICATIONS_SEND_TIMEOUT", "300"))  # lease on a claimed message
+
+# Bulk ticket import (POST /api/<tenant>/tickets/bulk/) and export (GET .../tickets/export/)
+TICKET_IMPORT_BATCH_SIZE = int(os.environ.get("TICKET_IMPORT_BATCH_SIZE", "500"))
+TICKET_IMPORT_MAX_BATCH_SIZE = int(os.environ.get("TICKET_IMPORT_MAX_BATCH_SIZE", "5000"))
+TICKET_IMPORT_MAX_ERRORS = int(os.environ.get("TICKET_IMPORT_MAX_ERRORS", "1000"))  # reported rows, not a failure cap
+TICKET_EXPORT_CHUNK_SIZE = int(os.environ.get("TICKET_EXPORT_CHUNK_SIZE", "2000"))  # rows fetched per round trip
+TICKET_BULK_TRANSITION_MAX = int(os.environ.get("TICKET_BULK_TRANSITION_MAX", "500"))  # ids per transition request
+
+# Asset stock adjustments (POST /api/<tenant>/assets/adjust/) and bulk creation (POST .../assets/bulk/)
+ASSET_ADJUST_MAX = int(os.environ.get("ASSET_ADJUST_MAX", "500"))  # adjustments per request
+ASSET_BULK_CREATE_MAX = int(os.environ.get("ASSET_BULK_CREATE_MAX", "500"))  # assets per request
+
+# Asset image thumbnails (see assets.thumbnails)
+ASSET_THUMBNAIL_SIZES = [int(size) for size in os.environ.get("ASSET_THUMBNAIL_SIZES", "160,480").split(",")]  # longest edge, px
+ASSET_THUMBNAIL_FORMATS = os.environ.get("ASSET_THUMBNAIL_FORMATS", "webp,jpeg").split(",")
+ASSET_THUMBNAIL_QUALITY = int(os.environ.get("ASSET_THUMBNAIL_QUALITY", "80"))
+ASSET_THUMBNAIL_WORKERS = int(os.environ.get("ASSET_THUMBNAIL_WORKERS", "2"))  # 0 renders in the committing thread
+
 # CORS
 CORS_ALLOW_ALL_ORIGINS = os.environ.get("CORS_ALLOW_ALL", "false").lower() == "true"
 if not CORS_ALLOW_ALL_ORIGINS:
@@ -146,5 +202,12 @@ SPECTACULAR_SETTINGS = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Chunked job card / invoice uploads (POST /api/<tenant>/tickets/<id>/uploads/).
+# Part files stay outside MEDIA_ROOT so unfinished uploads are never served.
+TICKET_UPLOAD_DIR = os.environ.get("TICKET_UPLOAD_DIR", os.path.join(BASE_DIR, "upload_parts"))
+TICKET_UPLOAD_MAX_SIZE = int(os.environ.get("TICKET_UPLOAD_MAX_SIZE", str(200 * 1024 * 1024)))  # bytes per file
+TICKET_UPLOAD_MAX_CHUNK = int(os.environ.get("TICKET_UPLOAD_MAX_CHUNK", str(8 * 1024 * 1024)))  # bytes per PUT
+TICKET_UPLOAD_TTL_HOURS = int(os.environ.get("TICKET_UPLOAD_TTL_HOURS", "24"))  # unfinished sessions expire after
+
 os.makedirs(MEDIA_ROOT, exist_ok=True)
 
@@ -0,0 +1,72 @@
+"""
+Delivery backends for the notification outbox.
+
+`send(message)` returns the provider's message id, or None when the backend
+deliberately dropped the message, and raises on any delivery error so the
+outbox can retry it. `send_many` delivers a batch concurrently and reports
+a (provider id, error) pair per message instead of raising.
+`settings.NOTIFICATIONS_BACKEND` picks the backend.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .twilio_service import create_whatsapp_message, send_whatsapp_bulk
+
+
+class BaseBackend:
+    def send(self, message):
+        raise NotImplementedError
+
+    def _send(self, message):
+        try:
+            return self.send(message), None
+        except Exception as e:
+            return None, e
+
+    def send_many(self, messages, concurrency=4):
+        if not messages:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(messages)))) as pool:
+            return list(pool.map(self._send, messages))
+
+
+class TwilioBackend(BaseBackend):
+    def send(self, message):
+        if not settings.TWILIO_WHATSAPP_NOTIFY:
+            return None
+        return create_whatsapp_message(message.body, message.to or None).sid
+
+    def send_many(self, messages, concurrency=4):
+        if not settings.TWILIO_WHATSAPP_NOTIFY:
+            return [(None, None) for _ in messages]
+        results = send_whatsapp_bulk([(m.to, m.body) for m in messages], max_workers=concurrency)
+        return [(result.sid, result.error) for result in results]
+
+
+class FakeBackend(BaseBackend):
+    """
+    Records messages in memory instead of calling Twilio.
+
+    `sent` is shared by every instance so tests can inspect what a worker
+    delivered; `fail_with` makes `send` raise to exercise retries.
+    """
+    sent = []
+
+    def __init__(self, fail_with=None):
+        self.fail_with = fail_with
+
+    def send(self, message):
+        if self.fail_with is not None:
+            raise self.fail_with
+        self.sent.append((message.to, message.body))
+        return f"FAKE{message.pk}"
+
+    @classmethod
+    def reset(cls):
+        cls.sent.clear()
+
+
+def get_backend():
+    return import_string(settings.NOTIFICATIONS_BACKEND)()
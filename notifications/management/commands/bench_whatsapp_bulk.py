@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from statistics import median
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from notifications import twilio_service
+
+
+def _stub_handler(latency: float):
+    class StubTwilioHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            time.sleep(latency)
+            body = json.dumps({"sid": f"SM{uuid.uuid4().hex}", "status": "queued"}).encode()
+            self.send_response(201)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubTwilioHandler
+
+
+class Command(BaseCommand):
+    help = "Benchmark sequential vs bulk WhatsApp sends against a local stub of the Twilio API"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--recipients", type=int, default=50, help="Recipients per send")
+        parser.add_argument("--latency-ms", type=float, default=80.0, help="Simulated Twilio response time")
+        parser.add_argument("--workers", type=int, default=twilio_service.MAX_CONCURRENCY, help="Bulk parallelism cap")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per strategy")
+
+    def handle(self, *args, **opts):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _stub_handler(opts["latency_ms"] / 1000))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        env = {
+            "TWILIO_ACCOUNT_SID": "AC" + "0" * 32,
+            "TWILIO_AUTH_TOKEN": "stub",
+            "TWILIO_API_BASE_URL": f"http://127.0.0.1:{server.server_port}",
+            "TWILIO_WHATSAPP_NOTIFY": "true",
+        }
+        recipients = [f"whatsapp:+1555{n:07d}" for n in range(opts["recipients"])]
+        message = "ℹ️ TICKET CLOSED - benchmark"
+
+        def sequential():
+            for to in recipients:
+                twilio_service.create_whatsapp_message(message, to)
+
+        def bulk():
+            results = twilio_service.send_whatsapp_bulk(recipients, message, max_workers=opts["workers"])
+            assert all(result.ok for result in results), [r.error for r in results if not r.ok][:1]
+
+        try:
+            with mock.patch.dict(os.environ, env), mock.patch.object(twilio_service, "_client", None):
+                timings = {}
+                for label, run in (("sequential", sequential), (f"bulk x{opts['workers']}", bulk)):
+                    samples = []
+                    for _ in range(opts["repeat"]):
+                        start = time.perf_counter()
+                        run()
+                        samples.append(time.perf_counter() - start)
+                    timings[label] = median(samples)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.stdout.write(f"{len(recipients)} recipients, {opts['latency_ms']:.0f} ms simulated latency")
+        for label, seconds in timings.items():
+            self.stdout.write(f"  {label:<14} {seconds * 1000:8.1f} ms")
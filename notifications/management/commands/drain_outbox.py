@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from notifications.outbox import drain
+
+
+class Command(BaseCommand):
+    help = "Deliver queued notifications from the outbox, retrying failures with backoff"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=50, help="Messages claimed per batch")
+        parser.add_argument("--concurrency", type=int, default=4, help="Sends in flight at once")
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting once the outbox is empty")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds to sleep between polls with --loop")
+
+    def handle(self, *args, **opts):
+        batch_size: int = opts["batch_size"]
+        concurrency: int = opts["concurrency"]
+        totals: Counter = Counter()
+
+        try:
+            while True:
+                outcome = drain(limit=batch_size, concurrency=concurrency)
+                totals.update(outcome)
+                if outcome and opts["verbosity"] > 1:
+                    self.stdout.write(", ".join(f"{status}: {n}" for status, n in sorted(outcome.items())))
+                if sum(outcome.values()) < batch_size:
+                    if not opts["loop"]:
+                        break
+                    time.sleep(opts["interval"])
+        except KeyboardInterrupt:
+            pass
+
+        summary = ", ".join(f"{status}: {n}" for status, n in sorted(totals.items())) or "nothing due"
+        self.stdout.write(self.style.SUCCESS(f"Outbox drained ({summary})"))
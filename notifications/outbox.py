@@ -0,0 +1,121 @@
+"""
+Transactional outbox for outbound notifications.
+
+Callers `enqueue` messages inside the transaction that makes the change the
+message is about; `drain` (run by `manage.py drain_outbox`) claims due
+messages, delivers them through the configured backend on a bounded thread
+pool and records the outcome, retrying failures with exponential backoff.
+
+Delivery is at-least-once: a worker that dies after the provider accepted
+a message but before recording it leaves the message to be sent again once
+its lease expires. The idempotency key keeps the same event from being
+queued twice.
+"""
+import random
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .backends import get_backend
+from .models import OutboxMessage
+
+Status = OutboxMessage.Status
+
+
+def enqueue(body, to="", key=None, channel=OutboxMessage.Channel.WHATSAPP):
+    """
+    Queue `body` for delivery to `to` (blank for the default number).
+
+    Enqueueing a `key` that is already queued returns the existing message,
+    so retried requests and repeated calls do not notify twice.
+    """
+    message, _ = OutboxMessage.objects.get_or_create(
+        idempotency_key=key or uuid.uuid4().hex,
+        defaults={"channel": channel, "to": to or "", "body": body},
+    )
+    return message
+
+
+def enqueue_many(messages, channel=OutboxMessage.Channel.WHATSAPP):
+    """
+    Queue (to, body, key) triples with a single INSERT. Keys that are
+    already queued are skipped, as with `enqueue`.
+    """
+    rows = [
+        OutboxMessage(channel=channel, to=to or "", body=body, idempotency_key=key or uuid.uuid4().hex)
+        for to, body, key in messages
+    ]
+    OutboxMessage.objects.bulk_create(rows, ignore_conflicts=True)
+    return len(rows)
+
+
+def retry_delay(attempts):
+    """Backoff before attempt `attempts + 1`: doubling from the base, capped, with jitter."""
+    base = settings.NOTIFICATIONS_RETRY_BACKOFF
+    delay = min(base * 2 ** max(attempts - 1, 0), settings.NOTIFICATIONS_RETRY_BACKOFF_MAX)
+    return timedelta(seconds=delay + random.uniform(0, base / 2))
+
+
+def claim(limit, now=None):
+    """
+    Lease up to `limit` due messages to this worker and return them.
+
+    Messages left SENDING by a worker whose lease ran out are due again.
+    Concurrent workers skip each other's locked rows instead of waiting.
+    """
+    now = now or timezone.now()
+    due = OutboxMessage.objects.filter(
+        Q(status=Status.PENDING, next_attempt_at__lte=now) | Q(status=Status.SENDING, locked_until__lte=now)
+    )
+    with transaction.atomic():
+        ids = list(
+            due.select_for_update(skip_locked=True).order_by("next_attempt_at", "id").values_list("id", flat=True)[:limit]
+        )
+        OutboxMessage.objects.filter(id__in=ids).update(
+            status=Status.SENDING,
+            attempts=F("attempts") + 1,
+            locked_until=now + timedelta(seconds=settings.NOTIFICATIONS_SEND_TIMEOUT),
+        )
+    return list(OutboxMessage.objects.filter(id__in=ids).order_by("next_attempt_at", "id"))
+
+
+def _record(message, provider_id, error, now):
+    message.locked_until = None
+    if error is None:
+        message.status = Status.SENT if provider_id else Status.SKIPPED
+        message.provider_id = provider_id or ""
+        message.last_error = ""
+        message.sent_at = now
+    else:
+        message.last_error = f"{type(error).__name__}: {error}"
+        if message.attempts >= settings.NOTIFICATIONS_MAX_ATTEMPTS:
+            message.status = Status.FAILED
+        else:
+            message.status = Status.PENDING
+            message.next_attempt_at = now + retry_delay(message.attempts)
+    message.save(update_fields=["status", "provider_id", "last_error", "sent_at", "next_attempt_at", "locked_until"])
+
+
+def drain(limit=50, concurrency=4, backend=None):
+    """
+    Deliver one batch of due messages with at most `concurrency` sends in
+    flight. Returns a Counter of the resulting statuses.
+    """
+    backend = backend or get_backend()
+    messages = claim(limit)
+    if not messages:
+        return Counter()
+
+    # Only the provider calls run concurrently; results are written back from
+    # this thread so the backend's workers never need a database connection.
+    results = backend.send_many(messages, concurrency=concurrency)
+
+    now = timezone.now()
+    for message, (provider_id, error) in zip(messages, results):
+        _record(message, provider_id, error, now)
+    return Counter(message.status for message in messages)
@@ -0,0 +1,52 @@
+"""
+Registry of notification message templates, keyed by (event, audience).
+
+Templates are plain `str.format` strings, dedented and parsed once when they
+are registered (at import time), and rendered with `format_map` against a
+context object. Only the fields a template names are looked up, so a lazy
+context computes just what the chosen message needs.
+"""
+import textwrap
+from string import Formatter
+
+
+class MessageTemplate:
+    def __init__(self, text):
+        self.text = textwrap.dedent(text).strip()
+        # Root names of the referenced fields; parsing also rejects malformed
+        # templates at registration instead of at send time.
+        self.fields = frozenset(
+            name.split(".")[0].split("[")[0] for _, name, _, _ in Formatter().parse(self.text) if name
+        )
+
+    def render(self, context):
+        return self.text.format_map(context)
+
+
+class LazyContext:
+    """
+    Base for template contexts: fields are attributes (typically
+    cached_property) resolved only when a template asks for them.
+    """
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+
+_templates = {}
+
+
+def register(event, audience, text):
+    _templates[(event, audience)] = MessageTemplate(text)
+
+
+def get_template(event, audience):
+    return _templates.get((event, audience))
+
+
+def render(event, audience, context):
+    """Render the (event, audience) message, or None when none is registered."""
+    template = get_template(event, audience)
+    return template.render(context) if template is not None else None
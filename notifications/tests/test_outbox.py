@@ -0,0 +1,105 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from notifications.backends import FakeBackend
+from notifications.models import OutboxMessage
+from notifications.outbox import drain, enqueue
+from tenants.models import Tenant
+from tickets.models import Ticket
+
+User = get_user_model()
+
+
+@override_settings(NOTIFICATIONS_BACKEND="notifications.backends.FakeBackend", NOTIFICATIONS_MAX_ATTEMPTS=3)
+class OutboxTests(TestCase):
+    def setUp(self):
+        FakeBackend.reset()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.admin = User.objects.create_user(
+            username="admin", email="admin@acme.com", password="admin123", role="ADMIN",
+            tenant=self.tenant, phone_number="whatsapp:+100",
+        )
+        self.contractor = User.objects.create_user(
+            username="fixer", email="fixer@acme.com", password="pass12345", role="CONTRACTOR",
+            tenant=self.tenant, phone_number="whatsapp:+200",
+        )
+        self.ticket = Ticket.objects.create(title="Leak", description="Pipe", tenant=self.tenant, created_by=self.admin)
+
+    def test_assignment_queues_instead_of_sending(self):
+        self.ticket.assign_contractor(self.contractor)
+
+        queued = OutboxMessage.objects.order_by("to")
+        self.assertEqual([m.to for m in queued], ["whatsapp:+100", "whatsapp:+200"])
+        self.assertTrue(all(m.status == OutboxMessage.Status.PENDING for m in queued))
+        self.assertEqual(FakeBackend.sent, [])
+
+        out = StringIO()
+        call_command("drain_outbox", stdout=out)
+        self.assertIn("SENT: 2", out.getvalue())
+        self.assertEqual(sorted(to for to, _ in FakeBackend.sent), ["whatsapp:+100", "whatsapp:+200"])
+        self.assertFalse(OutboxMessage.objects.exclude(status=OutboxMessage.Status.SENT).exists())
+
+    def test_rolled_back_change_queues_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.ticket.assign_contractor(self.contractor)
+                raise RuntimeError
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_idempotency_key_dedupes(self):
+        first = enqueue("hello", to="whatsapp:+1", key="k1")
+        second = enqueue("hello again", to="whatsapp:+1", key="k1")
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    def test_failures_back_off_then_give_up(self):
+        message = enqueue("hello", to="whatsapp:+1")
+        failing = FakeBackend(fail_with=ConnectionError("provider down"))
+
+        self.assertEqual(drain(backend=failing), {OutboxMessage.Status.PENDING: 1})
+        message.refresh_from_db()
+        self.assertEqual(message.attempts, 1)
+        self.assertGreater(message.next_attempt_at, timezone.now())
+        self.assertIn("provider down", message.last_error)
+
+        # Not due yet, so nothing is claimed.
+        self.assertEqual(drain(backend=failing), {})
+
+        for _ in range(2):
+            OutboxMessage.objects.filter(pk=message.pk).update(next_attempt_at=timezone.now())
+            drain(backend=failing)
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxMessage.Status.FAILED)
+        self.assertEqual(message.attempts, 3)
+
+    def test_expired_lease_is_reclaimed(self):
+        message = enqueue("hello", to="whatsapp:+1")
+        OutboxMessage.objects.filter(pk=message.pk).update(
+            status=OutboxMessage.Status.SENDING, locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(drain(), {OutboxMessage.Status.SENT: 1})
+        self.assertEqual(FakeBackend.sent, [("whatsapp:+1", "hello")])
+
+    def test_closed_ticket_fans_out_to_admins(self):
+        for n in range(3):
+            User.objects.create_user(
+                username=f"boss{n}", email=f"boss{n}@acme.com", password="pass12345", role="ADMIN",
+                tenant=self.tenant, is_superuser=True, phone_number=f"whatsapp:+30{n}",
+            )
+        self.ticket.assign_contractor(self.contractor)
+        self.ticket.start_work()
+        self.ticket.mark_resolved()
+        OutboxMessage.objects.all().delete()
+
+        self.ticket.close_ticket(rating=5)
+        self.assertEqual(
+            sorted(OutboxMessage.objects.filter(to__startswith="whatsapp:+30").values_list("to", flat=True)),
+            ["whatsapp:+300", "whatsapp:+301", "whatsapp:+302"],
+        )
+        self.assertEqual(drain(concurrency=2), {OutboxMessage.Status.SENT: 5})  # plus contractor and creator
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from notifications import twilio_service
+
+
+class SendWhatsAppBulkTests(SimpleTestCase):
+    def _create(self, message, to=None):
+        if to == "whatsapp:+2":
+            raise ConnectionError("unreachable")
+        return SimpleNamespace(sid=f"SM-{to}")
+
+    @override_settings(TWILIO_WHATSAPP_NOTIFY=True)
+    @mock.patch.object(twilio_service, "_get_client")
+    def test_reports_a_result_per_recipient(self, _get_client):
+        with mock.patch.object(twilio_service, "create_whatsapp_message", side_effect=self._create) as create:
+            results = twilio_service.send_whatsapp_bulk(
+                ["whatsapp:+1", "whatsapp:+2", "whatsapp:+3"], "hello", max_workers=2
+            )
+
+        self.assertEqual(create.call_count, 3)
+        self.assertEqual([r.to for r in results], ["whatsapp:+1", "whatsapp:+2", "whatsapp:+3"])
+        self.assertEqual([r.ok for r in results], [True, False, True])
+        self.assertEqual(results[2].sid, "SM-whatsapp:+3")
+        self.assertIsInstance(results[1].error, ConnectionError)
+
+    @override_settings(TWILIO_WHATSAPP_NOTIFY=True)
+    @mock.patch.object(twilio_service, "_get_client")
+    def test_accepts_per_recipient_bodies(self, _get_client):
+        with mock.patch.object(twilio_service, "create_whatsapp_message", side_effect=self._create) as create:
+            twilio_service.send_whatsapp_bulk([("whatsapp:+1", "a"), ("whatsapp:+3", "b")])
+        self.assertEqual(sorted(c.args for c in create.call_args_list), [("a", "whatsapp:+1"), ("b", "whatsapp:+3")])
+
+    @override_settings(TWILIO_WHATSAPP_NOTIFY=False)
+    @mock.patch.dict("os.environ", {"TWILIO_WHATSAPP_NOTIFY": "false"})
+    def test_disabled_by_setting(self):
+        with mock.patch.object(twilio_service, "create_whatsapp_message") as create:
+            results = twilio_service.send_whatsapp_bulk(["whatsapp:+1"], "hello")
+        create.assert_not_called()
+        self.assertEqual([(r.to, r.sid, r.ok) for r in results], [("whatsapp:+1", None, True)])
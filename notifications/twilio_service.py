@@ -1,8 +1,15 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from django.conf import settings
+from loguru import logger
 from twilio.rest import Client
 
 _client = None
 
+# Upper bound on Twilio requests in flight for one bulk send.
+MAX_CONCURRENCY = int(os.getenv("TWILIO_MAX_CONCURRENCY", "8"))
+
 def _get_client():
     global _client
     if _client is None:
@@ -10,28 +17,33 @@ def _get_client():
             os.getenv("TWILIO_ACCOUNT_SID"),
             os.getenv("TWILIO_AUTH_TOKEN")
         )
+        # Point the client at a stub server (benchmarks, staging)
+        if os.getenv("TWILIO_API_BASE_URL"):
+            _client.api.base_url = os.getenv("TWILIO_API_BASE_URL")
     return _client
 
+DEFAULT_TO_NUMBER = "whatsapp:+263778587612"
+FROM_NUMBER = "whatsapp:+14155238886"
+
+
+def create_whatsapp_message(message: str, to: str | None = None):
+    """Create the message through the Twilio API; errors are left to the caller."""
+    return _get_client().messages.create(
+        from_=FROM_NUMBER,
+        to=to or DEFAULT_TO_NUMBER,
+        body=message
+    )
+
+
 def send_whatsapp(message: str, to: str | None = None):
     if not os.getenv("TWILIO_WHATSAPP_NOTIFY", False):
         print("WhatsApp notifications are disabled.")
         return
 
-    to_number = to or "whatsapp:+263778587612"
-    from_number = "whatsapp:+14155238886"
-
-    if not to_number or not from_number:
-        print("Missing WhatsApp numbers.")
-        return
-
-    client = _get_client()
+    to_number = to or DEFAULT_TO_NUMBER
 
     try:
-        msg = client.messages.create(
-            from_=from_number,
-            to=to_number,
-            body=message
-        )
+        msg = create_whatsapp_message(message, to_number)
         print(f"✅ Message sent to {to_number}")
         print(f"SID: {msg.sid}")
         print(f"Initial Status: {msg.status}")  
@@ -40,3 +52,43 @@ def send_whatsapp(message: str, to: str | None = None):
     except Exception as e:
         print(f"❌ Failed to send WhatsApp message: {e}")
         return None
+
+
+@dataclass
+class WhatsAppResult:
+    to: str
+    sid: str | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _deliver(to: str, body: str) -> WhatsAppResult:
+    try:
+        return WhatsAppResult(to, sid=create_whatsapp_message(body, to).sid)
+    except Exception as e:
+        return WhatsAppResult(to, error=e)
+
+
+def send_whatsapp_bulk(recipients, message: str | None = None, max_workers: int | None = None) -> list[WhatsAppResult]:
+    """
+    Send to many recipients concurrently, at most `max_workers` requests at
+    a time (default TWILIO_MAX_CONCURRENCY).
+
+    `recipients` holds phone numbers that all receive `message`, or
+    (number, body) pairs. Returns one WhatsAppResult per recipient, in order;
+    a failed send is reported in its result rather than raised.
+    """
+    pairs = [(r, message) if isinstance(r, str) else tuple(r) for r in recipients]
+    if not pairs:
+        return []
+    if not settings.TWILIO_WHATSAPP_NOTIFY:
+        logger.info(f"WhatsApp notifications are disabled; skipped {len(pairs)} messages")
+        return [WhatsAppResult(to) for to, _ in pairs]
+
+    _get_client()  # build the shared client before the threads need it
+    workers = max(1, min(max_workers or MAX_CONCURRENCY, len(pairs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda pair: _deliver(*pair), pairs))
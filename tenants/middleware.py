@@ -0,0 +1,24 @@
+from .utils import get_cached_tenant
+
+
+class TenantMiddleware:
+    """
+    Resolve the `<tenant_slug>` URL segment once per request and attach the
+    tenant as `request.tenant` (None when the URL has no slug or the slug is
+    unknown). Lookups go through the in-process tenant cache.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.tenant_slug = None
+        request.tenant = None
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        slug = view_kwargs.get("tenant_slug")
+        if slug:
+            request.tenant_slug = slug
+            request.tenant = get_cached_tenant(slug)
+        return None
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.6 on 2026-10-17 20:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def backfill_spend(apps, schema_editor):
+    Ticket = apps.get_model('tickets', 'Ticket')
+    SiteMonthlySpend = apps.get_model('tenants', 'SiteMonthlySpend')
+    buckets = (
+        Ticket.objects.filter(site__isnull=False, resolved_at__isnull=False, invoice_amount__isnull=False)
+        .annotate(year=ExtractYear('resolved_at'), month=ExtractMonth('resolved_at'))
+        .values('tenant_id', 'site_id', 'year', 'month')
+        .annotate(total=Sum('invoice_amount'), n=Count('id'))
+        .order_by()
+    )
+    SiteMonthlySpend.objects.bulk_create(
+        [
+            SiteMonthlySpend(
+                tenant_id=b['tenant_id'], site_id=b['site_id'], year=b['year'], month=b['month'],
+                total_invoiced=b['total'], ticket_count=b['n'],
+            )
+            for b in buckets
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0005_remove_site_domain_tenant_domain'),
+        ('tickets', '0012_ticketcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteMonthlySpend',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveIntegerField()),
+                ('total_invoiced', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('ticket_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('site', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_spend', to='tenants.site')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_spend', to='tenants.tenant')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='sitemonthlyspend',
+            constraint=models.UniqueConstraint(fields=('site', 'year', 'month'), name='uniq_site_spend_month'),
+        ),
+        migrations.RunPython(backfill_spend, migrations.RunPython.noop),
+    ]
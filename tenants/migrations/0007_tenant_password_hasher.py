@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-17 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0006_sitemonthlyspend'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenant',
+            name='password_hasher',
+            field=models.CharField(blank=True, choices=[('', 'Default'), ('pbkdf2_sha256', 'PBKDF2'), ('scrypt', 'scrypt'), ('argon2', 'Argon2')], default='', help_text="Algorithm for new and rehashed passwords of this tenant's users", max_length=20),
+        ),
+    ]
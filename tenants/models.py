@@ -2,10 +2,20 @@ from django.db import models
 from datetime import date
 
 class Tenant(models.Model):
+    class PasswordHasher(models.TextChoices):
+        DEFAULT = "", "Default"
+        PBKDF2 = "pbkdf2_sha256", "PBKDF2"
+        SCRYPT = "scrypt", "scrypt"
+        ARGON2 = "argon2", "Argon2"
+
     name = models.CharField(max_length=200)
     slug = models.SlugField(unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
     domain = models.CharField(max_length=200)
+    password_hasher = models.CharField(
+        max_length=20, choices=PasswordHasher.choices, default=PasswordHasher.DEFAULT, blank=True,
+        help_text="Algorithm for new and rehashed passwords of this tenant's users",
+    )
 
     def __str__(self):
         return self.slug
@@ -42,3 +52,28 @@ class SiteBudget(models.Model):
 
     def __str__(self):
         return f"{self.site} {self.year}-{self.month:02d}: {self.amount}"
+
+
+class SiteMonthlySpend(models.Model):
+    """
+    Invoiced spend per site and calendar month of `Ticket.resolved_at`.
+
+    Maintained incrementally by tickets.rollups whenever a ticket's
+    invoice_amount, resolved_at or site changes; rebuilt from history with
+    the `backfill_site_monthly_spend` command.
+    """
+    tenant = models.ForeignKey('tenants.Tenant', on_delete=models.CASCADE, related_name='monthly_spend')
+    site = models.ForeignKey('tenants.Site', on_delete=models.CASCADE, related_name='monthly_spend')
+    year = models.PositiveIntegerField()
+    month = models.PositiveIntegerField()  # 1-12
+    total_invoiced = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    ticket_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["site", "year", "month"], name="uniq_site_spend_month"),
+        ]
+
+    def __str__(self):
+        return f"{self.site} {self.year}-{self.month:02d}: {self.total_invoiced}"
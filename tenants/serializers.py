@@ -4,7 +4,7 @@ from .models import Tenant, Site, SiteBudget
 class TenantSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tenant
-        fields = ["id", "name", "slug", "created_at"]
+        fields = ["id", "name", "slug", "password_hasher", "created_at"]
 
 
 class SiteSerializer(serializers.ModelSerializer):
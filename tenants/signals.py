@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Tenant
+from .utils import invalidate_tenant
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+def invalidate_cached_tenant(sender, instance, **kwargs):
+    # Again on commit, in case a concurrent request re-cached the old row
+    # before this transaction became visible.
+    invalidate_tenant(instance)
+    transaction.on_commit(lambda: invalidate_tenant(instance))
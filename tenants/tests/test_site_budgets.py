@@ -0,0 +1,129 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tenants.models import Tenant, Site, SiteBudget, SiteMonthlySpend
+from tickets.models import Ticket
+
+User = get_user_model()
+
+
+class SiteBudgetReportTests(TestCase):
+    SITES = 500
+
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.admin = User.objects.create_user(username="admin", email="admin@acme.com", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.client.force_authenticate(user=self.admin)
+        self.url = f"/api/{self.tenant.slug}/sites/budgets/"
+
+        now = timezone.now()
+        self.year, self.month = now.year, now.month
+        sites = Site.objects.bulk_create(
+            Site(tenant=self.tenant, name=f"Site {i:03d}", slug=f"site-{i}") for i in range(self.SITES)
+        )
+        SiteBudget.objects.bulk_create(
+            SiteBudget(tenant=self.tenant, site=site, year=self.year, month=self.month, amount=Decimal("1000"))
+            for site in sites
+        )
+        self.site = sites[0]
+        resolved_at = datetime(self.year, self.month, 1, 12, tzinfo=dt_timezone.utc)
+        for amount in (Decimal("150.00"), Decimal("50.00")):
+            Ticket.objects.create(
+                title="Repair", description="d", tenant=self.tenant, created_by=self.admin,
+                site=self.site, invoice_amount=amount, resolved_at=resolved_at,
+            )
+
+    def _get(self, params, queries):
+        # One tenant lookup plus one or two report queries, however many sites.
+        with self.assertNumQueries(queries):
+            res = self.client.get(self.url, params)
+        self.assertEqual(res.status_code, 200)
+        data = res.json()
+        self.assertEqual(len(data), self.SITES)
+        return {row["slug"]: row for row in data}
+
+    def test_latest_budgets_single_query(self):
+        rows = self._get({}, queries=2)
+        row = rows[self.site.slug]
+        self.assertEqual(row["spent"], 200.0)
+        self.assertEqual(row["remaining"], 800.0)
+        self.assertEqual(row["utilization"], 20.0)
+        self.assertEqual(rows["site-1"]["spent"], 0.0)
+
+    def test_year_budgets_bounded_queries(self):
+        rows = self._get({"year": self.year}, queries=3)
+        self.assertEqual(rows[self.site.slug]["spent"], 200.0)
+        self.assertEqual(rows["site-1"]["remaining"], 1000.0)
+
+    def test_month_budgets_bounded_queries(self):
+        rows = self._get({"year": self.year, "month": self.month}, queries=3)
+        self.assertEqual(rows[self.site.slug]["utilization"], 20.0)
+
+
+class SiteMonthlySpendTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.site = Site.objects.create(tenant=self.tenant, name="HQ", slug="hq")
+        self.admin = User.objects.create_user(username="admin", email="admin@acme.com", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.client.force_authenticate(user=self.admin)
+
+    def _spend(self, year, month):
+        row = SiteMonthlySpend.objects.filter(site=self.site, year=year, month=month).first()
+        return (row.total_invoiced, row.ticket_count) if row else (Decimal("0"), 0)
+
+    def test_rollup_follows_ticket_saves(self):
+        march = datetime(2025, 3, 10, tzinfo=dt_timezone.utc)
+        april = datetime(2025, 4, 2, tzinfo=dt_timezone.utc)
+        ticket = Ticket.objects.create(title="Repair", description="d", tenant=self.tenant, created_by=self.admin, site=self.site)
+        self.assertEqual(SiteMonthlySpend.objects.count(), 0)
+
+        ticket.resolved_at = march
+        ticket.invoice_amount = Decimal("100.00")
+        ticket.save()
+        self.assertEqual(self._spend(2025, 3), (Decimal("100.00"), 1))
+
+        ticket.invoice_amount = Decimal("120.00")
+        ticket.save(update_fields=["invoice_amount"])
+        self.assertEqual(self._spend(2025, 3), (Decimal("120.00"), 1))
+
+        ticket = Ticket.objects.get(pk=ticket.pk)
+        ticket.resolved_at = april
+        ticket.save()
+        self.assertEqual(self._spend(2025, 3), (Decimal("0.00"), 0))
+        self.assertEqual(self._spend(2025, 4), (Decimal("120.00"), 1))
+
+        ticket.delete()
+        self.assertEqual(self._spend(2025, 4), (Decimal("0.00"), 0))
+
+    def test_site_budgets_year_reads_rollup(self):
+        for month in range(1, 13):
+            SiteBudget.objects.create(tenant=self.tenant, site=self.site, year=2025, month=month, amount=Decimal("500"))
+        Ticket.objects.create(
+            title="Repair", description="d", tenant=self.tenant, created_by=self.admin, site=self.site,
+            invoice_amount=Decimal("250.00"), resolved_at=datetime(2025, 6, 1, tzinfo=dt_timezone.utc),
+        )
+        url = f"/api/{self.tenant.slug}/sites/{self.site.id}/budgets/"
+        # tenant, site, budgets and spend: no per-month aggregates
+        with self.assertNumQueries(4):
+            res = self.client.get(url, {"year": 2025})
+        rows = {row["month"]: row for row in res.json()}
+        self.assertEqual(rows[6]["spent"], 250.0)
+        self.assertEqual(rows[6]["utilization"], 50.0)
+        self.assertEqual(rows[7]["spent"], 0.0)
+
+    def test_backfill_rebuilds_from_history(self):
+        Ticket.objects.create(
+            title="Repair", description="d", tenant=self.tenant, created_by=self.admin, site=self.site,
+            invoice_amount=Decimal("80.00"), resolved_at=datetime(2025, 1, 5, tzinfo=dt_timezone.utc),
+        )
+        SiteMonthlySpend.objects.all().delete()
+        call_command("backfill_site_monthly_spend", stdout=StringIO())
+        self.assertEqual(self._spend(2025, 1), (Decimal("80.00"), 1))
@@ -0,0 +1,87 @@
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tenants.cache import LRUCache
+from tenants.models import Tenant
+from tenants.utils import get_cached_tenant, tenant_cache
+
+User = get_user_model()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = LRUCache(ttl=10, clock=clock)
+        cache.set("a", 1)
+        clock.now = 9.9
+        self.assertEqual(cache.get("a"), 1)
+        clock.now = 10
+        self.assertEqual(cache.get("a"), None)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expirations"]), (1, 1, 1))
+
+    def test_get_or_set_does_not_cache_none(self):
+        cache = LRUCache()
+        self.assertIsNone(cache.get_or_set("a", lambda: None))
+        self.assertEqual(cache.get_or_set("a", lambda: 1), 1)
+        self.assertEqual(cache.get_or_set("a", lambda: 2), 1)
+
+
+class TenantResolutionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.admin = User.objects.create_user(username="admin", email="admin@acme.com", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.client.force_authenticate(user=self.admin)
+
+    def test_tenant_is_resolved_once_then_cached(self):
+        url = f"/api/{self.tenant.slug}/sites/budgets/"
+        with self.assertNumQueries(2):  # tenant, report
+            self.client.get(url)
+        with self.assertNumQueries(1):
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+
+    def test_save_and_delete_invalidate(self):
+        self.assertEqual(get_cached_tenant("acme").name, "Acme")
+        self.tenant.slug = "acme-co"
+        self.tenant.save()
+        self.assertIsNone(get_cached_tenant("acme"))
+        self.assertEqual(get_cached_tenant("acme-co").pk, self.tenant.pk)
+
+        self.tenant.delete()
+        self.assertIsNone(get_cached_tenant("acme-co"))
+
+    def test_callers_get_their_own_copy(self):
+        tenant = get_cached_tenant("acme")
+        tenant.name = "Changed by one request"
+        self.assertEqual(get_cached_tenant("acme").name, "Acme")
+        self.assertIsNot(get_cached_tenant("acme"), get_cached_tenant("acme"))
+
+    def test_unknown_tenant_is_404_or_mismatch(self):
+        self.assertEqual(self.client.get("/api/nope/sites/budgets/").status_code, 404)
+        self.assertEqual(self.client.get("/api/nope/tickets/stats/").status_code, 403)
+
+    def test_cache_stats_endpoint(self):
+        tenant_cache.get("acme")
+        res = self.client.get("/api/tenants/cache-stats/")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("hit_rate", res.json())
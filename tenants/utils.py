@@ -1,5 +1,49 @@
-from django.shortcuts import get_object_or_404
+import copy
+
+from django.conf import settings
+from django.http import Http404
+from rest_framework import exceptions
+from .cache import LRUCache
 from .models import Tenant
 
+# Tenants by slug, shared by every request this process serves
+tenant_cache = LRUCache(
+    maxsize=getattr(settings, "TENANT_CACHE_SIZE", 1024),
+    ttl=getattr(settings, "TENANT_CACHE_TTL", 60),
+)
+
+
+def get_cached_tenant(slug: str) -> Tenant | None:
+    tenant = tenant_cache.get_or_set(slug, lambda: Tenant.objects.filter(slug=slug).first())
+    # Each caller gets its own copy; the cached instance is never mutated.
+    return copy.deepcopy(tenant)
+
+
+def invalidate_tenant(tenant: Tenant) -> None:
+    """Forget `tenant` under its current slug and any slug it was cached under."""
+    tenant_cache.delete(tenant.slug)
+    tenant_cache.delete_matching(lambda cached: cached.pk == tenant.pk)
+
+
 def get_tenant_by_slug_or_404(slug: str) -> Tenant:
-    return get_object_or_404(Tenant, slug=slug)
+    tenant = get_cached_tenant(slug)
+    if tenant is None:
+        raise Http404("No Tenant matches the given query.")
+    return tenant
+
+
+def get_request_tenant(request) -> Tenant:
+    """The tenant named by the URL, as resolved by TenantMiddleware; 404 if unknown."""
+    tenant = getattr(request, "tenant", None)
+    if tenant is None:
+        return get_tenant_by_slug_or_404(getattr(request, "tenant_slug", None) or "")
+    return tenant
+
+
+def check_tenant_access(request) -> None:
+    """Raise PermissionDenied unless the user belongs to the tenant named by the URL."""
+    if not getattr(request, "tenant_slug", None):
+        return
+    tenant = getattr(request, "tenant", None)
+    if tenant is None or request.user.tenant_id != tenant.id:
+        raise exceptions.PermissionDenied("Tenant mismatch")
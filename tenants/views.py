@@ -2,9 +2,9 @@ from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Sum
-from .models import Tenant, Site, SiteBudget
+from .models import Tenant, Site, SiteBudget, SiteMonthlySpend
 from .serializers import TenantSerializer, SiteSerializer, SiteBudgetSerializer
-from tenants.utils import get_tenant_by_slug_or_404
+from tenants.utils import get_request_tenant, tenant_cache
 # from loguru import logger÷
 
 class IsAdmin(permissions.BasePermission):
@@ -16,20 +16,23 @@ class TenantViewSet(viewsets.ModelViewSet):
     serializer_class = TenantSerializer
     permission_classes = [permissions.IsAuthenticated & IsAdmin]
 
+    # Hit/miss counters of this process's tenant cache
+    @action(detail=False, methods=["get"], url_path="cache-stats")
+    def cache_stats(self, request):
+        return Response(tenant_cache.stats())
+
 
 class SiteViewSet(viewsets.ModelViewSet):
     serializer_class = SiteSerializer
     permission_classes = [permissions.IsAuthenticated & IsAdmin]
 
     def get_queryset(self):
-        tenant_slug = self.kwargs.get("tenant_slug")
-        tenant = get_tenant_by_slug_or_404(tenant_slug)
+        tenant = get_request_tenant(self.request)
         return Site.objects.filter(tenant=tenant).order_by("name")
 
     def perform_create(self, serializer):
         print(self.request.user.role)
-        tenant_slug = self.kwargs.get("tenant_slug")
-        tenant = get_tenant_by_slug_or_404(tenant_slug)
+        tenant = get_request_tenant(self.request)
         serializer.save(tenant=tenant)
 
     def list(self, request, *args, **kwargs):
@@ -46,12 +49,11 @@ class SiteViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"], url_path="budgets")
     def budgets(self, request, *args, **kwargs):
-        from django.db.models import Sum, Q
+        from django.db.models import DecimalField, OuterRef, Q, Subquery, Value
+        from django.db.models.functions import Coalesce
         from django.utils import timezone
-        from tickets.models import Ticket
         
-        tenant_slug = self.kwargs.get("tenant_slug")
-        tenant = get_tenant_by_slug_or_404(tenant_slug)
+        tenant = get_request_tenant(self.request)
         year = request.query_params.get("year")
         month = request.query_params.get("month")
         
@@ -62,71 +64,69 @@ class SiteViewSet(viewsets.ModelViewSet):
                 
             rows = (
                 SiteBudget.objects.filter(budget_query)
-                .values("site__name", "site__slug", "year", "month")
+                .values("site_id", "site__name", "site__slug", "year", "month")
                 .annotate(budget_sum=Sum("amount"))
                 .order_by("site__name")
             )
             
-            spending_query = Q(site__tenant=tenant, invoice_amount__isnull=False)
-            if year and month:
-                start_date = timezone.datetime(int(year), int(month), 1)
-                if int(month) == 12:
-                    end_date = timezone.datetime(int(year) + 1, 1, 1)
-                else:
-                    end_date = timezone.datetime(int(year), int(month) + 1, 1)
-                spending_query &= Q(resolved_at__gte=start_date, resolved_at__lt=end_date)
-            
-            spending = Ticket.objects.filter(spending_query).values('site__name').annotate(
-                total_spent=Sum('invoice_amount')
-            )
+            # Spend for the same period from the monthly rollup, matched to
+            # the budget rows through a dict.
+            spend_query = Q(tenant=tenant, year=year)
+            if month:
+                spend_query &= Q(month=month)
+            spending = SiteMonthlySpend.objects.filter(spend_query).values_list("site_id", "year", "month", "total_invoiced")
+            spent_by_period = {(site_id, y, m): total for site_id, y, m, total in spending}
             
             data = []
             for row in rows:
-                site_spending = next(
-                    (s for s in spending if s['site__name'] == row['site__name']),
-                    {'total_spent': 0}
-                )
+                spent = spent_by_period.get((row["site_id"], row["year"], row["month"]))
                 data.append({
                     'site': row['site__name'],
                     'slug': row['site__slug'],
                     'budget': str(row['budget_sum']) if row['budget_sum'] is not None else '0',
                     'year': row['year'],
                     'month': row.get('month'),
-                    'spent': float(site_spending['total_spent']) if site_spending['total_spent'] else 0,
-                    'remaining': float(row['budget_sum'] - site_spending['total_spent']) if row['budget_sum'] and site_spending['total_spent'] else float(row['budget_sum'] or 0),
-                    'utilization': (float(site_spending['total_spent']) / float(row['budget_sum']) * 100) if row['budget_sum'] and site_spending['total_spent'] else 0
+                    'spent': float(spent) if spent else 0,
+                    'remaining': float(row['budget_sum'] - spent) if row['budget_sum'] and spent else float(row['budget_sum'] or 0),
+                    'utilization': (float(spent) / float(row['budget_sum']) * 100) if row['budget_sum'] and spent else 0
                 })
             
             return Response(data)
         
-        sites = Site.objects.filter(tenant=tenant).order_by('name')
+        # Latest budget and current month's spending per site, as correlated
+        # subqueries of a single query.
+        today = timezone.localtime()
+        latest_budget = SiteBudget.objects.filter(site=OuterRef("pk")).order_by("-year", "-month")
+        monthly_spending = SiteMonthlySpend.objects.filter(
+            site=OuterRef("pk"), year=today.year, month=today.month
+        ).values("total_invoiced")[:1]
+        sites = (
+            Site.objects.filter(tenant=tenant)
+            .order_by("name")
+            .annotate(
+                budget_amount=Subquery(latest_budget.values("amount")[:1]),
+                budget_year=Subquery(latest_budget.values("year")[:1]),
+                budget_month=Subquery(latest_budget.values("month")[:1]),
+                monthly_spending=Coalesce(
+                    Subquery(monthly_spending), Value(0), output_field=DecimalField(max_digits=14, decimal_places=2)
+                ),
+            )
+            .values("name", "slug", "budget_amount", "budget_year", "budget_month", "monthly_spending")
+        )
         result = []
         
         for site in sites:
-            latest_budget = SiteBudget.objects.filter(site=site).order_by('-year', '-month').first()
-            
-            # Calculate current month's spending
-            today = timezone.now()
-            start_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            next_month = today.replace(day=28) + timezone.timedelta(days=4)  # Get to next month
-            start_of_next_month = next_month.replace(day=1)
-            
-            monthly_spending = Ticket.objects.filter(
-                site=site,
-                resolved_at__gte=start_of_month,
-                resolved_at__lt=start_of_next_month,
-                invoice_amount__isnull=False
-            ).aggregate(total=Sum('invoice_amount'))['total'] or 0
-            
+            amount = site["budget_amount"]
+            spent = site["monthly_spending"]
             result.append({
-                'site': site.name,
-                'slug': site.slug,
-                'budget': str(latest_budget.amount) if latest_budget else '0',
-                'year': latest_budget.year if latest_budget else today.year,
-                'month': latest_budget.month if latest_budget else today.month,
-                'spent': float(monthly_spending),
-                'remaining': float(latest_budget.amount - monthly_spending) if latest_budget else 0,
-                'utilization': (float(monthly_spending) / float(latest_budget.amount) * 100) if latest_budget and latest_budget.amount > 0 else 0
+                'site': site["name"],
+                'slug': site["slug"],
+                'budget': str(amount) if amount is not None else '0',
+                'year': site["budget_year"] if amount is not None else today.year,
+                'month': site["budget_month"] if amount is not None else today.month,
+                'spent': float(spent),
+                'remaining': float(amount - spent) if amount is not None else 0,
+                'utilization': (float(spent) / float(amount) * 100) if amount is not None and amount > 0 else 0
             })
             
         return Response(result)
@@ -137,11 +137,8 @@ class SiteViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["get", "post"], url_path="budgets")
     def site_budgets(self, request, pk=None, *args, **kwargs):
         from django.utils import timezone
-        from django.db.models import Sum
-        from tickets.models import Ticket
         
-        tenant_slug = self.kwargs.get("tenant_slug")
-        tenant = get_tenant_by_slug_or_404(tenant_slug)
+        tenant = get_request_tenant(self.request)
         site = self.get_queryset().filter(pk=pk).first()
         if not site:
             return Response({"detail": "Site not found"}, status=404)
@@ -156,24 +153,16 @@ class SiteViewSet(viewsets.ModelViewSet):
                 if month:
                     qs = qs.filter(month=month)
                 
-                # Get spending data for each month
+                # Spending for every budget period from the monthly rollup
                 budgets = qs.order_by("year", "month")
+                spend_qs = SiteMonthlySpend.objects.filter(site=site, year=year)
+                if month:
+                    spend_qs = spend_qs.filter(month=month)
+                spent_by_month = dict(spend_qs.values_list("month", "total_invoiced"))
                 result = []
                 
                 for budget in budgets:
-                    # Calculate spending for this budget period
-                    start_date = timezone.datetime(budget.year, budget.month, 1)
-                    if budget.month == 12:
-                        end_date = timezone.datetime(budget.year + 1, 1, 1)
-                    else:
-                        end_date = timezone.datetime(budget.year, budget.month + 1, 1)
-                    
-                    spending = Ticket.objects.filter(
-                        site=site,
-                        resolved_at__gte=start_date,
-                        resolved_at__lt=end_date,
-                        invoice_amount__isnull=False
-                    ).aggregate(total=Sum('invoice_amount'))['total'] or 0
+                    spending = spent_by_month.get(budget.month) or 0
                     
                     result.append({
                         **SiteBudgetSerializer(budget).data,
@@ -187,18 +176,11 @@ class SiteViewSet(viewsets.ModelViewSet):
             # If no year is specified, return the latest budget with current month's spending
             latest_budget = SiteBudget.objects.filter(site=site).order_by('-year', '-month').first()
             
-            # Calculate current month's spending
-            today = timezone.now()
-            start_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            next_month = today.replace(day=28) + timezone.timedelta(days=4)  # Get to next month
-            start_of_next_month = next_month.replace(day=1)
-            
-            monthly_spending = Ticket.objects.filter(
-                site=site,
-                resolved_at__gte=start_of_month,
-                resolved_at__lt=start_of_next_month,
-                invoice_amount__isnull=False
-            ).aggregate(total=Sum('invoice_amount'))['total'] or 0
+            # Current month's spending from the monthly rollup
+            today = timezone.localtime()
+            monthly_spending = SiteMonthlySpend.objects.filter(
+                site=site, year=today.year, month=today.month
+            ).values_list("total_invoiced", flat=True).first() or 0
             
             if latest_budget:
                 data = {
@@ -0,0 +1,74 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def _relation_lookups(model, path):
+    """Split a dotted source path into select_related / prefetch_related lookups."""
+    select, prefetch = None, None
+    joined = []
+    for attr in path:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation:
+            break
+        joined.append(attr)
+        if field.many_to_many or field.one_to_many:
+            prefetch = "__".join(joined)
+            break
+        select = "__".join(joined)
+        model = field.related_model
+    return select, prefetch, model
+
+
+def get_eager_loading(serializer_class, model, prefix=""):
+    """
+    Return the (select_related, prefetch_related) lookups needed to serialize
+    `model` instances with `serializer_class` without per-row queries.
+
+    Relations are discovered from the serializer's declared fields: dotted
+    sources and nested serializers are joined with select_related, to-many
+    relations are prefetched, and SerializerMethodFields named after a model
+    relation are assumed to read that relation.
+    """
+    select, prefetch = [], []
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            # Rendered from the `<name>_id` column, no join needed
+            continue
+        if isinstance(field, serializers.ManyRelatedField) and isinstance(
+            field.child_relation, serializers.PrimaryKeyRelatedField
+        ):
+            prefetch.append(prefix + name)
+            continue
+
+        path = field.source_attrs or [name]
+        related_select, related_prefetch, related_model = _relation_lookups(model, path)
+        if related_prefetch:
+            prefetch.append(prefix + related_prefetch)
+            continue
+        if not related_select:
+            continue
+        select.append(prefix + related_select)
+
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(nested, serializers.BaseSerializer):
+            nested_select, nested_prefetch = get_eager_loading(
+                type(nested), related_model, prefix=f"{prefix}{related_select}__"
+            )
+            select.extend(nested_select)
+            prefetch.extend(nested_prefetch)
+    return select, prefetch
+
+
+def eager_load(queryset, serializer_class):
+    """Apply the serializer's select_related/prefetch_related lookups to a queryset."""
+    select, prefetch = get_eager_loading(serializer_class, queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
@@ -0,0 +1,84 @@
+"""
+Ticket change history (TicketEvent).
+
+Every ticket write path builds its events from (before, after) snapshots of
+HISTORY_FIELDS and hands them to `record`, which inserts them with one
+bulk_create inside the caller's transaction, so an event exists exactly
+when its change was committed.
+"""
+from django.db.models.fields.files import FieldFile
+
+from .models import TicketEvent
+
+# Columns (attnames) whose changes are kept
+HISTORY_FIELDS = (
+    "title",
+    "status",
+    "priority",
+    "site_id",
+    "assignee_id",
+    "invoice_number",
+    "invoice_amount",
+    "invoice_date",
+    "total_cost",
+    "contractor_rating",
+    "job_card",
+    "invoice",
+)
+
+
+FILE_FIELDS = frozenset({"job_card", "invoice"})
+
+
+def _value(name, value):
+    if isinstance(value, FieldFile):
+        value = value.name
+    # An empty file column is stored as "".
+    return (value or None) if name in FILE_FIELDS else value
+
+
+def snapshot(ticket):
+    """Current values of the tracked columns."""
+    return {name: _value(name, getattr(ticket, name)) for name in HISTORY_FIELDS}
+
+
+def loaded_snapshot(ticket):
+    """Tracked values as last read from or written to the database."""
+    loaded = getattr(ticket, "_loaded_values", {})
+    return {name: _value(name, loaded.get(name, getattr(ticket, name))) for name in HISTORY_FIELDS}
+
+
+def row_snapshot(row):
+    """Tracked values from a `values()` row."""
+    return {name: _value(name, row[name]) for name in HISTORY_FIELDS}
+
+
+def diff(before, after):
+    """{field: [old, new]} for the fields that changed; new tickets list only set fields."""
+    if before is None:
+        return {name: [None, value] for name, value in after.items() if value not in (None, "")}
+    return {name: [before[name], after[name]] for name in after if name in before and before[name] != after[name]}
+
+
+def event(ticket, kind, before, after, actor=None, at=None):
+    """An unsaved TicketEvent for the change, or None when nothing tracked changed."""
+    changes = diff(before, after)
+    if not changes:
+        return None
+    extra = {"created_at": at} if at is not None else {}
+    return TicketEvent(
+        tenant_id=ticket.tenant_id,
+        ticket_id=ticket.pk,
+        actor_id=getattr(actor, "pk", actor),
+        kind=kind,
+        changes=changes,
+        **extra,
+    )
+
+
+def record(events):
+    """Insert the non-empty events with a single INSERT."""
+    events = [e for e in events if e is not None]
+    if events:
+        TicketEvent.objects.bulk_create(events)
+    return events
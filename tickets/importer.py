@@ -0,0 +1,210 @@
+"""
+Streaming bulk import of tickets from CSV or JSON Lines uploads.
+
+Rows are read one at a time from the uploaded file, validated with a single
+reused TicketImportSerializer and inserted with bulk_create in batches,
+each batch in its own transaction together with its rollup deltas and
+history events. Site and assignee references (id, slug/username or
+name/email) are resolved through one lookup map per import, filled with one
+query per batch for the references that batch introduces. Invalid rows are
+skipped and reported by row number.
+
+Imported tickets do not send notifications; they are historical data.
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import serializers
+
+from tenants.models import Site
+from . import history
+from .models import Ticket, TicketEvent
+from .rollups import apply_ticket_changes
+from .serializers import TicketImportSerializer
+
+User = get_user_model()
+
+FORMATS = ("csv", "jsonl")
+# Columns read from each row; anything else is ignored.
+COLUMNS = ("title", "description", "status", "priority", "site", "assignee")
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(upload, requested=None):
+    fmt = (requested or "").lower()
+    if not fmt:
+        name = (getattr(upload, "name", "") or "").lower()
+        content_type = (getattr(upload, "content_type", "") or "").lower()
+        if name.endswith((".jsonl", ".ndjson")) or "ndjson" in content_type or "jsonl" in content_type:
+            fmt = "jsonl"
+        elif name.endswith(".csv") or "csv" in content_type:
+            fmt = "csv"
+    if fmt not in FORMATS:
+        raise ImportFormatError(f"Unsupported format {fmt or 'unknown'!r}; expected one of {', '.join(FORMATS)}")
+    return fmt
+
+
+def _text_stream(upload):
+    # Decodes the upload lazily; the BOM Excel adds to CSV exports is dropped.
+    upload.seek(0)
+    return io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+
+
+def iter_rows(upload, fmt):
+    """Yield (row number, dict or parse error message) without reading the whole file."""
+    stream = _text_stream(upload)
+    try:
+        if fmt == "csv":
+            for number, row in enumerate(csv.DictReader(stream), start=1):
+                yield number, row
+        else:
+            for number, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as exc:
+                    yield number, f"Invalid JSON: {exc}"
+                    continue
+                yield number, row if isinstance(row, dict) else "Expected a JSON object"
+    finally:
+        # Leave the upload itself open for Django to clean up.
+        stream.detach()
+
+
+class ReferenceMap:
+    """Lazily resolved site and assignee references for one tenant."""
+
+    def __init__(self, tenant):
+        self.tenant = tenant
+        self.sites = {}
+        self.assignees = {}
+
+    def _missing(self, refs, known):
+        return {ref for ref in refs if ref and ref not in known}
+
+    def load(self, site_refs, assignee_refs):
+        site_refs = self._missing(site_refs, self.sites)
+        if site_refs:
+            ids = {int(ref) for ref in site_refs if ref.isascii() and ref.isdigit()}
+            for site in Site.objects.filter(tenant=self.tenant).filter(
+                Q(id__in=ids) | Q(slug__in=site_refs) | Q(name__in=site_refs)
+            ).only("id", "slug", "name"):
+                for key in (str(site.id), site.slug, site.name):
+                    self.sites.setdefault(key, site.id)
+            for ref in site_refs:
+                self.sites.setdefault(ref, None)
+
+        assignee_refs = self._missing(assignee_refs, self.assignees)
+        if assignee_refs:
+            ids = {int(ref) for ref in assignee_refs if ref.isascii() and ref.isdigit()}
+            contractors = User.objects.filter(
+                tenant=self.tenant, role=User.Role.CONTRACTOR, is_active_contractor=True
+            ).filter(Q(id__in=ids) | Q(username__in=assignee_refs) | Q(email__in=assignee_refs))
+            for user in contractors.only("id", "username", "email"):
+                for key in (str(user.id), user.username, user.email):
+                    if key:
+                        self.assignees.setdefault(key, user.id)
+            for ref in assignee_refs:
+                self.assignees.setdefault(ref, None)
+
+
+def _ref(row, column):
+    value = row.get(column)
+    return "" if value is None else str(value).strip()
+
+
+class TicketImporter:
+    def __init__(self, tenant, created_by, batch_size=None, dry_run=False, max_errors=None, context=None):
+        self.tenant = tenant
+        self.created_by = created_by
+        self.batch_size = batch_size or getattr(settings, "TICKET_IMPORT_BATCH_SIZE", 500)
+        self.dry_run = dry_run
+        self.max_errors = max_errors or getattr(settings, "TICKET_IMPORT_MAX_ERRORS", 1000)
+        self.references = ReferenceMap(tenant)
+        # Built once: instantiating a ModelSerializer per row dominates the
+        # validation cost. Relations are resolved through `references`.
+        self.serializer = TicketImportSerializer(context=context or {})
+        self.rows = self.valid = self.error_count = 0
+        self.errors = []
+
+    def _error(self, number, detail):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": number, "errors": detail})
+
+    def _build(self, number, row):
+        site_ref, assignee_ref = _ref(row, "site"), _ref(row, "assignee")
+        errors = {}
+        try:
+            data = self.serializer.run_validation(
+                {column: row[column] for column in COLUMNS[:4] if row.get(column) not in (None, "")}
+            )
+        except serializers.ValidationError as exc:
+            errors.update(exc.detail)
+            data = None
+        site_id = self.references.sites.get(site_ref) if site_ref else None
+        if site_ref and site_id is None:
+            errors["site"] = [f"Unknown site {site_ref!r}"]
+        assignee_id = self.references.assignees.get(assignee_ref) if assignee_ref else None
+        if assignee_ref and assignee_id is None:
+            errors["assignee"] = [f"Unknown contractor {assignee_ref!r}"]
+        if errors:
+            self._error(number, errors)
+            return None
+        return Ticket(
+            **data, tenant=self.tenant, created_by=self.created_by, site_id=site_id, assignee_id=assignee_id
+        )
+
+    def _import_batch(self, batch):
+        parsed = [(number, row) for number, row in batch if isinstance(row, dict)]
+        self.references.load(
+            {_ref(row, "site") for _, row in parsed}, {_ref(row, "assignee") for _, row in parsed}
+        )
+        tickets = []
+        for number, row in batch:
+            if not isinstance(row, dict):
+                self._error(number, {"non_field_errors": [row]})
+                continue
+            ticket = self._build(number, row)
+            if ticket is not None:
+                tickets.append(ticket)
+        if tickets and not self.dry_run:
+            with transaction.atomic():
+                Ticket.objects.bulk_create(tickets)
+                apply_ticket_changes([(None, ticket.tracked_values()) for ticket in tickets])
+                history.record(
+                    history.event(ticket, TicketEvent.Kind.CREATED, None, history.snapshot(ticket), self.created_by)
+                    for ticket in tickets
+                )
+        self.valid += len(tickets)
+
+    def run(self, rows):
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            self.rows += len(batch)
+            self._import_batch(batch)
+        return self.report()
+
+    def report(self):
+        return {
+            "rows": self.rows,
+            "created": 0 if self.dry_run else self.valid,
+            "valid": self.valid,
+            "failed": self.error_count,
+            "dry_run": self.dry_run,
+            "errors": self.errors,
+            "errors_truncated": self.error_count > len(self.errors),
+        }
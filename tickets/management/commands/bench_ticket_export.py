@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from tenants.models import Tenant
+from tickets.models import Ticket
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Benchmark paging through the ticket list against the streaming export (seeded data is rolled back)"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--tickets", type=int, default=20_000, help="How many tickets to seed")
+        parser.add_argument("--page-size", type=int, default=100, help="Page size for the paginated list")
+
+    def handle(self, *args, **opts):
+        ticket_count: int = opts["tickets"]
+        client = APIClient()
+
+        with transaction.atomic():
+            tenant = Tenant.objects.create(name="Export bench", slug="bench-export", domain="localhost")
+            admin = User.objects.create(username="bench-export", tenant=tenant, role="ADMIN")
+            for start in range(0, ticket_count, 5_000):
+                Ticket.objects.bulk_create(
+                    Ticket(
+                        title=f"Ticket {i}", description="Benchmark ticket", tenant=tenant, created_by=admin,
+                        invoice_number=f"INV-{i}", invoice_amount=i, total_cost=i,
+                    )
+                    for i in range(start, min(start + 5_000, ticket_count))
+                )
+            client.force_authenticate(user=admin)
+
+            def paginated():
+                url, rows = f"/api/{tenant.slug}/tickets/?pagination=cursor&page_size={opts['page_size']}", 0
+                while url:
+                    body = client.get(url).json()
+                    rows += len(body["results"])
+                    url = body["next"]
+                return rows
+
+            def streamed():
+                res = client.get(f"/api/{tenant.slug}/tickets/export/")
+                return sum(chunk.count(b"\n") for chunk in res.streaming_content) - 1
+
+            results = [("paginated list (keyset)", *self._measure(paginated)), ("streaming export", *self._measure(streamed))]
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Tickets: {ticket_count}")
+        for name, rows, seconds, peak in results:
+            self.stdout.write(f"{name:<24} {seconds:7.2f} s  {rows / seconds:8.0f} rows/s  peak {peak / 2**20:6.1f} MiB")
+        self.stdout.write(self.style.SUCCESS(f"Speed-up: {results[0][2] / results[1][2]:.1f}x"))
+
+    def _measure(self, fn):
+        tracemalloc.start()
+        started = time.perf_counter()
+        rows = fn()
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return rows, seconds, peak
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from tenants.models import Site, Tenant
+from tickets.importer import TicketImporter, iter_rows
+from tickets.models import Ticket
+from tickets.serializers import TicketSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Benchmark bulk ticket import against one serializer save per row (seeded data is rolled back)"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--rows", type=int, default=20_000, help="Rows in the generated CSV")
+        parser.add_argument("--batch-size", type=int, default=500, help="Importer batch size")
+        parser.add_argument("--baseline-rows", type=int, default=2_000, help="Rows saved one by one for the baseline")
+
+    def handle(self, *args, **opts):
+        rows: int = opts["rows"]
+        baseline_rows: int = min(opts["baseline_rows"], rows)
+
+        with transaction.atomic():
+            tenant = Tenant.objects.create(name="bench-import", slug="bench-import", domain="localhost")
+            sites = [Site(tenant=tenant, name=f"Site {i}", slug=f"site-{i}") for i in range(20)]
+            Site.objects.bulk_create(sites)
+            admin = User.objects.create(username="bench-import-admin", role="ADMIN", tenant=tenant)
+            contractors = User.objects.bulk_create(
+                User(username=f"bench-import-c{i}", role="CONTRACTOR", tenant=tenant) for i in range(20)
+            )
+
+            upload = TemporaryUploadedFile("tickets.csv", "text/csv", 0, "utf-8")
+            upload.write(b"title,description,priority,site,assignee\n")
+            for i in range(rows):
+                upload.write(f"Ticket {i},Imported row {i},HIGH,site-{i % 20},bench-import-c{i % 20}\n".encode())
+            upload.size = upload.tell()
+
+            start = time.perf_counter()
+            for i in range(baseline_rows):
+                serializer = TicketSerializer(data={
+                    "title": f"Ticket {i}", "description": f"Imported row {i}", "priority": "HIGH",
+                    "site": sites[i % 20].id,
+                })
+                serializer.is_valid(raise_exception=True)
+                serializer.save(tenant=tenant, created_by=admin, assignee=contractors[i % 20])
+            per_row = (time.perf_counter() - start) / baseline_rows
+            Ticket.objects.filter(tenant=tenant).delete()
+
+            importer = TicketImporter(tenant, admin, batch_size=opts["batch_size"])
+            start = time.perf_counter()
+            report = importer.run(iter_rows(upload, "csv"))
+            bulk = time.perf_counter() - start
+            assert report["created"] == rows and not report["failed"], report
+
+            upload.close()
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Rows: {rows}, batch size {opts['batch_size']}")
+        self.stdout.write(f"one save per row: {per_row * 1e6:8.0f} us/row ({1 / per_row:8.0f} rows/s, {baseline_rows} rows)")
+        self.stdout.write(f"bulk import:      {bulk / rows * 1e6:8.0f} us/row ({rows / bulk:8.0f} rows/s)")
+        self.stdout.write(self.style.SUCCESS(f"Speed-up: {per_row * rows / bulk:.1f}x"))
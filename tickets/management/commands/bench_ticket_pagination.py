@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+from statistics import median
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tenants.models import Tenant
+from tickets.models import Ticket
+from tickets.pagination import KeysetPagination, StandardResultsSetPagination
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Benchmark deep-page latency of offset vs keyset ticket pagination (seeded data is rolled back)"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--tickets", type=int, default=20_000, help="How many tickets to seed")
+        parser.add_argument("--page", type=int, default=1000, help="Page number to fetch")
+        parser.add_argument("--page-size", type=int, default=10, help="Tickets per page")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per paginator")
+
+    def handle(self, *args, **opts):
+        ticket_count: int = opts["tickets"]
+        page: int = opts["page"]
+        page_size: int = opts["page_size"]
+        repeat: int = opts["repeat"]
+
+        if ticket_count < page * page_size:
+            self.stderr.write(self.style.ERROR(f"Need at least {page * page_size} tickets to reach page {page}"))
+            return
+
+        with transaction.atomic():
+            tenant = self._seed(ticket_count)
+            queryset = Ticket.objects.filter(tenant=tenant)
+
+            offset_ms = self._time(repeat, lambda: StandardResultsSetPagination().paginate_queryset(
+                queryset.order_by("-created_at"), self._request(page=page, page_size=page_size)
+            ))
+
+            keyset = KeysetPagination()
+            boundary = queryset.order_by(*keyset.ordering)[(page - 1) * page_size - 1]
+            cursor = keyset.encode_cursor(keyset.get_position(boundary))
+            keyset_ms = self._time(repeat, lambda: KeysetPagination().paginate_queryset(
+                queryset, self._request(cursor=cursor, page_size=page_size)
+            ))
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Tickets: {ticket_count}, page {page} x {page_size}")
+        self.stdout.write(f"offset (page + COUNT): {offset_ms:.2f} ms")
+        self.stdout.write(f"keyset (cursor):       {keyset_ms:.2f} ms")
+        self.stdout.write(self.style.SUCCESS(f"Speed-up: {offset_ms / keyset_ms:.1f}x"))
+
+    def _seed(self, ticket_count: int) -> Tenant:
+        tenant = Tenant.objects.create(name="Pagination bench", slug="bench-pagination")
+        author = User.objects.create(username="bench-pagination", tenant=tenant, role="ADMIN")
+        batch = 5_000
+        for start in range(0, ticket_count, batch):
+            Ticket.objects.bulk_create(
+                Ticket(title=f"Ticket {i}", description="Benchmark ticket", tenant=tenant, created_by=author)
+                for i in range(start, min(start + batch, ticket_count))
+            )
+        return tenant
+
+    def _request(self, **params) -> Request:
+        return Request(APIRequestFactory().get("/", params))
+
+    def _time(self, repeat: int, fn) -> float:
+        fn()  # warm-up
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        return median(timings)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+import time
+from statistics import median
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Q
+
+from tenants.models import Tenant
+from tickets.models import Ticket
+from tickets.search import search_backend, search_tickets
+
+User = get_user_model()
+
+WORDS = (
+    "leak pipe water geyser kitchen toilet roof gutter light bulb socket wiring breaker generator "
+    "aircon filter compressor door hinge lock window latch glass paint wall crack floor tile pump "
+    "valve tank borehole fence gate motor alarm camera network router printer desk chair"
+).split()
+QUERIES = ["generator", "gener", "kitchen leak", "broken window latch", "borehole pump"]
+FILLER_SIZE = 20_000
+
+
+class Command(BaseCommand):
+    help = "Benchmark full-text ticket search against the icontains scan (seeded data is rolled back)"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--tickets", type=int, default=300_000, help="How many tickets to seed")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query")
+
+    def handle(self, *args, **opts):
+        ticket_count: int = opts["tickets"]
+        repeat: int = opts["repeat"]
+        self.stdout.write(f"Search backend: {search_backend() or 'icontains fallback'}")
+
+        with transaction.atomic():
+            tenant = self._seed(ticket_count)
+            queryset = Ticket.objects.filter(tenant=tenant)
+            for query in QUERIES:
+                scan_ms, scan_hits = self._time(repeat, lambda: list(
+                    queryset.filter(Q(title__icontains=query) | Q(description__icontains=query))
+                    .order_by("-created_at").values_list("id", flat=True)[:10]
+                ))
+                index_ms, index_hits = self._time(repeat, lambda: list(
+                    search_tickets(queryset, query).order_by("search_rank", "-created_at").values_list("id", flat=True)[:10]
+                ))
+                self.stdout.write(
+                    f"{query!r:24} icontains {scan_ms:8.2f} ms ({scan_hits} hits)   "
+                    f"index {index_ms:8.2f} ms ({index_hits} hits)"
+                )
+            transaction.set_rollback(True)
+
+    def _seed(self, ticket_count: int) -> Tenant:
+        rng = random.Random(42)
+        filler = [f"w{n:05d}" for n in range(FILLER_SIZE)]
+        tenant = Tenant.objects.create(name="Search bench", slug="bench-search")
+        author = User.objects.create(username="bench-search", tenant=tenant, role="ADMIN")
+        batch = 10_000
+        for start in range(0, ticket_count, batch):
+            Ticket.objects.bulk_create(
+                Ticket(
+                    title=" ".join(rng.sample(WORDS, 3)).capitalize(),
+                    description=" ".join(rng.choices(WORDS, k=2) + rng.choices(filler, k=20)),
+                    tenant=tenant,
+                    created_by=author,
+                )
+                for _ in range(start, min(start + batch, ticket_count))
+            )
+        self.stdout.write(f"Seeded {ticket_count} tickets")
+        return tenant
+
+    def _time(self, repeat: int, fn) -> tuple[float, int]:
+        hits = len(fn())  # warm-up
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        return median(timings), hits
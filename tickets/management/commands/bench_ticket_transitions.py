@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from notifications.models import OutboxMessage
+from tenants.models import Site, Tenant
+from tickets.models import Ticket
+from tickets.transitions import bulk_transition
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Benchmark closing tickets one by one against one bulk transition (seeded data is rolled back)"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--tickets", type=int, default=200, help="Tickets closed per run")
+        parser.add_argument("--contractors", type=int, default=5, help="Contractors the tickets are spread over")
+
+    def handle(self, *args, **opts):
+        results = []
+        with transaction.atomic():
+            tenant = Tenant.objects.create(name="Transition bench", slug="bench-transitions", domain="localhost")
+            site = Site.objects.create(tenant=tenant, name="HQ", slug="hq")
+            admin = User.objects.create(username="bench-transitions", tenant=tenant, role="ADMIN", phone_number="whatsapp:+1")
+            contractors = User.objects.bulk_create(
+                User(username=f"bench-transitions-c{i}", tenant=tenant, role="CONTRACTOR", phone_number=f"whatsapp:+2{i}")
+                for i in range(opts["contractors"])
+            )
+
+            for name, run in (("close_ticket() per ticket", self._one_by_one), ("bulk transition", self._bulk)):
+                tickets = [
+                    Ticket.objects.create(
+                        title=f"Ticket {i}", description="d", tenant=tenant, site=site, created_by=admin,
+                        assignee=contractors[i % len(contractors)], status=Ticket.Status.RESOLVED,
+                    )
+                    for i in range(opts["tickets"])
+                ]
+                outbox_before = OutboxMessage.objects.count()
+                with CaptureQueriesContext(connection) as ctx:
+                    started = time.perf_counter()
+                    run(tenant, tickets)
+                    seconds = time.perf_counter() - started
+                results.append((name, seconds, len(ctx.captured_queries), OutboxMessage.objects.count() - outbox_before))
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Tickets closed per run: {opts['tickets']}")
+        self.stdout.write(f"{'':<26} {'ms':>8} {'queries':>8} {'messages':>9}")
+        for name, seconds, queries, messages in results:
+            self.stdout.write(f"{name:<26} {seconds * 1000:8.1f} {queries:8d} {messages:9d}")
+        self.stdout.write(self.style.SUCCESS(f"Speed-up: {results[0][1] / results[1][1]:.1f}x"))
+
+    def _one_by_one(self, tenant, tickets):
+        for ticket in Ticket.objects.filter(id__in=[t.id for t in tickets]):
+            ticket.close_ticket()
+
+    def _bulk(self, tenant, tickets):
+        bulk_transition(Ticket.objects.filter(tenant=tenant), "close", [t.id for t in tickets])
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+
+from tenants.models import Tenant
+from tickets.models import Ticket
+from tickets.pagination import KeysetPagination
+
+INDEX_NAMES = [index.name for index in Ticket._meta.indexes]
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the canonical ticket queries and report which index serves each one"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--tenant", type=str, help="Tenant slug to plan against (defaults to the first tenant)")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the full plan for every query")
+        parser.add_argument(
+            "--no-seqscan",
+            action="store_true",
+            help="PostgreSQL only: discourage sequential scans so small tables still show the usable index",
+        )
+        parser.add_argument("--strict", action="store_true", help="Exit non-zero if any query is not index-backed")
+
+    def handle(self, *args, **opts):
+        tenant = self._tenant(opts.get("tenant"))
+        queries = self._canonical_queries(tenant)
+
+        if opts["no_seqscan"] and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+
+        missing = []
+        for label, queryset in queries:
+            plan = queryset.explain()
+            used = [name for name in INDEX_NAMES if name in plan]
+            if used:
+                self.stdout.write(self.style.SUCCESS(f"[index] {label}: {', '.join(used)}"))
+            elif self._uses_any_index(plan):
+                self.stdout.write(self.style.WARNING(f"[other] {label}: served by a non-composite index"))
+            else:
+                self.stdout.write(self.style.ERROR(f"[scan]  {label}"))
+                missing.append(label)
+            if opts["verbose_plans"]:
+                self.stdout.write(f"{plan}\n")
+
+        if missing and opts["strict"]:
+            raise CommandError(f"{len(missing)} queries are not index-backed: {', '.join(missing)}")
+
+    def _tenant(self, slug: str | None) -> Tenant | None:
+        if slug:
+            try:
+                return Tenant.objects.get(slug=slug)
+            except Tenant.DoesNotExist:
+                raise CommandError(f"Tenant '{slug}' not found")
+        return Tenant.objects.order_by("id").first()
+
+    def _canonical_queries(self, tenant: Tenant | None):
+        # Plan against real ids when the database has data, any id otherwise.
+        tenant_id = tenant.id if tenant else 1
+        scoped = Ticket.objects.filter(tenant_id=tenant_id)
+        sample = scoped.exclude(assignee=None).exclude(site=None).first()
+        assignee_id = sample.assignee_id if sample else 1
+        site_id = sample.site_id if sample else 1
+        now = timezone.now()
+
+        return [
+            ("admin list", scoped.order_by("-created_at")[:10]),
+            ("admin keyset page", scoped.filter(
+                KeysetPagination().after((now, 1))
+            ).order_by(*KeysetPagination.ordering)[:11]),
+            ("contractor list", scoped.filter(assignee_id=assignee_id).order_by("-created_at")[:10]),
+            ("site manager list", scoped.filter(site_id=site_id).order_by("-created_at")[:10]),
+            ("status filter", scoped.filter(status=Ticket.Status.OPEN).order_by("-created_at")[:10]),
+            ("priority filter", scoped.filter(priority=Ticket.Priority.HIGH).order_by("-created_at")[:10]),
+            ("status stats", scoped.values("status").annotate(c=Count("id")).order_by()),
+        ]
+
+    def _uses_any_index(self, plan: str) -> bool:
+        markers = ("USING INDEX", "USING COVERING INDEX", "Index Scan", "Index Only Scan", "Bitmap Index Scan")
+        return any(marker in plan for marker in markers)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from tickets.models import UploadSession
+from tickets.uploads import discard
+
+
+class Command(BaseCommand):
+    help = "Delete expired chunked upload sessions and their part files"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=500, help="Sessions deleted per statement")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the sessions that would be deleted")
+
+    def handle(self, *args, **opts):
+        batch_size: int = opts["batch_size"]
+        expired = UploadSession.objects.filter(expires_at__lt=timezone.now())
+
+        if opts["dry_run"]:
+            self.stdout.write(f"{expired.count()} upload sessions would be deleted")
+            return
+
+        total = 0
+        while True:
+            sessions = list(expired.order_by("pk").only("pk")[:batch_size])
+            if not sessions:
+                break
+            for session in sessions:
+                discard(session)
+            deleted, _ = UploadSession.objects.filter(pk__in=[s.pk for s in sessions]).delete()
+            total += deleted
+            if len(sessions) < batch_size:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f"Purged {total} upload sessions"))
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from tenants.models import Tenant
+from tickets.rollups import rebuild_ticket_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized ticket status/priority counters from the tickets table"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--tenant", type=str, action="append", help="Tenant slug to rebuild (repeatable, default: all)")
+
+    def handle(self, *args, **opts):
+        slugs: list[str] | None = opts.get("tenant")
+        tenant_ids = None
+        if slugs:
+            tenant_ids = list(Tenant.objects.filter(slug__in=slugs).values_list("id", flat=True))
+            if len(tenant_ids) != len(set(slugs)):
+                raise CommandError("Unknown tenant slug")
+
+        buckets = rebuild_ticket_counters(tenant_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} ticket counter buckets"))
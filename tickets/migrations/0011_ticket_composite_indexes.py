@@ -0,0 +1,37 @@
+# Generated by Django 5.0.6 on 2026-10-17 20:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0007_alter_assetlog_options_assetlog_change_and_more'),
+        ('tenants', '0005_remove_site_domain_tenant_domain'),
+        ('tickets', '0010_ticket_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['tenant', '-created_at', '-id'], name='ticket_tenant_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['tenant', 'assignee', '-created_at', '-id'], name='ticket_tenant_assignee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['tenant', 'site', '-created_at', '-id'], name='ticket_tenant_site_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['tenant', 'status', '-created_at', '-id'], name='ticket_tenant_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['tenant', 'priority', '-created_at', '-id'], name='ticket_tenant_priority_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.6 on 2026-10-17 20:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    Ticket = apps.get_model('tickets', 'Ticket')
+    TicketCounter = apps.get_model('tickets', 'TicketCounter')
+    rows = []
+    for scope, column in (('TENANT', 'tenant_id'), ('SITE', 'site_id'), ('ASSIGNEE', 'assignee_id')):
+        buckets = (
+            Ticket.objects.exclude(**{column: None})
+            .values('tenant_id', column, 'status', 'priority')
+            .annotate(n=Count('id'))
+            .order_by()
+        )
+        rows.extend(
+            TicketCounter(
+                tenant_id=b['tenant_id'], scope=scope, scope_id=b[column],
+                status=b['status'], priority=b['priority'], count=b['n'],
+            )
+            for b in buckets
+        )
+    TicketCounter.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0005_remove_site_domain_tenant_domain'),
+        ('tickets', '0011_ticket_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('TENANT', 'Tenant'), ('SITE', 'Site'), ('ASSIGNEE', 'Assignee')], max_length=10)),
+                ('scope_id', models.PositiveBigIntegerField(help_text='Tenant, site or assignee id, depending on scope')),
+                ('status', models.CharField(choices=[('OPEN', 'Open'), ('ASSIGNED', 'Assigned'), ('IN_PROGRESS', 'In Progress'), ('RESOLVED', 'Resolved'), ('CLOSED', 'Closed')], max_length=20)),
+                ('priority', models.CharField(choices=[('LOW', 'Low'), ('MEDIUM', 'Medium'), ('HIGH', 'High'), ('URGENT', 'Urgent')], max_length=10)),
+                ('count', models.IntegerField(default=0)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_counters', to='tenants.tenant')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='ticketcounter',
+            constraint=models.UniqueConstraint(fields=('tenant', 'scope', 'scope_id', 'status', 'priority'), name='uniq_ticket_counter_bucket'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,9 @@
-from django.db import models
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
 from django.urls import reverse
+from django.utils import timezone
 
 
 class Ticket(models.Model):
@@ -106,11 +110,60 @@ class Ticket(models.Model):
     requires_follow_up = models.BooleanField(default=False)
     follow_up_notes = models.TextField(blank=True, null=True)
 
+    class Meta:
+        # Shaped after TicketViewSet.get_queryset: every list is scoped to a
+        # tenant, optionally narrowed by role or filter, newest first with the
+        # id tie-breaker used by keyset pagination.
+        indexes = [
+            models.Index(fields=["tenant", "-created_at", "-id"], name="ticket_tenant_created_idx"),
+            models.Index(fields=["tenant", "assignee", "-created_at", "-id"], name="ticket_tenant_assignee_idx"),
+            models.Index(fields=["tenant", "site", "-created_at", "-id"], name="ticket_tenant_site_idx"),
+            models.Index(fields=["tenant", "status", "-created_at", "-id"], name="ticket_tenant_status_idx"),
+            models.Index(fields=["tenant", "priority", "-created_at", "-id"], name="ticket_tenant_priority_idx"),
+        ]
+
+    # Columns the materialized rollups (tickets.rollups) are keyed on
+    TRACKED_FIELDS = ("tenant_id", "site_id", "assignee_id", "status", "priority", "resolved_at", "invoice_amount")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def tracked_values(self):
+        return {name: getattr(self, name) for name in self.TRACKED_FIELDS}
+
+    def loaded_tracked_values(self):
+        """Tracked values as last read from or written to the database."""
+        loaded = getattr(self, "_loaded_values", {})
+        return {name: loaded.get(name, getattr(self, name)) for name in self.TRACKED_FIELDS}
+
     def save(self, *args, **kwargs):
+        from .rollups import apply_ticket_changes
+
         # Update total_cost if invoice_amount is set
         if self.invoice_amount is not None:
             self.total_cost = self.invoice_amount
-        super().save(*args, **kwargs)
+
+        before = None if self._state.adding else self.loaded_tracked_values()
+        after = self.tracked_values()
+        update_fields = kwargs.get("update_fields")
+        written = None if update_fields is None else {self._meta.get_field(name).attname for name in update_fields}
+        if before is not None and written is not None:
+            after = {name: after[name] if name in written else before[name] for name in after}
+
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+            apply_ticket_changes([(before, after)])
+        self._loaded_values = {
+            **getattr(self, "_loaded_values", {}),
+            **{
+                field.attname: getattr(self, field.attname)
+                for field in self._meta.concrete_fields
+                if written is None or field.attname in written
+            },
+        }
 
     def __str__(self):
         return f"{self.id}: {self.title} ({self.get_status_display()})"
@@ -121,61 +174,164 @@ class Ticket(models.Model):
             kwargs={"tenant_slug": self.tenant.slug, "pk": self.pk}
         )
         
-    def assign_contractor(self, contractor):
+    def assign_contractor(self, contractor, actor=None):
         """Helper method to assign a contractor to the ticket"""
         if contractor.role != 'CONTRACTOR':
             raise ValueError("Only users with role CONTRACTOR can be assigned to tickets")
             
-        self.assignee = contractor
-        self.status = self.Status.ASSIGNED
-        self.assigned_at = timezone.now()
-        self.save()
-        
-        # Send notification to contractor
+        # Status changes are conditional updates of the changed columns,
+        # recorded in the ticket history (tickets.transitions); notifications
+        # are queued in the same transaction as the change.
         from .notifications import send_ticket_assignment_notification
-        send_ticket_assignment_notification(self)
+        from .transitions import transition
+        with transaction.atomic():
+            transition(self, self.Status.ASSIGNED, actor=actor, assignee=contractor)
+            send_ticket_assignment_notification(self)
         
         return self
     
-    def start_work(self):
+    def start_work(self, actor=None):
         """Mark ticket as in progress"""
-        self.status = self.Status.IN_PROGRESS
-        self.started_at = timezone.now()
-        self.save()
-        
-        # Send notification to site manager
         from .notifications import send_ticket_status_update
-        send_ticket_status_update(self, self.Status.ASSIGNED)
+        from .transitions import transition
+        with transaction.atomic():
+            previous = transition(self, self.Status.IN_PROGRESS, actor=actor)
+            send_ticket_status_update(self, previous)
         
         return self
     
-    def mark_resolved(self):
+    def mark_resolved(self, actor=None):
         """Mark ticket as resolved (work completed)"""
-        self.status = self.Status.RESOLVED
-        self.resolved_at = timezone.now()
-        self.save()
-        
-        # Send notification to site manager
         from .notifications import send_ticket_status_update
-        send_ticket_status_update(self, self.Status.IN_PROGRESS)
+        from .transitions import transition
+        with transaction.atomic():
+            previous = transition(self, self.Status.RESOLVED, actor=actor)
+            send_ticket_status_update(self, previous)
         
         return self
     
-    def close_ticket(self, rating=None, feedback=None):
+    def close_ticket(self, rating=None, feedback=None, actor=None):
         """Close the ticket with optional rating"""
-        self.status = self.Status.CLOSED
-        self.closed_at = timezone.now()
-        
+        changes = {}
         if rating is not None:
-            self.contractor_rating = rating
+            changes["contractor_rating"] = rating
         if feedback is not None:
-            self.contractor_feedback = feedback
-            
-        self.save()
+            changes["contractor_feedback"] = feedback
         
         # Send notification to contractor
         from .notifications import send_ticket_status_update
-        send_ticket_status_update(self, self.Status.RESOLVED)
+        from .transitions import transition
+        with transaction.atomic():
+            previous = transition(self, self.Status.CLOSED, actor=actor, **changes)
+            send_ticket_status_update(self, previous)
         
         return self
 
+
+
+class TicketCounter(models.Model):
+    """
+    Materialized ticket count for one (scope, status, priority) bucket.
+
+    Kept current by tickets.rollups in the same transaction as the ticket
+    write; `rebuild_ticket_counters` recomputes them from scratch.
+    """
+    class Scope(models.TextChoices):
+        TENANT = "TENANT"
+        SITE = "SITE"
+        ASSIGNEE = "ASSIGNEE"
+
+    tenant = models.ForeignKey('tenants.Tenant', on_delete=models.CASCADE, related_name='ticket_counters')
+    scope = models.CharField(max_length=10, choices=Scope.choices)
+    scope_id = models.PositiveBigIntegerField(help_text="Tenant, site or assignee id, depending on scope")
+    status = models.CharField(max_length=20, choices=Ticket.Status.choices)
+    priority = models.CharField(max_length=10, choices=Ticket.Priority.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant", "scope", "scope_id", "status", "priority"], name="uniq_ticket_counter_bucket"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.scope_id} {self.status}/{self.priority} = {self.count}"
+
+
+class TicketEvent(models.Model):
+    """
+    Append-only change history of a ticket: one row per write, holding a
+    compact {field: [old, new]} diff of the fields in
+    tickets.history.HISTORY_FIELDS.
+
+    Rows are only ever inserted (see tickets.history.record). `created_at`
+    is set by the writer rather than auto_now_add, so every event of one
+    write shares it, and it is the natural key to range-partition the
+    table by month; there are no unique constraints that would have to
+    include it.
+    """
+    class Kind(models.TextChoices):
+        CREATED = "CREATED"
+        UPDATED = "UPDATED"
+        TRANSITION = "TRANSITION"
+
+    tenant = models.ForeignKey('tenants.Tenant', on_delete=models.CASCADE, related_name='ticket_events')
+    ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name='events')
+    actor = models.ForeignKey(
+        'accounts.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='ticket_events'
+    )
+    kind = models.CharField(max_length=12, choices=Kind.choices)
+    changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Timeline of one ticket, keyset-paginated oldest first.
+            models.Index(fields=["ticket", "created_at", "id"], name="ticket_event_timeline_idx"),
+            # Tenant-wide history and month-by-month archiving.
+            models.Index(fields=["tenant", "created_at"], name="ticket_event_tenant_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Ticket events are append-only")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.ticket_id} {self.kind} at {self.created_at:%Y-%m-%d %H:%M}"
+
+
+class UploadSession(models.Model):
+    """
+    A chunked, resumable upload of a ticket's job card or invoice (see
+    tickets.uploads). Chunks are written to a part file as they arrive;
+    `received` is the length of the contiguous prefix stored so far, which
+    is where an interrupted client resumes.
+    """
+    class Field(models.TextChoices):
+        JOB_CARD = "job_card", "Job card"
+        INVOICE = "invoice", "Invoice"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant = models.ForeignKey('tenants.Tenant', on_delete=models.CASCADE, related_name='upload_sessions')
+    ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name='upload_sessions')
+    created_by = models.ForeignKey(
+        'accounts.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='upload_sessions'
+    )
+    field = models.CharField(max_length=10, choices=Field.choices)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField(help_text="Total size in bytes")
+    received = models.PositiveBigIntegerField(default=0, help_text="Bytes stored so far, from the start")
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Checked on completion when given")
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["expires_at"], name="upload_session_expires_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.field} for ticket {self.ticket_id}: {self.received}/{self.size}"
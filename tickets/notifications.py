@@ -1,216 +1,361 @@
-from django.conf import settings
-from notifications.twilio_service import send_whatsapp
+import hashlib
+from collections import defaultdict
+
+from django.utils.functional import cached_property
+from notifications import registry
+from notifications.outbox import enqueue, enqueue_many
 from .models import Ticket
-from django.template.loader import render_to_string
+
+# Audiences
+CONTRACTOR = "contractor"
+ADMIN = "admin"
+OTHER_ADMINS = "other_admins"
+BROADCAST = "broadcast"  # the default notification number
+
+# Events besides the ticket statuses
+NEW_ASSIGNMENT = "NEW_ASSIGNMENT"
+CONFIRMED = "CONFIRMED"
+CREATED = "CREATED"
+UPDATED = "UPDATED"
+SUMMARY = "SUMMARY"  # one message about several tickets (bulk transitions)
+
+# Tickets listed in a summary message before it is cut short
+SUMMARY_MAX_LINES = 20
+
+
+class TicketMessageContext(registry.LazyContext):
+    """Template fields for a ticket, each computed on first use."""
+
+    def __init__(self, ticket: Ticket):
+        self.ticket = ticket
+        self.id = ticket.id
+        self.title = ticket.title
+
+    @cached_property
+    def description(self):
+        return self.ticket.description
+
+    @cached_property
+    def description_preview(self):
+        return self.ticket.description[:100]
+
+    @cached_property
+    def site_name(self):
+        return self.ticket.site.name if self.ticket.site else 'the specified site'
+
+    @cached_property
+    def priority(self):
+        return self.ticket.get_priority_display()
+
+    @cached_property
+    def status(self):
+        return self.ticket.status
+
+    @cached_property
+    def creator_name(self):
+        return self.ticket.created_by.get_full_name() or self.ticket.created_by.username
+
+    @cached_property
+    def assignee_name(self):
+        return self.ticket.assignee.get_full_name() or self.ticket.assignee.username
+
+    @cached_property
+    def assignee_username(self):
+        return self.ticket.assignee.username
+
+    @cached_property
+    def stars(self):
+        return '⭐' * (self.ticket.contractor_rating or 0)
+
+    @cached_property
+    def url(self):
+        from .helpers.url_builder import get_ticket_url
+        return get_ticket_url(self.ticket)
+
+
+class TicketSummaryContext(registry.LazyContext):
+    """Template fields for a summary of tickets that moved to the same status."""
+
+    def __init__(self, tickets, status):
+        self.tickets = tickets
+        self.count = len(tickets)
+        self.status = Ticket.Status(status).label
+
+    @cached_property
+    def ticket_list(self):
+        lines = [
+            f"• #{t.id} {t.title}" + (f" ({t.site.name})" if t.site_id else "")
+            for t in self.tickets[:SUMMARY_MAX_LINES]
+        ]
+        if self.count > SUMMARY_MAX_LINES:
+            lines.append(f"…and {self.count - SUMMARY_MAX_LINES} more")
+        return "\n".join(lines)
+
+
+registry.register(NEW_ASSIGNMENT, CONTRACTOR, """
+    🎯 NEW TICKET ASSIGNED - {title}
+
+    You've been assigned a new ticket by {creator_name}.
+
+    📌 {title}
+    📝 {description_preview}...
+    🏢 Site: {site_name}
+    ⚠️ Priority: {priority}
+
+    Please confirm when you can start working on this ticket.
+""")
+registry.register(NEW_ASSIGNMENT, ADMIN, """
+    ✅ TICKET ASSIGNED - {title}
+
+    You've assigned ticket #{id} to {assignee_name}.
+
+    We've notified them and will update you when they confirm.
+""")
+registry.register(Ticket.Status.ASSIGNED, CONTRACTOR, """
+    🎯 TICKET ASSIGNED - {title}
+
+    You've been assigned a new ticket by {creator_name}.
+
+    📌 {title}
+    📝 {description_preview}...
+    🏢 Site: {site_name}
+
+    Please confirm when you can start working on this ticket.
+""")
+registry.register(Ticket.Status.ASSIGNED, ADMIN, """
+    ✅ TICKET ASSIGNED - {title}
+
+    You've assigned ticket #{id} to {assignee_name}.
+
+    We've notified them and will update you when they confirm.
+""")
+registry.register(Ticket.Status.IN_PROGRESS, CONTRACTOR, """
+    🚀 WORK STARTED - {title}
+
+    You've started working on ticket #{id}.
+
+    Please update the ticket status when you complete the work.
+""")
+registry.register(Ticket.Status.IN_PROGRESS, ADMIN, """
+    🚀 WORK IN PROGRESS - {title}
+
+    {assignee_name} has started working on ticket #{id}.
+
+    You'll be notified when the work is completed.
+""")
+registry.register(Ticket.Status.RESOLVED, CONTRACTOR, """
+    ✅ WORK COMPLETED - {title}
+
+    You've marked ticket #{id} as completed.
+
+    Waiting for site manager review and approval.
+""")
+registry.register(Ticket.Status.RESOLVED, ADMIN, """
+    ✅ WORK COMPLETED - {title}
+
+    {assignee_name} has marked ticket #{id} as completed.
+
+    Please review the work and close the ticket if everything is in order.
+""")
+registry.register(Ticket.Status.CLOSED, CONTRACTOR, """
+    🎉 TICKET CLOSED - {title}
+
+    Ticket #{id} has been closed by the site manager.
+
+    Rating: {stars}
+
+    Thank you for your work!
+""")
+registry.register(Ticket.Status.CLOSED, ADMIN, """
+    🎉 TICKET CLOSED - {title}
+
+    You've successfully closed ticket #{id}.
+
+    Contractor: {assignee_name}
+    Rating: {stars}
+""")
+registry.register(Ticket.Status.CLOSED, OTHER_ADMINS, """
+    ℹ️ TICKET CLOSED - {title}
+
+    Ticket #{id} has been closed by a site manager.
+
+    Contractor: {assignee_name}
+    Rating: {stars}
+""")
+registry.register(CONFIRMED, ADMIN, """
+    ✅ CONTRACTOR CONFIRMATION - {title}
+
+    {assignee_name} has confirmed they will work on ticket #{id}.
+
+    📌 {title}
+    🏢 Site: {site_name}
+
+    You can now mark the ticket as 'In Progress' when they start working.
+""")
+registry.register(SUMMARY, CONTRACTOR, """
+    📋 {count} of your tickets are now {status}
+
+    {ticket_list}
+""")
+registry.register(SUMMARY, ADMIN, """
+    📋 {count} tickets are now {status}
+
+    {ticket_list}
+""")
+registry.register(CREATED, BROADCAST, "New ticket: {title} ({id})")
+registry.register(UPDATED, BROADCAST, """
+    📋 *Ticket Update*
+
+    Status: {status}
+    Title: {title}
+    Assigned to: {assignee_username}
+
+    {description}
+
+    🔗 View Ticket: {url}
+""")
+
+
+def _notification_key(ticket: Ticket, event: str, recipient) -> str:
+    """Idempotency key for one notification about the ticket's current version."""
+    return f"ticket:{ticket.id}:{event.lower()}:{ticket.updated_at.isoformat()}:{recipient.id}"
+
+
+def render_ticket_message(event: str, audience: str, ticket: Ticket, context=None):
+    """Render the registered (event, audience) message for `ticket`."""
+    return registry.render(event, audience, context or TicketMessageContext(ticket))
+
 
 def send_ticket_assignment_notification(ticket: Ticket):
     """Send notification when a ticket is assigned to a contractor"""
     if not ticket.assignee or not ticket.assignee.phone_number:
         return
-    
-    site_name = ticket.site.name if ticket.site else 'the specified site'
-    
-    # Message to contractor
-    contractor_message = f"""
-    🎯 NEW TICKET ASSIGNED - {ticket.title}
-    
-    You've been assigned a new ticket by {ticket.created_by.get_full_name() or ticket.created_by.username}.
-    
-    📌 {ticket.title}
-    📝 {ticket.description[:100]}...
-    🏢 Site: {site_name}
-    ⚠️ Priority: {ticket.get_priority_display()}
-    
-    Please confirm when you can start working on this ticket.
-    """
-    
-    # Message to admin who assigned the ticket
-    admin_message = f"""
-    ✅ TICKET ASSIGNED - {ticket.title}
-    
-    You've assigned ticket #{ticket.id} to {ticket.assignee.get_full_name() or ticket.assignee.username}.
-    
-    We've notified them and will update you when they confirm.
-    """
-    
-    try:
-        # Notify contractor
-        send_whatsapp(
-            to=ticket.assignee.phone_number,
-            body=contractor_message
+
+    context = TicketMessageContext(ticket)
+
+    # Notify contractor
+    enqueue(
+        registry.render(NEW_ASSIGNMENT, CONTRACTOR, context),
+        to=ticket.assignee.phone_number,
+        key=_notification_key(ticket, "assigned", ticket.assignee)
+    )
+
+    # Notify admin who assigned the ticket
+    if ticket.created_by.phone_number:
+        enqueue(
+            registry.render(NEW_ASSIGNMENT, ADMIN, context),
+            to=ticket.created_by.phone_number,
+            key=_notification_key(ticket, "assigned", ticket.created_by)
         )
-        
-        # Notify admin who assigned the ticket
-        if ticket.created_by.phone_number:
-            send_whatsapp(
-                to=ticket.created_by.phone_number,
-                body=admin_message
-            )
-            
-    except Exception as e:
-        print(f"Failed to send WhatsApp notification: {e}")
 
 def send_ticket_status_update(ticket: Ticket, previous_status: str):
     """Send notification when ticket status changes"""
     if not ticket.assignee:
         return
-    
-    site_name = ticket.site.name if ticket.site else 'the specified site'
-    status_updates = {
-        'ASSIGNED': {
-            'title': 'TICKET ASSIGNED',
-            'to_contractor': f"""
-            🎯 TICKET ASSIGNED - {ticket.title}
-            
-            You've been assigned a new ticket by {ticket.created_by.get_full_name() or ticket.created_by.username}.
-            
-            📌 {ticket.title}
-            📝 {ticket.description[:100]}...
-            🏢 Site: {site_name}
-            
-            Please confirm when you can start working on this ticket.
-            """,
-            'to_admin': f"""
-            ✅ TICKET ASSIGNED - {ticket.title}
-            
-            You've assigned ticket #{ticket.id} to {ticket.assignee.get_full_name() or ticket.assignee.username}.
-            
-            We've notified them and will update you when they confirm.
-            """
-        },
-        'IN_PROGRESS': {
-            'title': 'WORK STARTED',
-            'to_contractor': f"""
-            🚀 WORK STARTED - {ticket.title}
-            
-            You've started working on ticket #{ticket.id}.
-            
-            Please update the ticket status when you complete the work.
-            """,
-            'to_admin': f"""
-            🚀 WORK IN PROGRESS - {ticket.title}
-            
-            {ticket.assignee.get_full_name() or ticket.assignee.username} has started working on ticket #{ticket.id}.
-            
-            You'll be notified when the work is completed.
-            """
-        },
-        'RESOLVED': {
-            'title': 'WORK COMPLETED',
-            'to_contractor': f"""
-            ✅ WORK COMPLETED - {ticket.title}
-            
-            You've marked ticket #{ticket.id} as completed.
-            
-            Waiting for site manager review and approval.
-            """,
-            'to_admin': f"""
-            ✅ WORK COMPLETED - {ticket.title}
-            
-            {ticket.assignee.get_full_name() or ticket.assignee.username} has marked ticket #{ticket.id} as completed.
-            
-            Please review the work and close the ticket if everything is in order.
-            """
-        },
-        'CLOSED': {
-            'title': 'TICKET CLOSED',
-            'to_contractor': f"""
-            🎉 TICKET CLOSED - {ticket.title}
-            
-            Ticket #{ticket.id} has been closed by {ticket.closed_by.get_full_name() if ticket.closed_by else 'the site manager'}.
-            
-            Rating: {'⭐' * (ticket.contractor_rating or 0)}
-            
-            Thank you for your work!
-            """,
-            'to_admin': f"""
-            🎉 TICKET CLOSED - {ticket.title}
-            
-            You've successfully closed ticket #{ticket.id}.
-            
-            Contractor: {ticket.assignee.get_full_name() or ticket.assignee.username}
-            Rating: {'⭐' * (ticket.contractor_rating or 0)}
-            """
-        },
-        'COMPLETED': {
-            'title': 'Work Completed',
-            'message': f'Ticket #{ticket.id} has been marked as completed'
-        },
-        'CLOSED': {
-            'title': 'Ticket Closed',
-            'message': f'Ticket #{ticket.id} has been closed'
-        }
-    }
-    
-    update = status_updates.get(ticket.status)
-    if not update:
-        return
-    
-    try:
-        # Notify contractor
-        if ticket.assignee.phone_number and 'to_contractor' in update:
-            send_whatsapp(
-                to=ticket.assignee.phone_number,
-                body=update['to_contractor'].strip()
-            )
-        
-        # Notify admin/site manager
-        if ticket.created_by.phone_number and 'to_admin' in update and ticket.assignee != ticket.created_by:
-            send_whatsapp(
-                to=ticket.created_by.phone_number,
-                body=update['to_admin'].strip()
-            )
-            
-        # For closed tickets, also notify other admins
-        if ticket.status == 'CLOSED':
-            from django.contrib.auth import get_user_model
-            User = get_user_model()
-            
-            admins = User.objects.filter(
-                tenant=ticket.tenant,
-                is_superuser=True
-            ).exclude(
-                id__in=[ticket.created_by_id, ticket.assignee_id]
-            )
-            
-            for admin in admins:
-                if admin.phone_number:
-                    send_whatsapp(
-                        to=admin.phone_number,
-                        body=f"""
-                        ℹ️ TICKET CLOSED - {ticket.title}
-                        
-                        Ticket #{ticket.id} has been closed by {ticket.closed_by.get_full_name() if ticket.closed_by else 'a site manager'}.
-                        
-                        Contractor: {ticket.assignee.get_full_name() or ticket.assignee.username}
-                        Rating: {'⭐' * (ticket.contractor_rating or 0)}
-                        """.strip()
-                    )
-                    
-    except Exception as e:
-        print(f"Failed to send status update notifications: {e}")
+
+    event = ticket.status
+    context = TicketMessageContext(ticket)
+
+    # Notify contractor
+    contractor_message = registry.get_template(event, CONTRACTOR)
+    if ticket.assignee.phone_number and contractor_message:
+        enqueue(
+            contractor_message.render(context),
+            to=ticket.assignee.phone_number,
+            key=_notification_key(ticket, event, ticket.assignee)
+        )
+
+    # Notify admin/site manager
+    admin_message = registry.get_template(event, ADMIN)
+    if ticket.created_by.phone_number and admin_message and ticket.assignee != ticket.created_by:
+        enqueue(
+            admin_message.render(context),
+            to=ticket.created_by.phone_number,
+            key=_notification_key(ticket, event, ticket.created_by)
+        )
+
+    # For closed tickets, also notify other admins
+    if ticket.status == 'CLOSED':
+        from django.contrib.auth import get_user_model
+        User = get_user_model()
+
+        admins = User.objects.filter(
+            tenant=ticket.tenant,
+            is_superuser=True
+        ).exclude(
+            id__in=[ticket.created_by_id, ticket.assignee_id]
+        ).exclude(
+            phone_number__isnull=True
+        ).exclude(
+            phone_number=""
+        ).only("id", "phone_number")
+
+        # One message body for every admin, queued with a single INSERT
+        message = registry.render(event, OTHER_ADMINS, context)
+        enqueue_many(
+            (admin.phone_number, message, _notification_key(ticket, event, admin))
+            for admin in admins
+        )
 
 
 def send_contractor_confirmation_notification(ticket: Ticket):
     """Send notification when contractor confirms they can work on the ticket"""
     if not ticket.assignee or not ticket.created_by.phone_number:
         return
-    
-    message = f"""
-    ✅ CONTRACTOR CONFIRMATION - {ticket.title}
-    
-    {ticket.assignee.get_full_name() or ticket.assignee.username} has confirmed they will work on ticket #{ticket.id}.
-    
-    📌 {ticket.title}
-    🏢 Site: {ticket.site.name if ticket.site else 'N/A'}
-    
-    You can now mark the ticket as 'In Progress' when they start working.
+
+    enqueue(
+        render_ticket_message(CONFIRMED, ADMIN, ticket),
+        to=ticket.created_by.phone_number,
+        key=_notification_key(ticket, "confirmed", ticket.created_by)
+    )
+
+
+def _summary_key(tickets, status: str, recipient) -> str:
+    digest = hashlib.sha1(
+        ",".join(f"{t.id}@{t.updated_at.isoformat()}" for t in tickets).encode()
+    ).hexdigest()[:16]
+    return f"tickets:{status.lower()}:{digest}:{recipient.id}"
+
+
+def send_bulk_status_summary(tickets, status: str):
     """
-    
-    try:
-        send_whatsapp(
-            to=ticket.created_by.phone_number,
-            body=message.strip()
-        )
-    except Exception as e:
-        print(f"Failed to send contractor confirmation notification: {e}")
+    Queue one summary per recipient for tickets that all moved to `status`:
+    each contractor hears about their tickets, each creator about theirs
+    and, for closed tickets, the tenant's other admins about the rest.
+    """
+    by_contractor, by_creator, users = defaultdict(list), defaultdict(list), {}
+    for ticket in tickets:
+        if ticket.assignee_id is None:
+            continue
+        users[ticket.assignee_id], users[ticket.created_by_id] = ticket.assignee, ticket.created_by
+        by_contractor[ticket.assignee_id].append(ticket)
+        if ticket.created_by_id != ticket.assignee_id:
+            by_creator[ticket.created_by_id].append(ticket)
+
+    messages = []
+    for audience, groups in ((CONTRACTOR, by_contractor), (ADMIN, by_creator)):
+        for user_id, group in groups.items():
+            user = users[user_id]
+            if user.phone_number:
+                body = registry.render(SUMMARY, audience, TicketSummaryContext(group, status))
+                messages.append((user.phone_number, body, _summary_key(group, status, user)))
+
+    if status == Ticket.Status.CLOSED:
+        from django.contrib.auth import get_user_model
+        User = get_user_model()
+
+        notified = [t for t in tickets if t.assignee_id]
+        admins = User.objects.filter(
+            tenant_id__in={t.tenant_id for t in notified}, is_superuser=True
+        ).exclude(phone_number__isnull=True).exclude(phone_number="").only("id", "tenant_id", "phone_number")
+        for admin in admins:
+            group = [
+                t for t in notified
+                if t.tenant_id == admin.tenant_id and admin.id not in (t.created_by_id, t.assignee_id)
+            ]
+            if group:
+                body = registry.render(SUMMARY, ADMIN, TicketSummaryContext(group, status))
+                messages.append((admin.phone_number, body, _summary_key(group, status, admin)))
+
+    if messages:
+        enqueue_many(messages)
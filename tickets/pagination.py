@@ -0,0 +1,160 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination on (created_at, id).
+
+    Each page is fetched with a `WHERE (created_at, id) < cursor` predicate
+    instead of an OFFSET, so deep pages cost the same as the first one, no
+    COUNT(*) is issued, and rows inserted while a client is paging do not
+    shift the pages it has not read yet.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = _('Invalid cursor')
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_position = self.get_position(rows[-1]) if self.has_next else None
+        return rows
+
+    def after(self, position):
+        """Filter selecting the rows that sort after `position`."""
+        (first, second), (first_value, second_value) = self._fields(), position
+        lookup = 'lt' if self.ordering[0].startswith('-') else 'gt'
+        # The redundant inclusive bound gives the planner an index range to seek.
+        return Q(**{f'{first}__{lookup}e': first_value}) & (
+            Q(**{f'{first}__{lookup}': first_value}) | Q(**{f'{second}__{lookup}': second_value})
+        )
+
+    def get_position(self, obj):
+        first, second = self._fields()
+        return getattr(obj, first), getattr(obj, second)
+
+    def _fields(self):
+        return tuple(field.lstrip('-') for field in self.ordering)
+
+    def encode_cursor(self, position):
+        created_at, pk = position
+        raw = f'{created_at.isoformat()}|{pk}'
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode()).decode()
+            created_at, pk = raw.rsplit('|', 1)
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class TimelinePagination(KeysetPagination):
+    """Ticket history, oldest event first."""
+    page_size = 50
+    max_page_size = 200
+    ordering = ('created_at', 'id')
+
+
+class OptionalKeysetPagination(BasePagination):
+    """
+    Page with `default_class` unless the client opts into keyset paging with
+    `?pagination=cursor` (or by following a `?cursor=` link).
+
+    With no `default_class` the endpoint stays unpaginated by default.
+    """
+    default_class = None
+    keyset_class = KeysetPagination
+    mode_query_param = 'pagination'
+
+    def __init__(self):
+        self.paginator = None
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request):
+            self.paginator = self.keyset_class()
+        elif self.default_class is not None:
+            self.paginator = self.default_class()
+        else:
+            return None
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        paginator = self.default_class() if self.default_class else self.keyset_class()
+        return paginator.get_paginated_response_schema(schema)
+
+
+class TicketPagination(OptionalKeysetPagination):
+    default_class = StandardResultsSetPagination
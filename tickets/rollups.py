@@ -0,0 +1,173 @@
+"""
+Materialized ticket rollups (TicketCounter, SiteMonthlySpend) maintained
+alongside ticket writes.
+
+Every write path hands `apply_ticket_changes` a list of (before, after)
+snapshots of `Ticket.TRACKED_FIELDS` (None for a created or deleted ticket)
+inside the transaction that changes the tickets. The net change is folded
+into per-bucket deltas so a batch costs one UPDATE per touched bucket.
+"""
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from tenants.models import SiteMonthlySpend
+from .models import Ticket, TicketCounter
+
+Scope = TicketCounter.Scope
+
+
+def _counter_keys(snapshot):
+    tenant_id, status, priority = snapshot["tenant_id"], snapshot["status"], snapshot["priority"]
+    yield tenant_id, Scope.TENANT, tenant_id, status, priority
+    if snapshot["site_id"]:
+        yield tenant_id, Scope.SITE, snapshot["site_id"], status, priority
+    if snapshot["assignee_id"]:
+        yield tenant_id, Scope.ASSIGNEE, snapshot["assignee_id"], status, priority
+
+
+def counter_deltas(changes):
+    deltas = Counter()
+    for before, after in changes:
+        if before is not None:
+            deltas.subtract(_counter_keys(before))
+        if after is not None:
+            deltas.update(_counter_keys(after))
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def _spend_key(snapshot):
+    if not (snapshot["site_id"] and snapshot["resolved_at"] and snapshot["invoice_amount"] is not None):
+        return None
+    resolved_at = snapshot["resolved_at"]
+    if timezone.is_aware(resolved_at):
+        resolved_at = timezone.localtime(resolved_at)
+    return snapshot["tenant_id"], snapshot["site_id"], resolved_at.year, resolved_at.month
+
+
+def spend_deltas(changes):
+    deltas = defaultdict(lambda: [Decimal("0"), 0])
+    for before, after in changes:
+        for snapshot, sign in ((before, -1), (after, 1)):
+            key = snapshot and _spend_key(snapshot)
+            if key:
+                deltas[key][0] += sign * snapshot["invoice_amount"]
+                deltas[key][1] += sign
+    return {key: tuple(delta) for key, delta in deltas.items() if any(delta)}
+
+
+def _add_to_bucket(model, bucket, deltas):
+    """UPDATE bucket += deltas, creating the row on first increment."""
+    if model.objects.filter(**bucket).update(**{field: F(field) + delta for field, delta in deltas.items()}):
+        return
+    if all(delta <= 0 for delta in deltas.values()):
+        # Bucket already gone (e.g. its tenant is being deleted); leave any
+        # drift to the rebuild commands.
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**bucket, **deltas)
+    except IntegrityError:
+        model.objects.filter(**bucket).update(**{field: F(field) + delta for field, delta in deltas.items()})
+
+
+def _apply_counter_deltas(deltas):
+    # Sorted so concurrent writers lock buckets in the same order.
+    for (tenant_id, scope, scope_id, status, priority), delta in sorted(deltas.items()):
+        bucket = dict(tenant_id=tenant_id, scope=scope, scope_id=scope_id, status=status, priority=priority)
+        _add_to_bucket(TicketCounter, bucket, {"count": delta})
+
+
+def _apply_spend_deltas(deltas):
+    for (tenant_id, site_id, year, month), (amount, count) in sorted(deltas.items()):
+        bucket = dict(tenant_id=tenant_id, site_id=site_id, year=year, month=month)
+        _add_to_bucket(SiteMonthlySpend, bucket, {"total_invoiced": amount, "ticket_count": count})
+
+
+def apply_ticket_changes(changes):
+    """Fold ticket (before, after) snapshots into the materialized rollups."""
+    deltas = counter_deltas(changes)
+    if deltas:
+        _apply_counter_deltas(deltas)
+    deltas = spend_deltas(changes)
+    if deltas:
+        _apply_spend_deltas(deltas)
+
+
+def rebuild_ticket_counters(tenant_ids=None):
+    """Recompute TicketCounter rows from the tickets table. Returns the bucket count."""
+    tickets = Ticket.objects.all()
+    counters = TicketCounter.objects.all()
+    if tenant_ids is not None:
+        tickets = tickets.filter(tenant_id__in=tenant_ids)
+        counters = counters.filter(tenant_id__in=tenant_ids)
+
+    with transaction.atomic():
+        rows = []
+        for scope, column in ((Scope.TENANT, "tenant_id"), (Scope.SITE, "site_id"), (Scope.ASSIGNEE, "assignee_id")):
+            buckets = (
+                tickets.exclude(**{column: None})
+                .values("tenant_id", column, "status", "priority")
+                .annotate(n=Count("id"))
+                .order_by()
+            )
+            rows.extend(
+                TicketCounter(
+                    tenant_id=bucket["tenant_id"],
+                    scope=scope,
+                    scope_id=bucket[column],
+                    status=bucket["status"],
+                    priority=bucket["priority"],
+                    count=bucket["n"],
+                )
+                for bucket in buckets
+            )
+        counters.delete()
+        TicketCounter.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rebuild_site_monthly_spend(tenant_ids=None):
+    """Recompute SiteMonthlySpend rows from resolved, invoiced tickets. Returns the row count."""
+    tickets = Ticket.objects.filter(site__isnull=False, resolved_at__isnull=False, invoice_amount__isnull=False)
+    spend = SiteMonthlySpend.objects.all()
+    if tenant_ids is not None:
+        tickets = tickets.filter(tenant_id__in=tenant_ids)
+        spend = spend.filter(tenant_id__in=tenant_ids)
+
+    with transaction.atomic():
+        buckets = (
+            tickets.annotate(year=ExtractYear("resolved_at"), month=ExtractMonth("resolved_at"))
+            .values("tenant_id", "site_id", "year", "month")
+            .annotate(total=Sum("invoice_amount"), n=Count("id"))
+            .order_by()
+        )
+        rows = [
+            SiteMonthlySpend(
+                tenant_id=bucket["tenant_id"],
+                site_id=bucket["site_id"],
+                year=bucket["year"],
+                month=bucket["month"],
+                total_invoiced=bucket["total"],
+                ticket_count=bucket["n"],
+            )
+            for bucket in buckets
+        ]
+        spend.delete()
+        SiteMonthlySpend.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def ticket_status_counts(tenant_id, scope=Scope.TENANT, scope_id=None):
+    """Ticket counts by status for one scope, read from the counters."""
+    data = {status: 0 for status, _ in Ticket.Status.choices}
+    rows = TicketCounter.objects.filter(
+        tenant_id=tenant_id, scope=scope, scope_id=tenant_id if scope_id is None else scope_id
+    ).values_list("status", "count")
+    for status, count in rows:
+        data[status] = data.get(status, 0) + count
+    return data
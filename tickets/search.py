@@ -0,0 +1,162 @@
+"""
+Full-text search over ticket titles and descriptions.
+
+PostgreSQL keeps a generated `search_vector` tsvector column with a GIN
+index on `tickets_ticket`; SQLite keeps an external-content FTS5 table that
+triggers update on every insert, update and delete. Both are maintained by
+the database itself, so any write path (save, update, bulk_create) keeps the
+index current. Other backends fall back to the old icontains scan.
+"""
+import re
+from functools import lru_cache
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+from .models import Ticket
+
+TICKET_TABLE = Ticket._meta.db_table
+FTS_TABLE = f"{TICKET_TABLE}_fts"
+SEARCH_RANK = "search_rank"
+MAX_TERMS = 8
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+POSTGRES_INSTALL = [
+    f"""
+    ALTER TABLE {TICKET_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    f"CREATE INDEX IF NOT EXISTS ticket_search_vector_gin ON {TICKET_TABLE} USING GIN (search_vector)",
+]
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS ticket_search_vector_gin",
+    f"ALTER TABLE {TICKET_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"title, description, content='{TICKET_TABLE}', content_rowid='id', tokenize='porter unicode61')"
+)
+SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TICKET_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    """,
+    f"{FTS_TABLE}_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TICKET_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        END
+    """,
+    f"{FTS_TABLE}_au": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON {TICKET_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    """,
+}
+SQLITE_REBUILD = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+
+def _sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return any(row[0] == "ENABLE_FTS5" for row in cursor.fetchall())
+
+
+def install_search_index(connection):
+    """
+    Create the search index for `connection` if it is missing.
+
+    Idempotent. On SQLite, Django rebuilds a table (dropping its triggers)
+    whenever a migration alters it, so this also runs after every migrate
+    and re-syncs the FTS table when the triggers had to be recreated.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            for statement in POSTGRES_INSTALL:
+                cursor.execute(statement)
+    elif connection.vendor == "sqlite" and _sqlite_has_fts5(connection):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [TICKET_TABLE]
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            cursor.execute(SQLITE_TABLE)
+            for statement in SQLITE_TRIGGERS.values():
+                cursor.execute(statement)
+            if not set(SQLITE_TRIGGERS) <= existing:
+                cursor.execute(SQLITE_REBUILD)
+    search_backend.cache_clear()
+
+
+def uninstall_search_index(connection):
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            for statement in POSTGRES_UNINSTALL:
+                cursor.execute(statement)
+    elif connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    search_backend.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def search_backend(alias="default"):
+    """Return "postgresql", "sqlite" or None when no search index is installed."""
+    connection = connections[alias]
+    if connection.vendor == "postgresql":
+        return "postgresql"
+    if connection.vendor == "sqlite" and FTS_TABLE in connection.introspection.table_names():
+        return "sqlite"
+    return None
+
+
+def search_terms(query):
+    return _TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def search_tickets(queryset, query):
+    """
+    Filter `queryset` to tickets matching every term of `query` (each term
+    is a prefix match) and annotate `search_rank`, lower being better.
+    """
+    terms = search_terms(query)
+    backend = search_backend(queryset.db)
+    if not terms or backend is None:
+        return queryset.filter(Q(title__icontains=query) | Q(description__icontains=query))
+
+    if backend == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        return queryset.filter(
+            RawSQL(f"{TICKET_TABLE}.search_vector @@ to_tsquery('english', %s)", [tsquery], output_field=BooleanField())
+        ).annotate(**{SEARCH_RANK: RawSQL(
+            f"-ts_rank({TICKET_TABLE}.search_vector, to_tsquery('english', %s))", [tsquery], output_field=FloatField()
+        )})
+
+    # Joined rather than correlated: bm25() is then computed once per hit.
+    match = " ".join(f'"{term}"*' for term in terms)
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f"{FTS_TABLE}.rowid = {TICKET_TABLE}.id", f"{FTS_TABLE} MATCH %s"],
+        params=[match],
+        select={SEARCH_RANK: f"bm25({FTS_TABLE}, 10.0, 1.0)"},
+    )
+
+
+class SearchRankOrderingFilter(filters.OrderingFilter):
+    """OrderingFilter that puts the best search hits first unless ?ordering= is given."""
+
+    def get_ordering(self, request, queryset, view):
+        ranked = SEARCH_RANK in queryset.query.annotations or SEARCH_RANK in queryset.query.extra
+        if ranked and not request.query_params.get(self.ordering_param):
+            return [SEARCH_RANK, "-created_at"]
+        return super().get_ordering(request, queryset, view)
@@ -1,5 +1,6 @@
+from django.conf import settings
 from rest_framework import serializers
-from tickets.models import Ticket
+from tickets.models import Ticket, TicketEvent, UploadSession
 from assets.models import Asset, AssetLog
 from assets.serializers import AssetSerializer
 
@@ -8,7 +9,7 @@ class UserSerializer(serializers.Serializer):
     name = serializers.SerializerMethodField()
     email = serializers.EmailField()
     phone_number = serializers.CharField(required=False, allow_blank=True)
-    company_name = serializers.CharField(source='profile.company_name', required=False, allow_blank=True)
+    company_name = serializers.CharField(required=False, allow_blank=True)
     
     def get_name(self, obj):
         return f"{obj.first_name} {obj.last_name}".strip() or obj.email
@@ -53,7 +54,47 @@ class TicketSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["tenant", "created_by", "created_at", "updated_at", "job_card", "invoice"]
+        # Status only changes through tickets.transitions, which checks the
+        # allowed edges and sets the lifecycle timestamps.
+        read_only_fields = ["tenant", "created_by", "status", "created_at", "updated_at", "job_card", "invoice"]
 
     def get_assets(self, obj):
         return AssetSerializer(obj.assets.all(), many=True).data
+
+    def update(self, instance, validated_data):
+        # Only the submitted columns are written, so a concurrent transition
+        # or upload is not overwritten with the values loaded here.
+        for name, value in validated_data.items():
+            setattr(instance, name, value)
+        instance.save(update_fields=[*validated_data, "updated_at"])
+        return instance
+
+
+class TicketImportSerializer(TicketSerializer):
+    """Imported rows are historical and carry their own status."""
+
+    class Meta(TicketSerializer.Meta):
+        read_only_fields = [name for name in TicketSerializer.Meta.read_only_fields if name != "status"]
+
+
+class TicketEventSerializer(serializers.ModelSerializer):
+    actor = serializers.CharField(source="actor.username", default=None, read_only=True)
+
+    class Meta:
+        model = TicketEvent
+        fields = ["id", "kind", "actor", "changes", "created_at"]
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    size = serializers.IntegerField(min_value=1)
+    sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$", required=False, allow_blank=True, default="")
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = ["id", "field", "filename", "size", "sha256", "received", "chunk_size", "expires_at", "completed_at"]
+        read_only_fields = ["received", "expires_at", "completed_at"]
+
+    def get_chunk_size(self, session):
+        """Largest chunk a PUT may carry."""
+        return settings.TICKET_UPLOAD_MAX_CHUNK
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .models import Ticket
+from .rollups import apply_ticket_changes
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_post_delete(sender, instance: Ticket, **kwargs):
+    # Runs inside the delete's transaction, including cascades from users
+    # and tenants.
+    apply_ticket_changes([(instance.loaded_tracked_values(), None)])
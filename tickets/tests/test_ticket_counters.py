@@ -0,0 +1,81 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tenants.models import Tenant, Site
+from tenants.utils import get_cached_tenant
+from tickets.models import Ticket, TicketCounter
+from tickets.rollups import ticket_status_counts
+
+User = get_user_model()
+
+
+class TicketCounterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.site = Site.objects.create(tenant=self.tenant, name="HQ", slug="hq")
+        self.admin = User.objects.create_user(username="admin", email="admin@acme.com", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.contractor = User.objects.create_user(username="fixer", email="fixer@acme.com", password="pass12345", role="CONTRACTOR", tenant=self.tenant)
+        self.client.force_authenticate(user=self.admin)
+
+    def _ticket(self, **kwargs):
+        return Ticket.objects.create(title="Leak", description="d", tenant=self.tenant, created_by=self.admin, **kwargs)
+
+    def _counters(self):
+        return sorted(TicketCounter.objects.filter(count__gt=0).values_list("scope", "scope_id", "status", "priority", "count"))
+
+    def test_counters_follow_lifecycle(self):
+        ticket = self._ticket(site=self.site)
+        self._ticket(priority=Ticket.Priority.HIGH)
+        ticket.assign_contractor(self.contractor)
+        ticket.start_work()
+
+        counts = ticket_status_counts(self.tenant.id)
+        self.assertEqual(counts[Ticket.Status.OPEN], 1)
+        self.assertEqual(counts[Ticket.Status.IN_PROGRESS], 1)
+        self.assertEqual(counts[Ticket.Status.ASSIGNED], 0)
+        self.assertEqual(ticket_status_counts(self.tenant.id, TicketCounter.Scope.SITE, self.site.id)[Ticket.Status.IN_PROGRESS], 1)
+        self.assertEqual(ticket_status_counts(self.tenant.id, TicketCounter.Scope.ASSIGNEE, self.contractor.id)[Ticket.Status.IN_PROGRESS], 1)
+
+        ticket.delete()
+        self.assertEqual(ticket_status_counts(self.tenant.id)[Ticket.Status.IN_PROGRESS], 0)
+
+    def test_partial_save_only_counts_written_fields(self):
+        ticket = self._ticket()
+        ticket.status = Ticket.Status.CLOSED
+        ticket.title = "Renamed"
+        ticket.save(update_fields=["title"])
+        self.assertEqual(ticket_status_counts(self.tenant.id)[Ticket.Status.OPEN], 1)
+
+    def test_stats_endpoint_reads_counters(self):
+        self._ticket()
+        self._ticket(site=self.site)
+        url = f"/api/{self.tenant.slug}/tickets/stats/"
+        get_cached_tenant(self.tenant.slug)
+        with self.assertNumQueries(1):
+            res = self.client.get(url)
+        self.assertEqual(res.json()[Ticket.Status.OPEN], 2)
+        res = self.client.get(url, {"site": self.site.id})
+        self.assertEqual(res.json()[Ticket.Status.OPEN], 1)
+        for params in ({"site": "²"}, {"assignee": "x"}):
+            with self.subTest(params=params):
+                res = self.client.get(url, params)
+                self.assertEqual(res.status_code, 400)
+                self.assertIn(next(iter(params)), res.json())
+
+    def test_rebuild_repairs_drift(self):
+        priority = self._ticket(site=self.site, assignee=self.contractor).priority
+        self._ticket()
+        Ticket.objects.update(status=Ticket.Status.CLOSED)  # bypasses save()
+        TicketCounter.objects.filter(scope=TicketCounter.Scope.SITE).delete()
+        call_command("rebuild_ticket_counters", stdout=io.StringIO())
+        closed = Ticket.Status.CLOSED
+        self.assertEqual(self._counters(), sorted([
+            (TicketCounter.Scope.ASSIGNEE, self.contractor.id, closed, priority, 1),
+            (TicketCounter.Scope.SITE, self.site.id, closed, priority, 1),
+            (TicketCounter.Scope.TENANT, self.tenant.id, closed, priority, 2),
+        ]))
+        self.assertEqual(ticket_status_counts(self.tenant.id)[closed], 2)
@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tenants.models import Site, Tenant
+from tenants.utils import get_cached_tenant
+from tickets.models import Ticket
+
+User = get_user_model()
+
+
+class TicketExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.site = Site.objects.create(tenant=self.tenant, name="HQ", slug="hq")
+        self.admin = User.objects.create_user(username="admin", email="admin@acme.com", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.contractor = User.objects.create_user(username="fixer", email="fixer@acme.com", password="pass12345", role="CONTRACTOR", tenant=self.tenant)
+        self.client.force_authenticate(user=self.admin)
+        self.url = f"/api/{self.tenant.slug}/tickets/export/"
+
+        now = timezone.now()
+        self.tickets = []
+        for i in range(30):
+            ticket = Ticket.objects.create(
+                title=f"Ticket {i}", description="d", tenant=self.tenant, created_by=self.admin, site=self.site,
+                assignee=self.contractor if i % 3 == 0 else None,
+                status=Ticket.Status.RESOLVED if i % 2 else Ticket.Status.OPEN,
+                invoice_number=f"INV-{i}", invoice_amount=Decimal("10.50") * i,
+            )
+            self.tickets.append(ticket)
+        # Spread creation over 30 days, oldest first.
+        for i, ticket in enumerate(self.tickets):
+            Ticket.objects.filter(pk=ticket.pk).update(created_at=now - timedelta(days=30 - i))
+
+    def _get(self, **params):
+        res = self.client.get(self.url, params)
+        self.assertEqual(res.status_code, 200, getattr(res, "content", b""))
+        self.assertTrue(res.streaming)
+        return b"".join(res.streaming_content).decode()
+
+    def test_csv_export(self):
+        rows = list(csv.DictReader(io.StringIO(self._get())))
+        self.assertEqual(len(rows), 30)
+        self.assertEqual([r["title"] for r in rows[:2]], ["Ticket 0", "Ticket 1"])
+        self.assertEqual(rows[3]["invoice_number"], "INV-3")
+        self.assertEqual(Decimal(rows[3]["invoice_amount"]), Decimal("31.50"))
+        self.assertEqual(Decimal(rows[3]["total_cost"]), Decimal("31.50"))
+        self.assertEqual((rows[3]["site"], rows[3]["assignee"], rows[3]["created_by"]), ("HQ", "fixer", "admin"))
+
+    def test_jsonl_export_with_filters(self):
+        since = (timezone.now() - timedelta(days=10)).date().isoformat()
+        body = self._get(export_format="jsonl", status="RESOLVED", created_after=since)
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([r["title"] for r in rows], [f"Ticket {i}" for i in range(21, 30, 2)])
+        self.assertEqual(rows[0]["invoice_amount"], "220.50")
+
+    def test_role_scoping_and_validation(self):
+        self.client.force_authenticate(user=self.contractor)
+        rows = list(csv.DictReader(io.StringIO(self._get())))
+        self.assertEqual(len(rows), 10)
+
+        self.assertEqual(self.client.get(self.url, {"created_after": "yesterday"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"export_format": "xlsx"}).status_code, 400)
+
+    def test_rows_are_read_while_streaming(self):
+        get_cached_tenant(self.tenant.slug)
+        with self.settings(TICKET_EXPORT_CHUNK_SIZE=7):
+            res = self.client.get(self.url)
+            with self.assertNumQueries(1):
+                body = b"".join(res.streaming_content)
+        self.assertEqual(body.count(b"\n"), 31)
@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from tenants.models import Site, Tenant
+from tenants.utils import get_cached_tenant
+from tickets.models import Ticket, TicketEvent
+
+User = get_user_model()
+
+
+class TicketHistoryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.site = Site.objects.create(tenant=self.tenant, name="HQ", slug="hq")
+        self.admin = User.objects.create_user(username="admin", email="admin@acme.com", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.contractor = User.objects.create_user(username="fixer", email="fixer@acme.com", password="pass12345", role="CONTRACTOR", tenant=self.tenant)
+        self.client.force_authenticate(user=self.admin)
+        self.base = f"/api/{self.tenant.slug}/tickets/"
+
+    def _changes(self, ticket):
+        return list(TicketEvent.objects.filter(ticket=ticket).order_by("id").values_list("kind", "changes"))
+
+    def test_api_writes_are_recorded(self):
+        res = self.client.post(self.base, {"title": "Leak", "description": "Pipe", "priority": "HIGH", "site": self.site.id}, format="json")
+        self.assertEqual(res.status_code, 201, res.content)
+        ticket = Ticket.objects.get(pk=res.json()["id"])
+
+        self.client.patch(f"{self.base}{ticket.pk}/", {"priority": "URGENT", "description": "Burst pipe"}, format="json")
+        self.client.patch(f"{self.base}{ticket.pk}/", {"description": "Only untracked fields"}, format="json")
+        self.client.post(f"{self.base}{ticket.pk}/assign/", {"assignee_id": self.contractor.id}, format="json")
+
+        events = self._changes(ticket)
+        self.assertEqual(len(events), 3)
+        kind, created = events[0]
+        self.assertEqual(kind, "CREATED")
+        self.assertEqual(created["title"], [None, "Leak"])
+        self.assertEqual(created["site_id"], [None, self.site.id])
+        self.assertEqual(events[1], ("UPDATED", {"priority": ["HIGH", "URGENT"]}))
+        self.assertEqual(events[2], ("TRANSITION", {"status": ["OPEN", "ASSIGNED"], "assignee_id": [None, self.contractor.id]}))
+        self.assertEqual(set(TicketEvent.objects.values_list("actor_id", flat=True)), {self.admin.id})
+
+    def test_transitions_are_recorded(self):
+        ticket = Ticket.objects.create(title="Leak", description="d", tenant=self.tenant, created_by=self.admin)
+        ticket.assign_contractor(self.contractor, actor=self.admin)
+        ticket.start_work(actor=self.contractor)
+        self.assertEqual(self._changes(ticket), [
+            ("TRANSITION", {"status": ["OPEN", "ASSIGNED"], "assignee_id": [None, self.contractor.id]}),
+            ("TRANSITION", {"status": ["ASSIGNED", "IN_PROGRESS"]}),
+        ])
+
+        res = self.client.post(f"{self.base}transition/", {"transition": "resolve", "ids": [ticket.pk]}, format="json")
+        self.assertEqual(res.json()["updated"], [ticket.pk])
+        self.assertEqual(self._changes(ticket)[-1], ("TRANSITION", {"status": ["IN_PROGRESS", "RESOLVED"]}))
+
+        with self.assertRaises(ValueError):
+            TicketEvent.objects.first().save()
+
+    def test_timeline_is_keyset_paginated(self):
+        ticket = Ticket.objects.create(title="Leak", description="d", tenant=self.tenant, created_by=self.admin)
+        for i in range(5):
+            self.client.patch(f"{self.base}{ticket.pk}/", {"title": f"Leak {i}"}, format="json")
+        get_cached_tenant(self.tenant.slug)
+
+        titles, url = [], f"{self.base}{ticket.pk}/timeline/?page_size=2"
+        while url:
+            with self.assertNumQueries(2):  # the ticket, one page of events with their actor
+                body = self.client.get(url).json()
+            titles += [event["changes"]["title"][1] for event in body["results"]]
+            self.assertEqual({event["actor"] for event in body["results"]}, {"admin"})
+            url = body["next"]
+        self.assertEqual(titles, [f"Leak {i}" for i in range(5)])
+
+        self.client.force_authenticate(user=self.contractor)
+        self.assertEqual(self.client.get(f"{self.base}{ticket.pk}/timeline/").status_code, 404)
@@ -0,0 +1,102 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from tenants.models import Site, Tenant
+from tenants.utils import get_cached_tenant
+from tickets.models import Ticket
+from tickets.rollups import ticket_status_counts
+
+User = get_user_model()
+
+
+class TicketImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.site = Site.objects.create(tenant=self.tenant, name="Head Office", slug="hq")
+        self.admin = User.objects.create_user(username="admin", email="admin@acme.com", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.contractor = User.objects.create_user(username="fixer", email="fixer@acme.com", password="pass12345", role="CONTRACTOR", tenant=self.tenant)
+        self.client.force_authenticate(user=self.admin)
+        self.url = f"/api/{self.tenant.slug}/tickets/bulk/"
+
+    def _post(self, name, content, **data):
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post(self.url, {"file": upload, **data}, format="multipart")
+
+    def test_csv_import(self):
+        content = (
+            "﻿title,description,priority,site,assignee\n"
+            "Leak,Water on floor,HIGH,hq,fixer\n"
+            "Door,Hinge broken,LOW,Head Office,\n"
+            f"Light,Bulb out,,{self.site.id},fixer@acme.com\n"
+        )
+        res = self._post("tickets.csv", content)
+        self.assertEqual(res.status_code, 201, res.content)
+        self.assertEqual(res.json()["created"], 3)
+        self.assertEqual(res.json()["errors"], [])
+
+        leak = Ticket.objects.get(title="Leak")
+        self.assertEqual((leak.site_id, leak.assignee_id, leak.priority), (self.site.id, self.contractor.id, "HIGH"))
+        self.assertEqual(leak.created_by, self.admin)
+        self.assertEqual(Ticket.objects.get(title="Light").priority, Ticket.Priority.MEDIUM)
+        self.assertEqual(ticket_status_counts(self.tenant.id)[Ticket.Status.OPEN], 3)
+
+    def test_jsonl_reports_row_errors(self):
+        lines = [
+            json.dumps({"title": "Leak", "description": "d", "site": "hq"}),
+            json.dumps({"title": "No description"}),
+            "{not json",
+            json.dumps({"title": "Bad site", "description": "d", "site": "nowhere"}),
+            json.dumps({"title": "Admin assignee", "description": "d", "assignee": "admin"}),
+            json.dumps({"title": "Bad status", "description": "d", "status": "DONE"}),
+            json.dumps({"title": "Ok", "description": "d"}),
+        ]
+        res = self._post("tickets.jsonl", "\n".join(lines) + "\n", batch_size="3")
+        self.assertEqual(res.status_code, 201, res.content)
+        body = res.json()
+        self.assertEqual((body["rows"], body["created"], body["failed"]), (7, 2, 5))
+        errors = {e["row"]: e["errors"] for e in body["errors"]}
+        self.assertEqual(sorted(errors), [2, 3, 4, 5, 6])
+        self.assertIn("description", errors[2])
+        self.assertIn("site", errors[4])
+        self.assertIn("assignee", errors[5])
+        self.assertIn("status", errors[6])
+        self.assertEqual(set(Ticket.objects.values_list("title", flat=True)), {"Leak", "Ok"})
+
+    def test_dry_run_and_query_count(self):
+        get_cached_tenant(self.tenant.slug)
+        content = "title,description,site,assignee\n" + "".join(f"T{i},d,hq,fixer\n" for i in range(50))
+
+        res = self._post("tickets.csv", content, dry_run="true")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual((res.json()["valid"], res.json()["created"]), (50, 0))
+        self.assertFalse(Ticket.objects.exists())
+
+        self.assertEqual(self._post("tickets.csv", content).json()["created"], 50)
+
+        # Site and assignee are looked up once per import; each batch is one
+        # insert, one update per rollup bucket and one history insert, inside
+        # a savepoint.
+        with self.assertNumQueries(2 + 2 * (2 + 1 + 3 + 1)):
+            res = self._post("tickets.csv", content, batch_size="25")
+        self.assertEqual(res.json()["created"], 50)
+        self.assertEqual(ticket_status_counts(self.tenant.id)[Ticket.Status.OPEN], 100)
+
+    def test_non_ascii_digits_are_rejected_not_crashed_on(self):
+        res = self._post("tickets.csv", "title,description,site,assignee\nLeak,d,²,\nDrip,d,hq,²\n")
+        self.assertEqual(res.status_code, 200, res.content)
+        errors = {e["row"]: e["errors"] for e in res.json()["errors"]}
+        self.assertEqual((sorted(errors), list(errors[1]), list(errors[2])), ([1, 2], ["site"], ["assignee"]))
+
+        res = self._post("tickets.csv", "title,description\nLeak,d\n", batch_size="²")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("batch_size", res.json())
+
+    def test_requires_admin_and_known_format(self):
+        self.assertEqual(self._post("tickets.txt", "title\n").status_code, 400)
+        self.client.force_authenticate(user=self.contractor)
+        self.assertEqual(self._post("tickets.csv", "title\n").status_code, 403)
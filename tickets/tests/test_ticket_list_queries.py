@@ -0,0 +1,61 @@
+from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tenants.models import Tenant, Site
+from tenants.utils import get_cached_tenant
+from tickets.models import Ticket
+from assets.models import Asset
+
+User = get_user_model()
+
+# COUNT(*) for the paginator, the page itself (with assignee joined) and
+# one prefetch for the ticket assets.
+TICKET_LIST_QUERY_BUDGET = 3
+
+
+class TicketListQueryBudgetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.site = Site.objects.create(tenant=self.tenant, name="HQ", slug="hq")
+        self.admin = User.objects.create_user(username="admin", email="admin@acme.com", password="admin123", role="ADMIN", tenant=self.tenant)
+        contractors = [
+            User.objects.create_user(
+                username=f"contractor{i}", email=f"c{i}@acme.com", password="pass12345",
+                role="CONTRACTOR", tenant=self.tenant, company_name=f"Fixers {i}",
+            )
+            for i in range(5)
+        ]
+        for i in range(60):
+            ticket = Ticket.objects.create(
+                title=f"Ticket {i}",
+                description="Leaking pipe",
+                tenant=self.tenant,
+                created_by=self.admin,
+                assignee=contractors[i % len(contractors)],
+                site=self.site,
+            )
+            ticket.assets.add(Asset.objects.create(tenant=self.tenant, name=f"Pipe {i}", quantity=2))
+        self.client.force_authenticate(user=self.admin)
+        get_cached_tenant(self.tenant.slug)  # budget is for a warm tenant cache
+
+    def _list(self, page_size):
+        url = f"/api/{self.tenant.slug}/tickets/?page_size={page_size}"
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return res.json(), len(ctx.captured_queries)
+
+    def test_query_count_is_independent_of_page_size(self):
+        _, small = self._list(5)
+        _, large = self._list(50)
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, TICKET_LIST_QUERY_BUDGET)
+
+    def test_nested_fields_are_serialized(self):
+        data, _ = self._list(10)
+        first = data["results"][0]
+        self.assertEqual(len(first["assets"]), 1)
+        self.assertTrue(first["assignee"]["company_name"].startswith("Fixers"))
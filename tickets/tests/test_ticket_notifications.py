@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from notifications import registry
+from notifications.models import OutboxMessage
+from tenants.models import Tenant, Site
+from tickets.models import Ticket
+from tickets.notifications import ADMIN, CONTRACTOR, TicketMessageContext, send_ticket_status_update
+
+User = get_user_model()
+
+
+class TicketNotificationTemplateTests(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.site = Site.objects.create(tenant=self.tenant, name="HQ", slug="hq")
+        self.admin = User.objects.create_user(
+            username="admin", email="admin@acme.com", password="admin123", role="ADMIN",
+            tenant=self.tenant, phone_number="whatsapp:+100",
+        )
+        self.contractor = User.objects.create_user(
+            username="fixer", email="fixer@acme.com", password="pass12345", role="CONTRACTOR",
+            tenant=self.tenant, phone_number="whatsapp:+200", first_name="Fix", last_name="It",
+        )
+        self.ticket = Ticket.objects.create(
+            title="Leak", description="Pipe", tenant=self.tenant, site=self.site,
+            created_by=self.admin, assignee=self.contractor,
+        )
+
+    def test_renders_only_the_fields_it_uses(self):
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        with self.assertNumQueries(0):
+            text = registry.render(Ticket.Status.IN_PROGRESS, CONTRACTOR, TicketMessageContext(ticket))
+        self.assertEqual(text.splitlines()[0], "🚀 WORK STARTED - Leak")
+
+        with self.assertNumQueries(1):  # the assignee, for the name
+            text = registry.render(Ticket.Status.IN_PROGRESS, ADMIN, TicketMessageContext(ticket))
+        self.assertIn("Fix It has started working", text)
+
+    def test_templates_are_dedented(self):
+        text = registry.render(Ticket.Status.RESOLVED, CONTRACTOR, TicketMessageContext(self.ticket))
+        self.assertFalse(any(line.startswith(" ") for line in text.splitlines()))
+
+    def test_closed_ticket_notifies_contractor_and_admin(self):
+        self.ticket.status = Ticket.Status.CLOSED
+        self.ticket.contractor_rating = 4
+        self.ticket.save()
+        send_ticket_status_update(self.ticket, Ticket.Status.RESOLVED)
+
+        bodies = dict(OutboxMessage.objects.values_list("to", "body"))
+        self.assertIn("Rating: ⭐⭐⭐⭐", bodies["whatsapp:+200"])
+        self.assertIn("Contractor: Fix It", bodies["whatsapp:+100"])
@@ -0,0 +1,55 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tenants.models import Tenant
+from tickets.models import Ticket
+
+User = get_user_model()
+
+
+class TicketKeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.admin = User.objects.create_user(username="admin", email="admin@acme.com", password="admin123", role="ADMIN", tenant=self.tenant)
+        for i in range(7):
+            Ticket.objects.create(title=f"Ticket {i}", description="d", tenant=self.tenant, created_by=self.admin)
+        self.client.force_authenticate(user=self.admin)
+        self.url = f"/api/{self.tenant.slug}/tickets/"
+
+    def test_offset_pagination_is_default(self):
+        res = self.client.get(self.url, {"page_size": 3})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["count"], 7)
+
+    def test_cursor_pages_cover_all_tickets_without_count(self):
+        res = self.client.get(self.url, {"pagination": "cursor", "page_size": 3})
+        seen = []
+        while True:
+            self.assertEqual(res.status_code, 200)
+            body = res.json()
+            self.assertNotIn("count", body)
+            seen.extend(t["id"] for t in body["results"])
+            if not body["next"]:
+                break
+            res = self.client.get(body["next"])
+        expected = list(Ticket.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_cursor_is_stable_under_inserts(self):
+        res = self.client.get(self.url, {"pagination": "cursor", "page_size": 3})
+        first_page = [t["id"] for t in res.json()["results"]]
+        Ticket.objects.create(title="Newest", description="d", tenant=self.tenant, created_by=self.admin)
+        res = self.client.get(res.json()["next"])
+        second_page = [t["id"] for t in res.json()["results"]]
+        self.assertFalse(set(first_page) & set(second_page))
+        self.assertEqual(len(second_page), 3)
+
+    def test_invalid_cursor(self):
+        res = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(res.status_code, 404)
+
+    def test_users_stay_unpaginated_unless_opted_in(self):
+        url = f"/api/{self.tenant.slug}/accounts/users/"
+        self.assertIsInstance(self.client.get(url).json(), list)
+        self.assertIn("results", self.client.get(url, {"pagination": "cursor"}).json())
@@ -0,0 +1,53 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tenants.models import Tenant
+from tickets.models import Ticket
+from tickets.search import search_backend
+
+User = get_user_model()
+
+
+class TicketSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.admin = User.objects.create_user(username="admin", email="admin@acme.com", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.client.force_authenticate(user=self.admin)
+        self.url = f"/api/{self.tenant.slug}/tickets/"
+
+    def _create(self, title, description):
+        return Ticket.objects.create(title=title, description=description, tenant=self.tenant, created_by=self.admin)
+
+    def _search(self, query):
+        res = self.client.get(self.url, {"search": query})
+        self.assertEqual(res.status_code, 200)
+        return [t["id"] for t in res.json()["results"]]
+
+    def test_backend_is_installed(self):
+        self.assertEqual(search_backend(), "sqlite")
+
+    def test_prefix_match_on_title_and_description(self):
+        leak = self._create("Leaking pipe", "Water everywhere in the kitchen")
+        light = self._create("Broken light", "Kitchen bulb needs replacing")
+        self.assertEqual(set(self._search("kitch")), {leak.id, light.id})
+        self.assertEqual(self._search("leak"), [leak.id])
+        self.assertEqual(self._search("kitchen bulb"), [light.id])
+
+    def test_title_hits_rank_first(self):
+        in_description = self._create("Aircon service", "Check the generator too")
+        in_title = self._create("Generator fault", "Will not start")
+        self.assertEqual(self._search("generator"), [in_title.id, in_description.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        ticket = self._create("Door hinge", "Squeaks")
+        ticket.title = "Window latch"
+        ticket.save()
+        self.assertEqual(self._search("hinge"), [])
+        self.assertEqual(self._search("latch"), [ticket.id])
+        ticket.delete()
+        self.assertEqual(self._search("latch"), [])
+
+    def test_punctuation_only_query_falls_back_to_icontains(self):
+        ticket = self._create("Cost +/- 10%", "Estimate")
+        self.assertEqual(self._search("+/-"), [ticket.id])
@@ -0,0 +1,223 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tenants.models import Site, Tenant
+from tickets.models import Ticket
+from tickets.rollups import ticket_status_counts
+from tickets.transitions import EDGES, InvalidTransition, TransitionConflict, transition
+
+User = get_user_model()
+
+
+def _seed(test):
+    test.tenant = Tenant.objects.create(name="Acme", slug="acme")
+    test.site = Site.objects.create(tenant=test.tenant, name="HQ", slug="hq")
+    test.admin = User.objects.create_user(username="admin", email="admin@acme.com", password="admin123", role="ADMIN", tenant=test.tenant)
+    test.contractor = User.objects.create_user(username="fixer", email="fixer@acme.com", password="pass12345", role="CONTRACTOR", tenant=test.tenant)
+    test.ticket = Ticket.objects.create(
+        title="Leak", description="d", tenant=test.tenant, site=test.site, created_by=test.admin,
+        assignee=test.contractor, status=Ticket.Status.ASSIGNED,
+    )
+
+
+class TicketStateMachineTests(TestCase):
+    def setUp(self):
+        _seed(self)
+
+    def test_edges_cover_every_status(self):
+        self.assertEqual(set(EDGES), set(Ticket.Status.values))
+
+    def test_transition_writes_only_changed_columns(self):
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        Ticket.objects.filter(pk=ticket.pk).update(title="Renamed elsewhere")
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(transition(ticket, Ticket.Status.IN_PROGRESS), Ticket.Status.ASSIGNED)
+        [update] = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "tickets_ticket" ')]
+        assignments = update.split(" SET ")[1].split(" WHERE ")[0]
+        self.assertEqual(sorted(a.split(" = ")[0] for a in assignments.split(", ")), ['"started_at"', '"status"', '"updated_at"'])
+        self.assertIn('"status" = \'ASSIGNED\'', update.split(" WHERE ")[1])
+
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.title, "Renamed elsewhere")
+        self.assertEqual(ticket.status, Ticket.Status.IN_PROGRESS)
+        self.assertIsNotNone(ticket.started_at)
+        self.assertEqual(ticket_status_counts(self.tenant.id)[Ticket.Status.IN_PROGRESS], 1)
+
+    def test_resolving_unstarted_ticket_backfills_start(self):
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        self.assertIsNone(ticket.started_at)
+        transition(ticket, Ticket.Status.RESOLVED)
+        ticket.refresh_from_db()
+        self.assertIsNotNone(ticket.resolved_at)
+        self.assertEqual(ticket.started_at, ticket.resolved_at)
+
+        # A ticket that was started keeps its start time.
+        other = Ticket.objects.create(
+            title="Drip", description="d", tenant=self.tenant, site=self.site, created_by=self.admin,
+            assignee=self.contractor, status=Ticket.Status.ASSIGNED,
+        )
+        other.start_work()
+        started_at = other.started_at
+        other.mark_resolved()
+        other.refresh_from_db()
+        self.assertEqual(other.started_at, started_at)
+        self.assertGreater(other.resolved_at, started_at)
+
+    def test_invalid_and_conflicting_transitions(self):
+        with self.assertRaises(InvalidTransition):
+            transition(self.ticket, Ticket.Status.CLOSED)
+
+        stale = Ticket.objects.get(pk=self.ticket.pk)
+        self.ticket.start_work()
+        with self.assertRaises(TransitionConflict) as ctx:
+            stale.mark_resolved()
+        self.assertEqual(ctx.exception.actual, Ticket.Status.IN_PROGRESS)
+        self.assertEqual(Ticket.objects.get(pk=self.ticket.pk).status, Ticket.Status.IN_PROGRESS)
+        self.assertEqual(ticket_status_counts(self.tenant.id)[Ticket.Status.RESOLVED], 0)
+
+    def test_transition_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        url = f"/api/{self.tenant.slug}/tickets/{self.ticket.pk}/transition/"
+
+        res = client.post(url, {"transition": "close"}, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.json()["status"], Ticket.Status.ASSIGNED)
+
+        res = client.post(url, {"transition": "start", "expected_status": "OPEN"}, format="json")
+        self.assertEqual(res.status_code, 409)
+        self.assertEqual(res.json()["status"], Ticket.Status.ASSIGNED)
+
+        res = client.post(url, {"transition": "resolve", "expected_status": "ASSIGNED"}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["status"], Ticket.Status.RESOLVED)
+
+        for rating in ("²", "6", "four"):
+            with self.subTest(rating=rating):
+                res = client.post(url, {"transition": "close", "rating": rating}, format="json")
+                self.assertEqual(res.status_code, 400)
+                self.assertIn("rating", res.json())
+
+        res = client.post(url, {"transition": "close", "rating": 4, "feedback": "Quick"}, format="json")
+        self.assertEqual(res.status_code, 200)
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        self.assertEqual((ticket.status, ticket.contractor_rating, ticket.contractor_feedback), ("CLOSED", 4, "Quick"))
+
+    def test_full_lifecycle_through_the_api(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        base = f"/api/{self.tenant.slug}/tickets/"
+        res = client.post(base, {"title": "Drip", "description": "d", "site": self.site.id}, format="json")
+        self.assertEqual(res.status_code, 201, res.content)
+        url = f"{base}{res.json()['id']}/"
+
+        other = User.objects.create_user(username="other", email="other@acme.com", password="pass12345", role="CONTRACTOR")
+        for assignee_id in (self.admin.id, other.id, "x"):
+            with self.subTest(assignee_id=assignee_id):
+                res = client.post(f"{url}assign/", {"assignee_id": assignee_id}, format="json")
+                self.assertEqual(res.status_code, 400)
+                self.assertIn("assignee_id", res.json())
+
+        res = client.post(f"{url}assign/", {"assignee_id": self.contractor.id}, format="json")
+        self.assertEqual(res.status_code, 200, res.content)
+        self.assertEqual(res.json()["status"], Ticket.Status.ASSIGNED)
+        for name, expected in (("start", "IN_PROGRESS"), ("resolve", "RESOLVED"), ("close", "CLOSED")):
+            res = client.post(f"{url}transition/", {"transition": name}, format="json")
+            self.assertEqual(res.status_code, 200, res.content)
+            self.assertEqual(res.json()["status"], expected)
+
+        ticket = Ticket.objects.get(pk=res.json()["id"])
+        self.assertEqual(ticket.assignee_id, self.contractor.id)
+        self.assertTrue(all((ticket.assigned_at, ticket.started_at, ticket.resolved_at, ticket.closed_at)))
+        res = client.post(f"{url}assign/", {"assignee_id": self.contractor.id}, format="json")
+        self.assertEqual(res.status_code, 400)
+
+    def test_update_cannot_bypass_transitions(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        url = f"/api/{self.tenant.slug}/tickets/{self.ticket.pk}/"
+
+        res = client.patch(url, {"status": "CLOSED"}, format="json")
+        self.assertEqual(res.status_code, 400)
+        res = client.patch(url, {"status": "OPEN"}, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(Ticket.objects.get(pk=self.ticket.pk).status, Ticket.Status.ASSIGNED)
+
+        client.force_authenticate(user=self.contractor)
+        res = client.patch(url, {"title": "Big leak", "status": "RESOLVED"}, format="json")
+        self.assertEqual(res.status_code, 200, res.content)
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        self.assertEqual((ticket.title, ticket.status), ("Big leak", Ticket.Status.RESOLVED))
+        self.assertIsNotNone(ticket.started_at)
+        self.assertIsNotNone(ticket.resolved_at)
+        self.assertEqual(ticket_status_counts(self.tenant.id)[Ticket.Status.RESOLVED], 1)
+
+        res = client.patch(url, {"status": "CLOSED"}, format="json")
+        self.assertEqual(res.status_code, 403)
+
+    def test_update_keeps_concurrent_transition(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        original = Ticket.from_db
+        moved = []
+
+        def stale(cls, db, field_names, values):
+            instance = original.__func__(cls, db, field_names, values)
+            if instance.pk == self.ticket.pk and not moved:
+                moved.append(instance.pk)
+                transition(Ticket.objects.get(pk=self.ticket.pk), Ticket.Status.IN_PROGRESS)
+            return instance
+
+        with mock.patch.object(Ticket, "from_db", classmethod(stale)):
+            res = client.patch(f"/api/{self.tenant.slug}/tickets/{self.ticket.pk}/", {"title": "Big leak"}, format="json")
+        self.assertEqual(res.status_code, 200, res.content)
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        self.assertEqual((ticket.title, ticket.status), ("Big leak", Ticket.Status.IN_PROGRESS))
+        counts = ticket_status_counts(self.tenant.id)
+        self.assertEqual((counts[Ticket.Status.ASSIGNED], counts[Ticket.Status.IN_PROGRESS]), (0, 1))
+
+
+class ConcurrentTransitionTests(TransactionTestCase):
+    def setUp(self):
+        _seed(self)
+
+    def test_only_one_concurrent_transition_wins(self):
+        workers = 8
+        barrier = threading.Barrier(workers)
+
+        def attempt(_):
+            ticket = Ticket.objects.get(pk=self.ticket.pk)
+            barrier.wait()
+            try:
+                while True:
+                    try:
+                        ticket.start_work()
+                        return "ok"
+                    except TransitionConflict:
+                        return "conflict"
+                    except OperationalError as exc:
+                        # The shared-cache in-memory SQLite test database
+                        # reports lock contention instead of waiting for it.
+                        if "locked" not in str(exc):
+                            raise
+                        time.sleep(0.001)
+            finally:
+                connection.close()
+
+        for _ in range(5):
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(attempt, range(workers)))
+            self.assertEqual(outcomes.count("ok"), 1, outcomes)
+            self.assertEqual(outcomes.count("conflict"), workers - 1, outcomes)
+            self.assertEqual(ticket_status_counts(self.tenant.id)[Ticket.Status.IN_PROGRESS], 1)
+            Ticket.objects.get(pk=self.ticket.pk).assign_contractor(self.contractor)
+            self.assertEqual(ticket_status_counts(self.tenant.id)[Ticket.Status.ASSIGNED], 1)
@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from notifications.models import OutboxMessage
+from tenants.models import Site, Tenant
+from tenants.utils import get_cached_tenant
+from tickets.models import Ticket
+from tickets.rollups import ticket_status_counts
+
+User = get_user_model()
+
+
+class BulkTransitionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.site = Site.objects.create(tenant=self.tenant, name="HQ", slug="hq")
+        self.admin = User.objects.create_user(
+            username="admin", email="admin@acme.com", password="admin123", role="ADMIN",
+            tenant=self.tenant, phone_number="whatsapp:+100",
+        )
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@acme.com", password="owner123", role="ADMIN",
+            tenant=self.tenant, phone_number="whatsapp:+300", is_superuser=True,
+        )
+        self.contractors = [
+            User.objects.create_user(
+                username=f"fixer{i}", email=f"fixer{i}@acme.com", password="pass12345", role="CONTRACTOR",
+                tenant=self.tenant, phone_number=f"whatsapp:+20{i}",
+            )
+            for i in range(2)
+        ]
+        self.client.force_authenticate(user=self.admin)
+        self.url = f"/api/{self.tenant.slug}/tickets/transition/"
+
+    def _tickets(self, n, status, **kwargs):
+        return [
+            Ticket.objects.create(
+                title=f"Ticket {i}", description="d", tenant=self.tenant, site=self.site, created_by=self.admin,
+                assignee=self.contractors[i % 2], status=status, **kwargs,
+            )
+            for i in range(n)
+        ]
+
+    def test_close_resolved_tickets(self):
+        resolved = self._tickets(6, Ticket.Status.RESOLVED)
+        open_ticket = self._tickets(1, Ticket.Status.OPEN)[0]
+        ids = [t.id for t in resolved] + [open_ticket.id, 999999]
+
+        res = self.client.post(self.url, {"transition": "close", "ids": ids}, format="json")
+        self.assertEqual(res.status_code, 200, res.content)
+        self.assertEqual(res.json()["updated"], [t.id for t in resolved])
+        self.assertEqual(res.json()["skipped"], [
+            {"id": open_ticket.id, "reason": "status is OPEN"},
+            {"id": 999999, "reason": "not_found"},
+        ])
+
+        closed = Ticket.objects.filter(status=Ticket.Status.CLOSED)
+        self.assertEqual(closed.count(), 6)
+        self.assertFalse(closed.filter(closed_at__isnull=True).exists())
+        counts = ticket_status_counts(self.tenant.id)
+        self.assertEqual((counts["CLOSED"], counts["RESOLVED"], counts["OPEN"]), (6, 0, 1))
+
+        # One summary per recipient: two contractors, the creator, the other admin.
+        bodies = dict(OutboxMessage.objects.values_list("to", "body"))
+        self.assertEqual(len(bodies), 4)
+        self.assertTrue(bodies["whatsapp:+200"].startswith("📋 3 of your tickets are now Closed"))
+        self.assertIn(f"#{resolved[0].id} Ticket 0 (HQ)", bodies["whatsapp:+200"])
+        self.assertTrue(bodies["whatsapp:+100"].startswith("📋 6 tickets are now Closed"))
+        self.assertTrue(bodies["whatsapp:+300"].startswith("📋 6 tickets are now Closed"))
+
+        # Repeating the request changes nothing and queues nothing.
+        res = self.client.post(self.url, {"transition": "close", "ids": ids}, format="json")
+        self.assertEqual(res.json()["updated"], [])
+        self.assertEqual(OutboxMessage.objects.count(), 4)
+
+    def test_resolve_backfills_start_and_query_count(self):
+        get_cached_tenant(self.tenant.slug)
+        self._tickets(2, Ticket.Status.RESOLVED)  # the RESOLVED counter buckets exist
+        tickets = self._tickets(40, Ticket.Status.ASSIGNED)
+        # lock/read, UPDATE, read back, one counter UPDATE per bucket moved
+        # (tenant, site and two assignees, out of and into), one history and
+        # one outbox INSERT, and the savepoint around it all.
+        with self.assertNumQueries(3 + 8 + 2 + 2):
+            res = self.client.post(self.url, {"transition": "resolve", "ids": [t.id for t in tickets]}, format="json")
+        self.assertEqual(len(res.json()["updated"]), 40)
+        moved = Ticket.objects.filter(id__in=[t.id for t in tickets])
+        self.assertFalse(moved.filter(started_at__isnull=True).exists())
+        self.assertFalse(moved.exclude(status=Ticket.Status.RESOLVED).exists())
+        self.assertEqual(ticket_status_counts(self.tenant.id)["RESOLVED"], 42)
+
+    def test_roles_and_scoping(self):
+        mine = self._tickets(2, Ticket.Status.ASSIGNED)
+        self.client.force_authenticate(user=self.contractors[0])
+        res = self.client.post(self.url, {"transition": "close", "ids": [mine[0].id]}, format="json")
+        self.assertEqual(res.status_code, 403)
+
+        res = self.client.post(self.url, {"transition": "start", "ids": [t.id for t in mine]}, format="json")
+        self.assertEqual(res.json()["updated"], [mine[0].id])
+        self.assertEqual(res.json()["skipped"], [{"id": mine[1].id, "reason": "not_found"}])
+
+        self.assertEqual(self.client.post(self.url, {"transition": "reopen", "ids": [1]}, format="json").status_code, 400)
+        self.assertEqual(self.client.post(self.url, {"transition": "start", "ids": "1,2"}, format="json").status_code, 400)
@@ -0,0 +1,200 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tenants.models import Site, Tenant
+from tickets import uploads
+from tickets.models import Ticket, TicketEvent, UploadSession
+
+User = get_user_model()
+
+CONTENT = bytes(range(256)) * 10  # 2560 bytes
+
+
+class RecordingStream(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.largest_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.largest_read = max(self.largest_read, len(data))
+        return data
+
+
+class ChunkedUploadTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        self.parts = os.path.join(self.media, "parts")
+        overrides = override_settings(
+            MEDIA_ROOT=os.path.join(self.media, "media"), TICKET_UPLOAD_DIR=self.parts,
+            TICKET_UPLOAD_MAX_CHUNK=1024, TICKET_UPLOAD_MAX_SIZE=4096,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        self.site = Site.objects.create(tenant=self.tenant, name="HQ", slug="hq")
+        self.admin = User.objects.create_user(username="admin", email="admin@acme.com", password="admin123", role="ADMIN", tenant=self.tenant)
+        self.ticket = Ticket.objects.create(title="Leak", description="d", tenant=self.tenant, site=self.site, created_by=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.base = f"/api/acme/tickets/{self.ticket.pk}/uploads/"
+
+    def _start(self, **data):
+        payload = {"field": "job_card", "filename": "card.pdf", "size": len(CONTENT), **data}
+        response = self.client.post(self.base, payload, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return f"{self.base}{response.data['id']}/"
+
+    def _put(self, url, start, end, **extra):
+        return self.client.put(
+            url, CONTENT[start:end], content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {start}-{end - 1}/{len(CONTENT)}", **extra,
+        )
+
+    def test_chunks_are_assembled_and_attached(self):
+        url = self._start()
+        for start in range(0, len(CONTENT), 1024):
+            response = self._put(url, start, min(start + 1024, len(CONTENT)))
+            self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["received"], len(CONTENT))
+
+        response = self.client.post(f"{url}complete/")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.ticket.refresh_from_db()
+        self.assertTrue(self.ticket.job_card.name.endswith("card.pdf"))
+        with self.ticket.job_card.open("rb") as fp:
+            self.assertEqual(fp.read(), CONTENT)
+        self.assertEqual(os.listdir(self.parts), [])
+        event = TicketEvent.objects.get(ticket=self.ticket, kind=TicketEvent.Kind.UPDATED)
+        self.assertEqual(event.changes["job_card"][0], None)
+        # A completed session is gone for good.
+        self.assertEqual(self.client.post(f"{url}complete/").status_code, 404)
+
+    def test_resume_after_interrupted_chunks(self):
+        url = self._start()
+        self._put(url, 0, 1000)
+        # Ahead of what is stored: told where to resume.
+        response = self._put(url, 1024, 2048)
+        self.assertEqual((response.status_code, response.data["received"]), (409, 1000))
+        self.assertEqual(self.client.get(url).data["received"], 1000)
+        # Resent and overlapping chunks only add the missing bytes.
+        self.assertEqual(self._put(url, 0, 1000).data["received"], 1000)
+        self.assertEqual(self._put(url, 500, 1500).data["received"], 1500)
+        self.assertEqual(self._put(url, 1500, 2500).data["received"], 2500)
+        self.assertEqual(self._put(url, 2500, len(CONTENT)).data["received"], len(CONTENT))
+        self.assertEqual(self.client.post(f"{url}complete/").status_code, 200)
+        self.ticket.refresh_from_db()
+        with self.ticket.job_card.open("rb") as fp:
+            self.assertEqual(fp.read(), CONTENT)
+
+    def test_offset_query_parameter(self):
+        url = self._start(size=10)
+        for offset in ("²", "-1"):
+            with self.subTest(offset=offset):
+                response = self.client.put(f"{url}?offset={offset}", CONTENT[:10], content_type="application/octet-stream")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("offset", response.data)
+        response = self.client.put(f"{url}?offset=0", CONTENT[:10], content_type="application/octet-stream")
+        self.assertEqual(response.data["received"], 10)
+
+    def test_incomplete_or_corrupt_uploads_are_not_attached(self):
+        url = self._start()
+        self._put(url, 0, 1024)
+        response = self.client.post(f"{url}complete/")
+        self.assertEqual((response.status_code, response.data["received"]), (409, 1024))
+
+        url = self._start(sha256=hashlib.sha256(b"something else").hexdigest())
+        for start in range(0, len(CONTENT), 1024):
+            self._put(url, start, min(start + 1024, len(CONTENT)))
+        self.assertEqual(self.client.post(f"{url}complete/").status_code, 400)
+        self.ticket.refresh_from_db()
+        self.assertFalse(self.ticket.job_card)
+
+    def test_checksum_is_verified(self):
+        url = self._start(field="invoice", sha256=hashlib.sha256(CONTENT).hexdigest())
+        for start in range(0, len(CONTENT), 1024):
+            self._put(url, start, min(start + 1024, len(CONTENT)))
+        self.assertEqual(self.client.post(f"{url}complete/").status_code, 200)
+        self.ticket.refresh_from_db()
+        self.assertTrue(self.ticket.invoice)
+
+    def test_limits(self):
+        response = self.client.post(self.base, {"field": "job_card", "filename": "x.pdf", "size": 5000}, format="json")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(self.base, {"field": "photo", "filename": "x.pdf", "size": 10}, format="json")
+        self.assertEqual(response.status_code, 400)
+        url = self._start(size=4096)
+        response = self.client.put(
+            url, b"x" * 2048, content_type="application/octet-stream", HTTP_CONTENT_RANGE="bytes 0-2047/4096"
+        )
+        self.assertEqual(response.status_code, 413)
+        response = self.client.put(
+            url, b"x" * 10, content_type="application/octet-stream", HTTP_CONTENT_RANGE="bytes 0-19/4096"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_contractors_cannot_upload(self):
+        contractor = User.objects.create_user(username="fixer", email="fixer@acme.com", password="pass12345", role="CONTRACTOR", tenant=self.tenant)
+        self.ticket.assignee = contractor
+        self.ticket.save()
+        self.client.force_authenticate(contractor)
+        response = self.client.post(self.base, {"field": "invoice", "filename": "x.pdf", "size": 10}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_malformed_upload_ids_are_not_found(self):
+        url = self._start()
+        upload_id = url.rstrip("/").rsplit("/", 1)[1]
+        for bad in (upload_id.replace("-", "") + "0", upload_id[:-1], upload_id.replace("-", "")):
+            with self.subTest(upload_id=bad):
+                self.assertEqual(self.client.get(f"{self.base}{bad}/").status_code, 404)
+
+    def test_abort_removes_session_and_part(self):
+        url = self._start()
+        self._put(url, 0, 100)
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(self.parts), [])
+
+    def test_chunks_are_streamed_in_blocks(self):
+        session = uploads.start(self.ticket, "job_card", "card.pdf", len(CONTENT))
+        stream = RecordingStream(CONTENT)
+        with self.settings(TICKET_UPLOAD_MAX_CHUNK=len(CONTENT)), mock.patch.object(uploads, "BLOCK_SIZE", 256):
+            self.assertEqual(uploads.write_chunk(session, 0, stream, len(CONTENT)), len(CONTENT))
+        self.assertEqual(stream.largest_read, 256)
+
+    def test_whole_file_endpoints_still_work(self):
+        response = self.client.post(
+            f"/api/acme/tickets/{self.ticket.pk}/job-card/", {"file": SimpleUploadedFile("card.pdf", CONTENT)},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.ticket.refresh_from_db()
+        self.assertTrue(self.ticket.job_card.name.endswith(".pdf"))
+
+    def test_purge_expired_sessions(self):
+        url = self._start()
+        self._put(url, 0, 100)
+        self._start()
+        UploadSession.objects.filter(pk=url.rstrip("/").rsplit("/", 1)[1]).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        out = io.StringIO()
+        call_command("purge_upload_sessions", stdout=out)
+        self.assertIn("Purged 1 upload sessions", out.getvalue())
+        self.assertEqual(UploadSession.objects.count(), 1)
+        self.assertEqual(len(os.listdir(self.parts)), 1)
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,207 @@
+"""
+Ticket status transitions.
+
+EDGES declares which status changes are allowed. A single ticket moves with
+`transition()`, one conditional `UPDATE ... WHERE id = ? AND status = ?`
+writing only the changed columns; when another request changed the status
+first, no row matches and TransitionConflict is raised instead of silently
+overwriting the other change.
+
+`bulk_transition()` applies one transition to many tickets: they are locked
+and read once, moved with a single
+`UPDATE ... WHERE id IN (...) AND status IN (<allowed sources>)` that sets
+the timestamps with the database clock, and read back once for the rollups
+and notifications. Recipients get one summary message per transition
+instead of one message per ticket.
+"""
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce, Now
+from django.utils import timezone
+
+from . import history
+from .models import Ticket, TicketEvent
+from .notifications import send_bulk_status_summary
+from .rollups import apply_ticket_changes
+
+Status = Ticket.Status
+
+# Allowed status changes: source -> targets. Assigning again reassigns.
+EDGES = {
+    Status.OPEN: frozenset({Status.ASSIGNED}),
+    Status.ASSIGNED: frozenset({Status.ASSIGNED, Status.IN_PROGRESS, Status.RESOLVED}),
+    Status.IN_PROGRESS: frozenset({Status.ASSIGNED, Status.RESOLVED}),
+    Status.RESOLVED: frozenset({Status.CLOSED}),
+    Status.CLOSED: frozenset(),
+}
+
+# Timestamp recorded when a ticket enters a status
+TIMESTAMPS = {
+    Status.ASSIGNED: "assigned_at",
+    Status.IN_PROGRESS: "started_at",
+    Status.RESOLVED: "resolved_at",
+    Status.CLOSED: "closed_at",
+}
+
+# Timestamps of skipped steps, filled in when a ticket enters a status,
+# e.g. resolving a ticket that was never started.
+BACKFILL = {
+    Status.RESOLVED: (TIMESTAMPS[Status.IN_PROGRESS],),
+}
+
+
+def sources(target):
+    return frozenset(source for source, targets in EDGES.items() if target in targets)
+
+
+class InvalidTransition(ValueError):
+    def __init__(self, source, target):
+        self.source, self.target = source, target
+        super().__init__(f"Cannot move a ticket from {source} to {target}")
+
+
+class TransitionConflict(Exception):
+    """The ticket left the expected status before the update ran."""
+
+    def __init__(self, ticket_id, expected, actual):
+        self.ticket_id, self.expected, self.actual = ticket_id, expected, actual
+        if actual is None:
+            message = f"Ticket {ticket_id} no longer exists"
+        else:
+            message = f"Ticket {ticket_id} is {actual}, expected {expected}"
+        super().__init__(message)
+
+
+def transition(ticket, target, expected=None, actor=None, **changes):
+    """
+    Move `ticket` to `target`, also writing `changes` (field -> value) and
+    the target's timestamp, provided it is still in `expected` status
+    (default: the status it was loaded with). Only the changed columns are
+    written, and a TicketEvent by `actor` records them. Returns the previous
+    status; the instance is updated in place.
+    """
+    source = expected or ticket.status
+    if target not in EDGES.get(source, ()):
+        raise InvalidTransition(source, target)
+
+    now = timezone.now()
+    values = {"status": target, "updated_at": now, **changes}
+    if target in TIMESTAMPS:
+        values.setdefault(TIMESTAMPS[target], now)
+    for name in BACKFILL.get(target, ()):
+        if getattr(ticket, name) is None:
+            values.setdefault(name, now)
+    columns = {ticket._meta.get_field(name).attname: value for name, value in values.items()}
+    columns = {attname: getattr(value, "pk", value) for attname, value in columns.items()}
+
+    with transaction.atomic():
+        if not Ticket.objects.filter(pk=ticket.pk, status=source).update(**columns):
+            actual = Ticket.objects.filter(pk=ticket.pk).values_list("status", flat=True).first()
+            raise TransitionConflict(ticket.pk, source, actual)
+        before = {**ticket.loaded_tracked_values(), "status": source}
+        after = {**before, **{name: value for name, value in columns.items() if name in before}}
+        apply_ticket_changes([(before, after)])
+        history_before = {**history.loaded_snapshot(ticket), "status": source}
+        history_after = {**history_before, **{name: value for name, value in columns.items() if name in history_before}}
+        history.record([history.event(ticket, TicketEvent.Kind.TRANSITION, history_before, history_after, actor, at=now)])
+    # Only touch the instance once the change is in.
+    for name, value in values.items():
+        setattr(ticket, name, value)
+    ticket._loaded_values = {**getattr(ticket, "_loaded_values", {}), **after}
+    return source
+
+
+@dataclass(frozen=True)
+class Transition:
+    target: str
+    sources: frozenset
+    timestamp: str
+    roles: frozenset
+    backfill: tuple = ()
+
+    def update_values(self):
+        values = {"status": self.target, self.timestamp: Now(), "updated_at": Now()}
+        for name in self.backfill:
+            values[name] = Coalesce(F(name), Now())
+        return values
+
+
+TRANSITIONS = {
+    "start": Transition(
+        Status.IN_PROGRESS, sources(Status.IN_PROGRESS), TIMESTAMPS[Status.IN_PROGRESS],
+        roles=frozenset({"ADMIN", "CONTRACTOR"}),
+    ),
+    "resolve": Transition(
+        Status.RESOLVED, sources(Status.RESOLVED), TIMESTAMPS[Status.RESOLVED],
+        roles=frozenset({"ADMIN", "CONTRACTOR"}), backfill=BACKFILL[Status.RESOLVED],
+    ),
+    "close": Transition(
+        Status.CLOSED, sources(Status.CLOSED), TIMESTAMPS[Status.CLOSED],
+        roles=frozenset({"ADMIN", "SITE_MANAGER"}),
+    ),
+}
+
+
+@dataclass
+class TransitionResult:
+    transition: str
+    updated: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)  # [{"id": ..., "reason": ...}]
+
+    def as_dict(self):
+        return {"transition": self.transition, "updated": self.updated, "skipped": self.skipped}
+
+
+def bulk_transition(queryset, name, ids, actor=None):
+    """
+    Apply transition `name` to the tickets of `queryset` with the given ids.
+    Tickets outside `queryset` or not in one of the transition's source
+    statuses are skipped and reported.
+    """
+    transition = TRANSITIONS[name]
+    ids = list(dict.fromkeys(ids))
+    result = TransitionResult(name)
+
+    with transaction.atomic():
+        before = {
+            row["id"]: row
+            for row in queryset.filter(id__in=ids)
+            .select_for_update(of=("self",))
+            .order_by("id")
+            .values("id", *dict.fromkeys(Ticket.TRACKED_FIELDS + history.HISTORY_FIELDS))
+        }
+        eligible = []
+        for ticket_id in ids:
+            row = before.get(ticket_id)
+            if row is None:
+                result.skipped.append({"id": ticket_id, "reason": "not_found"})
+            elif row["status"] not in transition.sources:
+                result.skipped.append({"id": ticket_id, "reason": f"status is {row['status']}"})
+            else:
+                eligible.append(ticket_id)
+        if not eligible:
+            return result
+
+        Ticket.objects.filter(id__in=eligible, status__in=transition.sources).update(**transition.update_values())
+
+        tickets = list(
+            Ticket.objects.filter(id__in=eligible, status=transition.target)
+            .select_related("tenant", "site", "assignee", "created_by")
+            .order_by("id")
+        )
+        apply_ticket_changes([
+            ({attr: before[ticket.id][attr] for attr in Ticket.TRACKED_FIELDS}, ticket.tracked_values())
+            for ticket in tickets
+        ])
+        history.record(
+            history.event(
+                ticket, TicketEvent.Kind.TRANSITION,
+                history.row_snapshot(before[ticket.id]), history.snapshot(ticket), actor,
+            )
+            for ticket in tickets
+        )
+        send_bulk_status_summary(tickets, transition.target)
+        result.updated = [ticket.id for ticket in tickets]
+    return result
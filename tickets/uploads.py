@@ -0,0 +1,153 @@
+"""
+Chunked, resumable uploads of job cards and invoices.
+
+A client starts an UploadSession for a file of known size, PUTs chunks at
+byte offsets and completes the session, which attaches the file to the
+ticket. Each chunk is streamed from the request into the session's part
+file in BLOCK_SIZE blocks, so neither a chunk nor the file is ever held in
+memory. A client whose connection dropped asks for the session's offset
+and resends from there; resending bytes that are already stored is a no-op.
+
+On completion the part file is handed to storage as a temporary file:
+FileSystemStorage moves it into place, other storages stream it.
+"""
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import UploadSession
+
+BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(ValueError):
+    pass
+
+
+class OffsetMismatch(Exception):
+    """A chunk does not start within the stored prefix; resume from `offset`."""
+
+    def __init__(self, offset):
+        self.offset = offset
+        super().__init__(f"Upload continues at offset {offset}")
+
+
+class PartFile(File):
+    """An assembled part file, moved rather than copied by FileSystemStorage."""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def part_path(session):
+    return os.path.join(settings.TICKET_UPLOAD_DIR, f"{session.pk.hex}.part")
+
+
+def start(ticket, field, filename, size, user=None, sha256=""):
+    if size > settings.TICKET_UPLOAD_MAX_SIZE:
+        raise UploadError(f"Files are limited to {settings.TICKET_UPLOAD_MAX_SIZE} bytes")
+    session = UploadSession.objects.create(
+        tenant_id=ticket.tenant_id,
+        ticket=ticket,
+        created_by=user,
+        field=field,
+        filename=os.path.basename(filename),
+        size=size,
+        sha256=sha256.lower(),
+        expires_at=timezone.now() + timedelta(hours=settings.TICKET_UPLOAD_TTL_HOURS),
+    )
+    os.makedirs(settings.TICKET_UPLOAD_DIR, exist_ok=True)
+    open(part_path(session), "wb").close()
+    return session
+
+
+def write_chunk(session, offset, stream, length):
+    """
+    Store `length` bytes read from `stream` as the file's bytes at
+    `offset`. Returns the new offset, which falls short of offset + length
+    when the stream ends early; the bytes that did arrive are kept.
+    """
+    if session.completed_at is not None:
+        raise UploadError("Upload is already complete")
+    if length > settings.TICKET_UPLOAD_MAX_CHUNK:
+        raise UploadError(f"Chunks are limited to {settings.TICKET_UPLOAD_MAX_CHUNK} bytes")
+    if offset + length > session.size:
+        raise UploadError(f"Chunk ends past the declared size of {session.size} bytes")
+    received = session.received
+    if offset > received:
+        raise OffsetMismatch(received)
+
+    # Skip what is already stored, e.g. a chunk resent after a lost response.
+    skip = received - offset
+    while skip:
+        data = stream.read(min(BLOCK_SIZE, skip))
+        if not data:
+            return received
+        skip -= len(data)
+
+    remaining = max(0, offset + length - received)
+    written = 0
+    with open(part_path(session), "r+b") as part:
+        part.seek(received)
+        while remaining:
+            data = stream.read(min(BLOCK_SIZE, remaining))
+            if not data:
+                break
+            part.write(data)
+            written += len(data)
+            remaining -= len(data)
+
+    if written and not UploadSession.objects.filter(pk=session.pk, received=received).update(
+        received=received + written
+    ):
+        raise OffsetMismatch(UploadSession.objects.values_list("received", flat=True).get(pk=session.pk))
+    session.received = received + written
+    return session.received
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for block in iter(lambda: fp.read(BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def complete(session, attach):
+    """
+    Check the upload is whole, then call `attach(file)` with the assembled
+    file inside the transaction that marks the session complete.
+    """
+    if session.completed_at is not None:
+        raise UploadError("Upload is already complete")
+    if session.received != session.size:
+        raise OffsetMismatch(session.received)
+    path = part_path(session)
+    if not os.path.exists(path):
+        raise UploadError("Upload data is missing; the upload has to be restarted")
+    # Bytes past `received` are leftovers of an interrupted chunk.
+    os.truncate(path, session.size)
+    if session.sha256 and _sha256(path) != session.sha256:
+        raise UploadError("Checksum mismatch; the upload has to be restarted")
+
+    now = timezone.now()
+    with transaction.atomic():
+        if not UploadSession.objects.filter(pk=session.pk, completed_at__isnull=True).update(completed_at=now):
+            raise UploadError("Upload is already complete")
+        with open(path, "rb") as fp:
+            attach(PartFile(fp, name=session.filename))
+    session.completed_at = now
+    discard(session)
+
+
+def discard(session):
+    """Remove the session's part file, if it is still there."""
+    try:
+        os.remove(part_path(session))
+    except FileNotFoundError:
+        pass
@@ -1,38 +1,70 @@
-from rest_framework import viewsets, permissions, exceptions, status, filters
+from rest_framework import viewsets, permissions, exceptions, serializers, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from django.conf import settings
-from django.db.models import Q
-from .models import Ticket
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from .models import Ticket, TicketCounter, TicketEvent, UploadSession
+from . import history, uploads
 from assets.models import Asset
 from tickets.serializers import *
 from assets.serializers import AssetSerializer
-from notifications.twilio_service import send_whatsapp
-from django.db.models import Count
+from notifications.outbox import enqueue
 from loguru import logger
 import os
-from .helpers.url_builder import get_ticket_url
+import re
+from .notifications import BROADCAST, CREATED, UPDATED, render_ticket_message
+from .helpers.prefetch import eager_load
+from tenants.utils import check_tenant_access
+from .pagination import StandardResultsSetPagination, TicketPagination, TimelinePagination
+from .search import SearchRankOrderingFilter, search_tickets
+from .rollups import ticket_status_counts
+from .importer import ImportFormatError, TicketImporter, detect_format, iter_rows
+from .transitions import TRANSITIONS, InvalidTransition, TransitionConflict, bulk_transition
+from .exporter import FORMATS as EXPORT_FORMATS, export_rows, filter_dates, stream_export
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+User = get_user_model()
+
+# Ticket document fields and how error messages name them
+DOCUMENTS = {"job_card": "a job card", "invoice": "an invoice"}
+
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+UPLOAD_ID = r"(?P<upload_id>[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})"
+
+def int_param(value, name, **bounds):
+    """`value` as an int within `bounds` (min_value, max_value); a 400 naming `name` otherwise."""
+    try:
+        return serializers.IntegerField(**bounds).run_validation(value)
+    except serializers.ValidationError as exc:
+        raise exceptions.ValidationError({name: exc.detail})
+
+
+def transition_error(exc):
+    """400 for a transition the ticket's status does not allow, 409 when the status moved meanwhile."""
+    if isinstance(exc, InvalidTransition):
+        return Response({"detail": str(exc), "status": exc.source}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({"detail": str(exc), "status": exc.actual}, status=status.HTTP_409_CONFLICT)
 
-class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
 
 class TicketViewSet(viewsets.ModelViewSet):
     serializer_class = TicketSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.OrderingFilter]
+    filter_backends = [SearchRankOrderingFilter]
     ordering_fields = ['created_at', 'priority', 'status']
     ordering = ['-created_at']
-    pagination_class = StandardResultsSetPagination
+    pagination_class = TicketPagination
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
         return context
         
-    def get_queryset(self):
+    def filtered_queryset(self):
+        """Tickets visible to the user, narrowed by the list query parameters."""
         user = self.request.user
         if not user.tenant_id:
             return Ticket.objects.none()
@@ -55,17 +87,17 @@ class TicketViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(priority=priority)
             
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(description__icontains=search)
-            )
+            queryset = search_tickets(queryset, search)
             
         return queryset
+
+    def get_queryset(self):
+        return eager_load(self.filtered_queryset(), self.get_serializer_class())
         
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
-        logger.info(f"Page: {page}")
+        logger.info(f"Page: {len(page) if page is not None else 0} tickets")
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
@@ -73,11 +105,55 @@ class TicketViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    def record_change(self, ticket, before, kind=TicketEvent.Kind.UPDATED):
+        """Append the change from `before` to the ticket's history (call inside the write's transaction)."""
+        history.record([history.event(ticket, kind, before, history.snapshot(ticket), self.request.user)])
+
     def perform_create(self, serializer):
         user = self.request.user
-        serializer.save(tenant=user.tenant, created_by=user)
-        if getattr(settings, "TWILIO_WHATSAPP_NOTIFY", False):
-            send_whatsapp(f"New ticket: {serializer.instance.title} ({serializer.instance.id})")
+        with transaction.atomic():
+            serializer.save(tenant=user.tenant, created_by=user)
+            ticket = serializer.instance
+            self.record_change(ticket, None, TicketEvent.Kind.CREATED)
+            if getattr(settings, "TWILIO_WHATSAPP_NOTIFY", False):
+                enqueue(render_ticket_message(CREATED, BROADCAST, ticket), key=f"ticket:{ticket.id}:created")
+
+    def update(self, request, *args, **kwargs):
+        try:
+            return super().update(request, *args, **kwargs)
+        except (InvalidTransition, TransitionConflict) as exc:
+            return transition_error(exc)
+
+    def perform_update(self, serializer):
+        ticket = serializer.instance
+        # `status` is read-only on the serializer; a new status in the body
+        # is applied as the transition that leads to it.
+        target = self.request.data.get("status")
+        name = None
+        if target and target != ticket.status:
+            name = next((name for name, t in TRANSITIONS.items() if t.target == target), None)
+            if name is None:
+                raise exceptions.ValidationError(
+                    {"status": f"Cannot set the status to {target}; use the assign or transition actions"}
+                )
+            if self.request.user.role not in TRANSITIONS[name].roles:
+                raise exceptions.PermissionDenied(f"Your role cannot {name} tickets")
+
+        before = history.loaded_snapshot(ticket)
+        with transaction.atomic():
+            serializer.save()
+            self.record_change(ticket, before)
+            if name is not None:
+                self.apply_transition(ticket, name)
+
+    def apply_transition(self, ticket, name, rating=None, feedback=None):
+        """Run transition `name` through the Ticket helper that also notifies."""
+        if name == "start":
+            ticket.start_work(actor=self.request.user)
+        elif name == "resolve":
+            ticket.mark_resolved(actor=self.request.user)
+        else:
+            ticket.close_ticket(rating=rating, feedback=feedback, actor=self.request.user)
 
     @action(detail=True, methods=["post"], url_path="assign")
     def assign(self, request, pk=None, tenant_slug=None): 
@@ -85,89 +161,293 @@ class TicketViewSet(viewsets.ModelViewSet):
         assignee_id = request.data.get("assignee_id")
         asset_id = request.data.get("asset_id")
 
+        contractor = None
         if assignee_id:
-            ticket.assignee_id = assignee_id
-            ticket.save(update_fields=["assignee"])
-
-        if asset_id:
-            ticket.assets.add(asset_id)
-            ticket.save(update_fields=["assets"])
-
-        if os.getenv("TWILIO_WHATSAPP_NOTIFY", False):
-            message = (
-                f"📋 *Ticket Update*\n\n"
-                f"Status: {ticket.status}\n"
-                f"Title: {ticket.title}\n"
-                f"Assigned to: {ticket.assignee.username}\n\n"
-                f"{ticket.description}\n\n"
-                f"🔗 View Ticket: {get_ticket_url(ticket)}"
-            )
-            send_whatsapp(message)
-            logger.info("Ticket updated: {} (assigned to {})".format(ticket.title, ticket.assignee.username))
+            assignee_id = int_param(assignee_id, "assignee_id", min_value=1)
+            contractor = User.objects.filter(
+                pk=assignee_id, tenant_id=ticket.tenant_id, role=User.Role.CONTRACTOR
+            ).first()
+            if contractor is None:
+                raise exceptions.ValidationError({"assignee_id": "Must be a contractor of this tenant"})
+
+        try:
+            with transaction.atomic():
+                if contractor is not None:
+                    # OPEN -> ASSIGNED, or a reassignment, through the state machine.
+                    ticket.assign_contractor(contractor, actor=request.user)
+
+                if asset_id:
+                    ticket.assets.add(asset_id)
+
+                if os.getenv("TWILIO_WHATSAPP_NOTIFY", False):
+                    enqueue(render_ticket_message(UPDATED, BROADCAST, ticket))
+                    logger.info("Ticket updated: {} (assigned to {})".format(ticket.title, ticket.assignee.username))
+        except (InvalidTransition, TransitionConflict) as exc:
+            return transition_error(exc)
         return Response(TicketSerializer(ticket).data)
 
+    @action(detail=False, methods=["post"], url_path="bulk", parser_classes=[MultiPartParser, FormParser])
+    def bulk_import(self, request, tenant_slug=None):
+        """
+        Import tickets from an uploaded CSV or JSONL `file`. Optional fields:
+        `format` (csv/jsonl, otherwise taken from the file name), `batch_size`
+        and `dry_run` (validate only).
+        """
+        check_tenant_access(request)
+        if request.user.role != "ADMIN":
+            raise exceptions.PermissionDenied("Only admins can import tickets")
+
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            fmt = detect_format(upload, request.data.get("format"))
+        except ImportFormatError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        batch_size = request.data.get("batch_size") or None
+        if batch_size is not None:
+            batch_size = int_param(batch_size, "batch_size", min_value=1, max_value=settings.TICKET_IMPORT_MAX_BATCH_SIZE)
+
+        importer = TicketImporter(
+            request.user.tenant,
+            request.user,
+            batch_size=batch_size,
+            dry_run=str(request.data.get("dry_run", "")).lower() in ("1", "true", "yes"),
+            context=self.get_serializer_context(),
+        )
+        report = importer.run(iter_rows(upload, fmt))
+        logger.info(f"Ticket import: {report['created']} created, {report['failed']} failed ({report['rows']} rows)")
+        return Response(report, status=status.HTTP_201_CREATED if report["created"] else status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"], url_path="transition")
+    def bulk_transition(self, request, tenant_slug=None):
+        """
+        Apply one transition (`start`, `resolve` or `close`) to the tickets
+        listed in `ids`. Tickets the user cannot see or that are not in a
+        status the transition starts from are skipped and reported.
+        """
+        check_tenant_access(request)
+        name = request.data.get("transition")
+        if name not in TRANSITIONS:
+            raise exceptions.ValidationError({"transition": f"Must be one of {', '.join(TRANSITIONS)}"})
+        if request.user.role not in TRANSITIONS[name].roles:
+            raise exceptions.PermissionDenied(f"Your role cannot {name} tickets")
+
+        ids = request.data.get("ids")
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, int) for i in ids):
+            raise exceptions.ValidationError({"ids": "Must be a non-empty list of ticket ids"})
+        if len(ids) > settings.TICKET_BULK_TRANSITION_MAX:
+            raise exceptions.ValidationError({"ids": f"At most {settings.TICKET_BULK_TRANSITION_MAX} tickets at a time"})
+
+        result = bulk_transition(self.filtered_queryset(), name, ids, actor=request.user)
+        return Response(result.as_dict())
+
+    @action(detail=True, methods=["post"], url_path="transition")
+    def transition(self, request, pk=None, tenant_slug=None):
+        """
+        Apply one transition to this ticket. With `expected_status` the
+        change only goes through if the ticket is still in that status;
+        either way a concurrent change answers 409 with the current status.
+        """
+        name = request.data.get("transition")
+        if name not in TRANSITIONS:
+            raise exceptions.ValidationError({"transition": f"Must be one of {', '.join(TRANSITIONS)}"})
+        if request.user.role not in TRANSITIONS[name].roles:
+            raise exceptions.PermissionDenied(f"Your role cannot {name} tickets")
+
+        rating = request.data.get("rating")
+        if rating is not None:
+            rating = int_param(rating, "rating", min_value=1, max_value=5)
+
+        ticket = self.get_object()
+        expected = request.data.get("expected_status")
+        try:
+            if expected and expected != ticket.status:
+                raise TransitionConflict(ticket.pk, expected, ticket.status)
+            self.apply_transition(ticket, name, rating=rating, feedback=request.data.get("feedback"))
+        except (InvalidTransition, TransitionConflict) as exc:
+            return transition_error(exc)
+        return Response(self.get_serializer(ticket).data)
+
+    @action(detail=True, methods=["get"], url_path="timeline")
+    def timeline(self, request, pk=None, tenant_slug=None):
+        """The ticket's change history, oldest first, keyset-paginated (`cursor`, `page_size`)."""
+        ticket = get_object_or_404(self.filtered_queryset().only("pk"), pk=pk)
+        events = TicketEvent.objects.filter(ticket=ticket).select_related("actor").only(
+            "id", "kind", "changes", "created_at", "actor__username"
+        )
+        paginator = TimelinePagination()
+        page = paginator.paginate_queryset(events, request, view=self)
+        return paginator.get_paginated_response(TicketEventSerializer(page, many=True).data)
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request, tenant_slug=None):
+        """
+        Stream every ticket matching the list filters (status, priority,
+        search) and the date ranges in tickets.exporter.DATE_FILTERS as CSV
+        or JSONL (`export_format`, default csv).
+        """
+        check_tenant_access(request)
+        fmt = request.query_params.get("export_format", "csv")
+        if fmt not in EXPORT_FORMATS:
+            raise exceptions.ValidationError({"export_format": f"Must be one of {', '.join(EXPORT_FORMATS)}"})
+        queryset = filter_dates(self.filtered_queryset(), request.query_params)
+
+        response = StreamingHttpResponse(stream_export(export_rows(queryset), fmt), content_type=EXPORT_FORMATS[fmt])
+        filename = f"tickets-{request.user.tenant.slug}-{timezone.now():%Y%m%d-%H%M%S}.{fmt}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
     @action(detail=False, methods=["get"], url_path="stats")
     def stats(self, request, tenant_slug=None):
         user = request.user
-        if tenant_slug and (not user.tenant or user.tenant.slug != tenant_slug):
-            raise exceptions.PermissionDenied("Tenant mismatch")
+        check_tenant_access(request)
         if not user.tenant_id:
             return Response({})
-        qs = Ticket.objects.filter(tenant_id=user.tenant_id)
-        agg = qs.values("status").annotate(c=Count("id"))
-        data = {k: 0 for k, _ in Ticket.Status.choices}
-        for row in agg:
-            data[row["status"]] = row["c"]
-        return Response(data)
+
+        # Served from the materialized counters, optionally narrowed to a
+        # site or an assignee.
+        scope, scope_id = TicketCounter.Scope.TENANT, None
+        for param, param_scope in (("site", TicketCounter.Scope.SITE), ("assignee", TicketCounter.Scope.ASSIGNEE)):
+            value = request.query_params.get(param)
+            if value:
+                scope, scope_id = param_scope, int_param(value, param, min_value=1)
+        return Response(ticket_status_counts(user.tenant_id, scope, scope_id))
 
     @action(detail=True, methods=["post"], url_path="assets")
-    def add_asset(self, request, pk=None):
+    def add_asset(self, request, pk=None, tenant_slug=None):
         ticket = self.get_object()
         image_obj = request.FILES.get("image") or request.FILES.get("file")
         if not image_obj:
             return Response({"error": "No image provided"}, status=status.HTTP_400_BAD_REQUEST)
-        asset = Asset.objects.create(
-            ticket=ticket,
-            tenant=ticket.tenant,
-            image=image_obj,
-            name=getattr(image_obj, "name", "") or "",
-        )
-        serializer = AssetSerializer(asset)
+        try:
+            with transaction.atomic():
+                asset = Asset.objects.create(
+                    tenant=ticket.tenant,
+                    image=image_obj,
+                    name=request.data.get("name") or getattr(image_obj, "name", "") or "",
+                    created_by=request.user,
+                )
+                ticket.assets.add(asset)
+        except IntegrityError:
+            raise exceptions.ValidationError({"name": ["Asset with this name already exists"]})
+        serializer = AssetSerializer(asset, context=self.get_serializer_context())
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    @action(detail=True, methods=["post"], url_path="job-card")
-    def upload_job_card(self, request, pk=None):
+    def check_document_role(self, field):
+        if self.request.user.role not in ("SITE_MANAGER", "ADMIN"):
+            raise exceptions.PermissionDenied(f"Only site managers or admins can upload {DOCUMENTS[field]}")
+
+    def attach_document(self, ticket, field, file_obj):
+        """Replace the ticket's job card or invoice with `file_obj` and record the change."""
+        before = history.loaded_snapshot(ticket)
+        with transaction.atomic():
+            current = getattr(ticket, field)
+            if current:
+                current.delete(save=False)
+            setattr(ticket, field, file_obj)
+            ticket.save(update_fields=[field])
+            self.record_change(ticket, before)
+
+    def upload_document(self, request, field):
         ticket = self.get_object()
-        if request.user.role not in ("SITE_MANAGER", "ADMIN"):
-            raise exceptions.PermissionDenied("Only site managers or admins can upload a job card")
+        self.check_document_role(field)
 
         file_obj = request.FILES.get("file")
         if not file_obj:
             return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
 
-        if ticket.job_card:
-            ticket.job_card.delete(save=False)
-        ticket.job_card = file_obj
-        ticket.save(update_fields=["job_card"])
+        self.attach_document(ticket, field, file_obj)
         serializer = self.get_serializer(ticket)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=["post"], url_path="job-card")
+    def upload_job_card(self, request, pk=None, tenant_slug=None):
+        return self.upload_document(request, "job_card")
+
     @action(detail=True, methods=["post"], url_path="invoice")
     def upload_invoice(self, request, pk=None, tenant_slug=None):
+        return self.upload_document(request, "invoice")
+
+    def get_upload_session(self, ticket, upload_id):
+        session = get_object_or_404(
+            UploadSession, pk=upload_id, ticket=ticket, completed_at__isnull=True, expires_at__gt=timezone.now()
+        )
+        self.check_document_role(session.field)
+        return session
+
+    @action(detail=True, methods=["post"], url_path="uploads", parser_classes=[JSONParser, FormParser, MultiPartParser])
+    def start_upload(self, request, pk=None, tenant_slug=None):
+        """
+        Start a chunked upload of the job card or invoice:
+        {"field": "job_card" | "invoice", "filename": ..., "size": <bytes>, "sha256": <optional hex>}.
+        PUT the bytes to uploads/<id>/ in chunks of at most `chunk_size`
+        (Content-Range: bytes <first>-<last>/<size>, or ?offset=<first>),
+        GET uploads/<id>/ for the offset to resume from after an error, and
+        POST uploads/<id>/complete/ once every byte is in.
+        """
         ticket = self.get_object()
-        if request.user.role not in ("SITE_MANAGER", "ADMIN"):
-            raise exceptions.PermissionDenied("Only site managers or admins can upload an invoice")
+        serializer = UploadSessionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.check_document_role(serializer.validated_data["field"])
+        try:
+            session = uploads.start(ticket, **serializer.validated_data, user=request.user)
+        except uploads.UploadError as exc:
+            raise exceptions.ValidationError({"size": [str(exc)]})
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
 
-        file_obj = request.FILES.get("file")
-        if not file_obj:
-            return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
+    @action(detail=True, methods=["get", "put", "delete"], url_path=f"uploads/{UPLOAD_ID}")
+    def upload_chunk(self, request, pk=None, upload_id=None, tenant_slug=None):
+        """Upload state (GET), one chunk of the file as the raw request body (PUT), or abort (DELETE)."""
+        ticket = self.get_object()
+        session = self.get_upload_session(ticket, upload_id)
+        if request.method == "GET":
+            return Response(UploadSessionSerializer(session).data)
+        if request.method == "DELETE":
+            uploads.discard(session)
+            session.delete()
+            return Response(status=status.HTTP_204_NO_CONTENT)
 
-        if ticket.invoice:
-            ticket.invoice.delete(save=False)
-        ticket.invoice = file_obj
-        ticket.save(update_fields=["invoice"])
-        serializer = self.get_serializer(ticket)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+        if not length:
+            return Response({"detail": "Empty chunk"}, status=status.HTTP_400_BAD_REQUEST)
+        if length > settings.TICKET_UPLOAD_MAX_CHUNK:
+            return Response(
+                {"detail": f"Chunks are limited to {settings.TICKET_UPLOAD_MAX_CHUNK} bytes"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        content_range = request.META.get("HTTP_CONTENT_RANGE")
+        if content_range:
+            match = CONTENT_RANGE_RE.match(content_range.strip())
+            if not match or int(match[2]) - int(match[1]) + 1 != length or match[3] not in ("*", str(session.size)):
+                return Response({"detail": "Content-Range does not match the chunk"}, status=status.HTTP_400_BAD_REQUEST)
+            offset = int(match[1])
+        elif request.query_params.get("offset"):
+            offset = int_param(request.query_params["offset"], "offset", min_value=0)
+        else:
+            return Response({"detail": "Send Content-Range or ?offset="}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            uploads.write_chunk(session, offset, request.stream, length)
+        except uploads.OffsetMismatch as exc:
+            return Response({"detail": str(exc), "received": exc.offset}, status=status.HTTP_409_CONFLICT)
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(UploadSessionSerializer(session).data)
+
+    @action(detail=True, methods=["post"], url_path=f"uploads/{UPLOAD_ID}/complete")
+    def complete_upload(self, request, pk=None, upload_id=None, tenant_slug=None):
+        """Attach the fully uploaded file to the ticket."""
+        ticket = self.get_object()
+        session = self.get_upload_session(ticket, upload_id)
+        try:
+            uploads.complete(session, lambda file_obj: self.attach_document(ticket, session.field, file_obj))
+        except uploads.OffsetMismatch as exc:
+            return Response({"detail": "Upload is incomplete", "received": exc.offset}, status=status.HTTP_409_CONFLICT)
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(ticket).data)
 
     @action(detail=True, methods=["delete"], url_path="assets/(?P<asset_id>[^/.]+)")
     def remove_asset(self, request, pk=None, asset_id=None):